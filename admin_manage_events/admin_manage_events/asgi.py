@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_manage_events.settings')
+# Con ASGI los streams de disponibilidad no ocupan un worker por conexión
+os.environ.setdefault('AVAILABILITY_STREAMING', '1')
 
 application = get_asgi_application()
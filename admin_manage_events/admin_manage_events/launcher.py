@@ -0,0 +1,192 @@
+"""
+Arranque de producción.
+
+    cd admin_manage_events && python -m admin_manage_events.launcher --workers 4
+
+A diferencia de run.sh, no reinstala dependencias ni vuelve a copiar los
+estáticos en cada arranque: guarda en .launcher-state.json el hash de
+requirements.txt y el de los archivos estáticos fuente, y solo repite
+`pip install` o `collectstatic` cuando cambiaron. `migrate` corre solo si
+hay migraciones sin aplicar. Al final reemplaza este proceso por gunicorn
+con --preload: la aplicación se importa una vez y los workers se forkean.
+Con --asgi los workers son de uvicorn y sirven la aplicación ASGI.
+
+Con más de un worker exige una caché compartida (CACHE_URL): con la caché
+en memoria de cada proceso las invalidaciones no llegan a los demás
+workers. --local-cache lo permite igual.
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+DJANGO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REQUIREMENTS = os.path.join(os.path.dirname(DJANGO_DIR), 'requirements.txt')
+STATE_FILE = os.path.join(DJANGO_DIR, '.launcher-state.json')
+
+
+def load_state():
+    try:
+        with open(STATE_FILE, encoding='utf-8') as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    with open(STATE_FILE, 'w', encoding='utf-8') as output:
+        json.dump(state, output, indent=2, sort_keys=True)
+
+
+def requirements_hash():
+    """Hash de requirements.txt y del intérprete: un venv nuevo también obliga a instalar."""
+    digest = hashlib.sha256(f'{sys.executable}\n{sys.version}\n'.encode())
+    with open(REQUIREMENTS, 'rb') as source:
+        digest.update(source.read())
+    return digest.hexdigest()
+
+
+def static_hash():
+    """Hash de la lista de estáticos fuente (ruta, tamaño y fecha de modificación).
+
+    Usa los mismos finders que collectstatic, así que incluye los estáticos
+    del admin y de las apps instaladas. No lee el contenido de los archivos.
+    """
+    from django.conf import settings
+    from django.contrib.staticfiles.finders import get_finders
+
+    digest = hashlib.sha256(f'{settings.STATIC_ROOT}\n{settings.STORAGES["staticfiles"]}\n'.encode())
+    entries = set()
+    for finder in get_finders():
+        for path, storage in finder.list(['CVS', '.*', '*~']):
+            stat = os.stat(storage.path(path))
+            entries.add(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}')
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def pending_migrations():
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connection)
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def step(message, started):
+    print(f'[launcher] {message} ({time.monotonic() - started:.2f} s)', flush=True)
+
+
+def prepare(args):
+    """Instala, migra y copia estáticos solo si hace falta. Devuelve el estado guardado."""
+    started = time.monotonic()
+    state = load_state()
+
+    current = requirements_hash()
+    if args.skip_install:
+        step('Instalación de dependencias omitida', started)
+    elif state.get('requirements') != current:
+        subprocess.run([sys.executable, '-m', 'pip', 'install', '-q', '-r', REQUIREMENTS], check=True)
+        state['requirements'] = current
+        save_state(state)
+        step('Dependencias instaladas', started)
+    else:
+        step('Dependencias sin cambios', started)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_manage_events.settings')
+    import django
+    from django.core.management import call_command
+    django.setup()
+
+    if args.check:
+        call_command('check', deploy=True)
+        step('check --deploy', started)
+
+    plan = pending_migrations()
+    if plan:
+        call_command('migrate', interactive=False, verbosity=1)
+        step(f'{len(plan)} migraciones aplicadas', started)
+    else:
+        step('Sin migraciones pendientes', started)
+
+    from django.conf import settings
+    current = static_hash()
+    if state.get('static') != current or not os.path.isdir(settings.STATIC_ROOT):
+        call_command('collectstatic', interactive=False, clear=True, verbosity=0)
+        state['static'] = current
+        save_state(state)
+        step('Estáticos recopilados', started)
+    else:
+        step('Estáticos sin cambios', started)
+    return state
+
+
+def local_cache_error(args):
+    """Mensaje de error si varios workers tendrían cada uno su caché en memoria, o None."""
+    from django.conf import settings
+    backend = settings.CACHES['default']['BACKEND']
+    if args.workers > 1 and backend.endswith('.LocMemCache') and not args.local_cache:
+        return (
+            f'{args.workers} workers con la caché en memoria de cada proceso: las invalidaciones no '
+            'llegarían a los demás workers. Configure CACHE_URL (redis:// o file://), use --workers 1 '
+            'o --local-cache para arrancar igual.'
+        )
+    return None
+
+
+def server_command(args):
+    if args.asgi:
+        target = ['admin_manage_events.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker']
+    else:
+        target = ['admin_manage_events.wsgi:application', '--threads', str(args.threads)]
+    command = [
+        sys.executable, '-m', 'gunicorn', *target,
+        '--preload',
+        '--bind', args.bind,
+        '--workers', str(args.workers),
+        '--timeout', str(args.timeout),
+        '--access-logfile', '-',
+    ]
+    if args.max_requests:
+        command += ['--max-requests', str(args.max_requests), '--max-requests-jitter', str(args.max_requests // 10)]
+    return command
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m admin_manage_events.launcher', description='Arranque de producción.')
+    parser.add_argument('--bind', default=os.environ.get('BIND', '0.0.0.0:8000'), help='Dirección de escucha.')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', 0)) or 2 * (os.cpu_count() or 1) + 1, help='Procesos de gunicorn (por defecto 2 x núcleos + 1).')
+    parser.add_argument('--threads', type=int, default=1, help='Hilos por proceso (solo WSGI).')
+    parser.add_argument('--asgi', action='store_true', help='Servir la aplicación ASGI con workers de uvicorn (activa la disponibilidad en vivo).')
+    parser.add_argument('--timeout', type=int, default=60, help='Segundos antes de reiniciar un worker colgado.')
+    parser.add_argument('--max-requests', type=int, default=0, help='Reciclar cada worker tras N requests (0 = nunca).')
+    parser.add_argument('--local-cache', action='store_true', help='Permitir varios workers con la caché en memoria de cada proceso.')
+    parser.add_argument('--skip-install', action='store_true', help='No revisar requirements.txt (dependencias instaladas en la imagen).')
+    parser.add_argument('--check', action='store_true', help='Ejecutar check --deploy antes de arrancar.')
+    parser.add_argument('--prepare-only', action='store_true', help='Preparar sin arrancar el servidor.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.chdir(DJANGO_DIR)
+    prepare(args)
+    if args.prepare_only:
+        return 0
+    error = local_cache_error(args)
+    if error:
+        print(f'[launcher] {error}', file=sys.stderr, flush=True)
+        return 2
+    command = server_command(args)
+    print(f'[launcher] {" ".join(command[1:])}', flush=True)
+    # gunicorn reemplaza a este proceso y recibe directamente las señales
+    os.execv(command[0], command)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -57,6 +57,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -84,6 +85,8 @@ TEMPLATES = [
     },
 ]
 WSGI_APPLICATION = 'admin_manage_events.wsgi.application'
+# Con ASGI (launcher --asgi) las vistas async de solo lectura no ocupan un hilo por conexión
+ASGI_APPLICATION = 'admin_manage_events.asgi.application'
 
 
 # Database
@@ -97,6 +100,26 @@ DATABASES = {
 }
 
 
+# Caché (ver utils/cache.py). Por defecto en memoria de cada proceso; con varios
+# workers hace falta una compartida (el launcher no arranca sin ella):
+#   CACHE_URL=file:///var/tmp/admin_events_cache
+#   CACHE_URL=redis://127.0.0.1:6379/0   (Redis o compatible, requiere el paquete redis)
+CACHE_URL = os.environ.get('CACHE_URL', '')
+if CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    CACHE_BACKEND = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}
+elif CACHE_URL.startswith('file://'):
+    CACHE_BACKEND = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': CACHE_URL[len('file://'):]}
+else:
+    CACHE_BACKEND = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'admin-events'}
+CACHES = {
+    'default': {
+        **CACHE_BACKEND,
+        'KEY_PREFIX': 'admin-events',
+        'TIMEOUT': 300,
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -137,6 +160,44 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# collectstatic genera nombres con hash y variantes gzip/brotli; WhiteNoise los
+# sirve desde STATIC_ROOT con Cache-Control inmutable de un año.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'utils.staticfiles.StaticFilesStorage'},
+}
+
+# Archivos subidos (adjuntos). Se guardan por hash de contenido en MEDIA_ROOT/cas/
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Las subidas se validan mientras se reciben y se escriben directo a un temporal,
+# sin mantener archivos completos en memoria.
+FILE_UPLOAD_HANDLERS = [
+    'apps.attachments.uploadhandler.AttachmentUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Las miniaturas de adjuntos se generan en un hilo aparte después del commit
+ATTACHMENT_PREVIEWS_IN_BACKGROUND = True
+
+# El listado público de eventos vencido se recalcula en un hilo aparte mientras se sirve el anterior
+PUBLIC_LISTING_REFRESH_IN_BACKGROUND = True
+
+# Entrega de adjuntos: None la hace Django (con soporte de Range), 'x-accel-redirect'
+# la delega a nginx (location internal en ATTACHMENT_SENDFILE_PREFIX apuntando a MEDIA_ROOT)
+# y 'x-sendfile' a Apache/lighttpd.
+ATTACHMENT_SENDFILE = None
+ATTACHMENT_SENDFILE_PREFIX = '/protected-media/'
+
+# Disponibilidad en vivo por server-sent events (apps/events/availability.py). Solo con
+# el servidor ASGI (launcher --asgi): asgi.py la activa; con WSGI cada stream ocuparía un worker.
+AVAILABILITY_STREAMING = os.environ.get('AVAILABILITY_STREAMING') == '1'
+
+# Envío de boletos por correo (comando send_ticket_emails). None = sin límite de velocidad.
+DEFAULT_FROM_EMAIL = 'boletos@localhost'
+TICKET_EMAIL_RATE_PER_MINUTE = None
 LOGIN_REDIRECT_URL = '/admin'
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
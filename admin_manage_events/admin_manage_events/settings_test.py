@@ -0,0 +1,58 @@
+"""
+Configuración para correr los tests rápido.
+
+    DJANGO_SETTINGS_MODULE=admin_manage_events.settings_test python manage.py test --parallel
+
+Base SQLite en memoria (una copia por proceso con --parallel), hasher MD5,
+historial desactivado salvo en los tests que lo activan con
+override_settings(SIMPLE_HISTORY_ENABLED=True), esquema creado desde los
+modelos salvo en las apps de MIGRATED_APPS y un MEDIA_ROOT temporal por proceso.
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# Hashear contraseñas con PBKDF2 es lo más lento de crear usuarios en los tests
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# simple_history escribe una fila extra por cada save
+SIMPLE_HISTORY_ENABLED = False
+
+
+# Se migran las apps cuyas migraciones hacen lo que los modelos no describen
+# (la tabla FTS5 y sus triggers en attendees 0006, el cálculo de duration en
+# events 0004) y las apps de las que dependen sus migraciones
+MIGRATED_APPS = {'contenttypes', 'auth', 'accounts', 'ticket_categories', 'events', 'attachments', 'attendees'}
+
+
+class DisableMigrations:
+    """Apps fuera de MIGRATED_APPS sin migraciones: sus tablas se crean directo desde los modelos."""
+
+    def __contains__(self, item):
+        return item not in MIGRATED_APPS
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()
+
+# Crea y borra un MEDIA_ROOT temporal por proceso de tests
+TEST_RUNNER = 'utils.testing.FastTestRunner'
+
+# Las miniaturas no se generan en un hilo que sobreviva al test
+ATTACHMENT_PREVIEWS_IN_BACKGROUND = False
+PUBLIC_LISTING_REFRESH_IN_BACKGROUND = False
+
+DEBUG = False
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'null': {'class': 'logging.NullHandler'}},
+    'root': {'handlers': ['null']},
+}
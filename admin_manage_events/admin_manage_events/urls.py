@@ -16,11 +16,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.views.generic import TemplateView
+
+from apps.events import views as event_views
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', TemplateView.as_view(template_name='index.html'), name='home'),
+    path('attendees/', include('apps.attendees.urls')),
+    path('events/', include('apps.events.urls')),
+    path('', event_views.index, name='home'),
     # path('dashboard/', include('admin_material.urls')),
 ]
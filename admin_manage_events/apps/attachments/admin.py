@@ -2,12 +2,19 @@
 
 
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.urls import path, reverse
+from django.utils.html import format_html
 from .models import Attachment
 from .forms import AttachmentForm
+from .serving import serve_file
+from .storage import blob_digest
 
 class AttachmentAdmin(admin.ModelAdmin):
     form = AttachmentForm
-    list_display = ('name', 'file', 'company', 'created_at','updated_at')
+    list_display = ('name', 'preview', 'company', 'created_at','updated_at')
+    list_per_page = 100
 
     def get_form(self, request, obj=None, **kwargs):
 
@@ -29,6 +36,47 @@ class AttachmentAdmin(admin.ModelAdmin):
             return qs.filter(company=request.user.company.id)
         except Exception:
             return qs.none()
-         
+
+    def get_urls(self):
+        urls = [
+            path('<int:object_id>/download/', self.admin_site.admin_view(self.download_view), name='attachments_attachment_download'),
+            path('<int:object_id>/thumbnail/', self.admin_site.admin_view(self.thumbnail_view), name='attachments_attachment_thumbnail'),
+        ]
+        return urls + super().get_urls()
+
+    @admin.display(description='Archivo')
+    def preview(self, obj):
+        # Muestra la miniatura (unos pocos KB) en vez de enlazar al archivo completo
+        if not obj.file:
+            return '-'
+        download_url = reverse('admin:attachments_attachment_download', args=[obj.pk])
+        if not obj.thumbnail:
+            return format_html('<a href="{}">{}</a>', download_url, obj.file.name.rsplit('/', 1)[-1])
+        url = reverse('admin:attachments_attachment_thumbnail', args=[obj.pk])
+        return format_html(
+            '<a href="{}"><img src="{}?v={}" alt="{}" loading="lazy" width="80"></a>',
+            download_url, url, blob_digest(obj.thumbnail.name), obj.name,
+        )
+
+    def _get_scoped_attachment(self, request, object_id, field):
+        # Solo se entregan archivos de la empresa del usuario (mismo filtro del listado)
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        attachment = self.get_queryset(request).filter(pk=object_id).only('name', field).first()
+        if attachment is None or not getattr(attachment, field):
+            raise Http404('Archivo no disponible.')
+        return attachment
+
+    def download_view(self, request, object_id):
+        attachment = self._get_scoped_attachment(request, object_id, 'file')
+        extension = attachment.file.name.rsplit('.', 1)[-1] if '.' in attachment.file.name else ''
+        filename = f'{attachment.name}.{extension}' if extension and not attachment.name.lower().endswith(extension) else attachment.name
+        return serve_file(request, attachment.file, filename=filename)
+
+    def thumbnail_view(self, request, object_id):
+        attachment = self._get_scoped_attachment(request, object_id, 'thumbnail')
+        # El nombre del blob es el hash de su contenido, la URL cambia si cambia la miniatura
+        return serve_file(request, attachment.thumbnail, content_type='image/webp', cache_control='private, max-age=31536000, immutable')
+
 
 admin.site.register(Attachment,AttachmentAdmin)
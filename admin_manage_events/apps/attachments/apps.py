@@ -6,3 +6,7 @@ from django.apps import AppConfig
 class AttachmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.attachments'
+
+    def ready(self):
+        # activamos los signals
+        import apps.attachments.signals
@@ -0,0 +1,52 @@
+# apps/attachments/management/commands/collect_attachment_blobs.py
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.attachments.models import Attachment
+from apps.attachments.storage import BLOB_PREFIX
+from apps.events.archive import archived_blob_names
+
+
+class Command(BaseCommand):
+    # Es el único que borra blobs del disco: al eliminar un adjunto su blob queda hasta aquí,
+    # y --min-age protege los que una subida acaba de reutilizar (storage renueva su mtime)
+    help = 'Elimina los blobs de adjuntos que ya no están referenciados por ningún Attachment activo o archivado.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=60, help='Minutos mínimos de antigüedad del blob (evita borrar subidas en curso).')
+        parser.add_argument('--dry-run', action='store_true', help='Solo lista los blobs huérfanos.')
+
+    def referenced_names(self):
+        names = set()
+        for file_name, thumbnail_name in Attachment.objects.values_list('file', 'thumbnail').iterator():
+            names.update((file_name, thumbnail_name))
+        return names | archived_blob_names()
+
+    def handle(self, *args, **options):
+        storage = Attachment._meta.get_field('file').storage
+        root = storage.path(BLOB_PREFIX)
+        if not os.path.isdir(root):
+            self.stdout.write('No hay blobs almacenados.')
+            return
+
+        referenced = self.referenced_names()
+        cutoff = time.time() - options['min_age'] * 60
+        removed = freed = 0
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+                stat = os.stat(path)
+                if name in referenced or stat.st_mtime > cutoff:
+                    continue
+                removed += 1
+                freed += stat.st_size
+                if options['dry_run']:
+                    self.stdout.write(name)
+                else:
+                    os.remove(path)
+
+        action = 'huérfanos encontrados' if options['dry_run'] else 'eliminados'
+        self.stdout.write(self.style.SUCCESS(f'{removed} blobs {action} ({freed / 1024:.1f} KB).'))
@@ -0,0 +1,25 @@
+# apps/attachments/management/commands/generate_attachment_previews.py
+from django.core.management.base import BaseCommand
+
+from apps.attachments.models import Attachment
+from apps.attachments.previews import generate_preview
+
+
+class Command(BaseCommand):
+    help = 'Genera las miniaturas de los adjuntos que aún no la tienen.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenera también las miniaturas existentes.')
+
+    def handle(self, *args, **options):
+        queryset = Attachment.objects.exclude(file='').only('pk', 'file', 'thumbnail')
+        if not options['all']:
+            queryset = queryset.filter(thumbnail='')
+
+        generated = skipped = 0
+        for attachment in queryset.iterator(chunk_size=500):
+            if generate_preview(attachment):
+                generated += 1
+            else:
+                skipped += 1
+        self.stdout.write(self.style.SUCCESS(f'{generated} miniaturas generadas, {skipped} adjuntos sin miniatura.'))
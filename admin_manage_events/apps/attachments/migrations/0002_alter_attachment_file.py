@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-19 14:04
+
+import apps.attachments.models
+import apps.attachments.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attachment',
+            name='file',
+            field=models.FileField(db_index=True, storage=apps.attachments.storage.ContentAddressedStorage(), upload_to='attachments/%Y/%m/%d/', validators=[apps.attachments.models.validate_file_size, apps.attachments.models.validate_file_extension], verbose_name='Archivo'),
+        ),
+    ]
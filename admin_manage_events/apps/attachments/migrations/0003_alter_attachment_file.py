@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-19 14:05
+
+import apps.attachments.models
+import apps.attachments.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0002_alter_attachment_file'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attachment',
+            name='file',
+            field=models.FileField(db_index=True, storage=apps.attachments.storage.ContentAddressedStorage(), upload_to='attachments/%Y/%m/%d/', validators=[apps.attachments.models.validate_file_size, apps.attachments.models.validate_file_extension, apps.attachments.models.validate_file_signature], verbose_name='Archivo'),
+        ),
+    ]
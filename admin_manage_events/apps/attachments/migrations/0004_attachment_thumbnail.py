@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-19 14:06
+
+import apps.attachments.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0003_alter_attachment_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='thumbnail',
+            field=models.FileField(blank=True, editable=False, storage=apps.attachments.storage.ContentAddressedStorage(), upload_to='previews/', verbose_name='Miniatura'),
+        ),
+    ]
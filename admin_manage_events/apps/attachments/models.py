@@ -2,11 +2,39 @@
 
 
 from django.db import models
+from django.db.models.fields.files import FieldFile
 from utils.models import TimeStampedModel
 from apps.events.models import Company
 from django.core.exceptions import ValidationError
+from .storage import ContentAddressedStorage
 import os
 
+MAX_UPLOAD_SIZE_KB = 5120  # 5 MB
+
+# Firmas (magic bytes) de los tipos permitidos y las extensiones que les corresponden
+FILE_SIGNATURES = (
+    (b'%PDF-', ('.pdf',)),
+    (b'\x89PNG\r\n\x1a\n', ('.png',)),
+    (b'\xff\xd8\xff', ('.jpg', '.jpeg')),
+)
+SIGNATURE_LENGTH = max(len(signature) for signature, _ in FILE_SIGNATURES)
+
+
+def sniff_file_extensions(header):
+    """Extensiones válidas para el contenido según sus primeros bytes, o None si no es un tipo permitido."""
+    for signature, extensions in FILE_SIGNATURES:
+        if header.startswith(signature):
+            return extensions
+    return None
+
+
+def _new_upload(file):
+    # Solo se validan archivos recién subidos; los ya guardados no se releen del disco
+    if isinstance(file, FieldFile):
+        return None if file._committed else file.file
+    return file
+
+
 def validate_file_extension(file):
     ext = os.path.splitext(file.name)[1]  # obtiene la extensión del archivo
     valid_extensions = ['.pdf', '.png', '.jpg', '.jpeg']
@@ -14,14 +42,36 @@ def validate_file_extension(file):
         raise ValidationError(f'Tipo de archivo no soportado. Solo se permiten archivos: {", ".join(valid_extensions)}.')
 
 def validate_file_size(file):
-    max_size_kb = 5120  # 5 MB
-    if file.size > max_size_kb * 1024:
-        raise ValidationError(f"El tamaño máximo del archivo es {max_size_kb} KB")
+    upload = _new_upload(file)
+    if getattr(upload, 'upload_error', None):
+        return  # lo reporta validate_file_signature
+    if file.size > MAX_UPLOAD_SIZE_KB * 1024:
+        raise ValidationError(f"El tamaño máximo del archivo es {MAX_UPLOAD_SIZE_KB} KB")
+
+def validate_file_signature(file):
+    upload = _new_upload(file)
+    if upload is None:
+        return
+    # El upload handler ya rechazó el archivo mientras se recibía
+    error = getattr(upload, 'upload_error', None)
+    if error:
+        raise ValidationError(error)
+
+    upload.seek(0)
+    header = upload.read(SIGNATURE_LENGTH)
+    upload.seek(0)
+    extensions = sniff_file_extensions(header)
+    if extensions is None:
+        raise ValidationError('El contenido del archivo no corresponde a un PDF, PNG o JPEG.')
+    if os.path.splitext(file.name)[1].lower() not in extensions:
+        raise ValidationError('La extensión del archivo no corresponde a su contenido.')
 
 class Attachment(TimeStampedModel):
     attachment_id = models.AutoField(primary_key=True)
     event = models.ForeignKey('events.Event', on_delete=models.CASCADE,verbose_name='Evento')
-    file = models.FileField(upload_to='attachments/%Y/%m/%d/', validators=[validate_file_size,validate_file_extension], verbose_name='Archivo')
+    # Los archivos se guardan por hash de contenido: el mismo recibo subido varias veces ocupa un solo blob
+    file = models.FileField(upload_to='attachments/%Y/%m/%d/', storage=ContentAddressedStorage(), db_index=True, validators=[validate_file_size, validate_file_extension, validate_file_signature], verbose_name='Archivo')
+    thumbnail = models.FileField(upload_to='previews/', storage=ContentAddressedStorage(), blank=True, editable=False, verbose_name='Miniatura')
     name = models.CharField(max_length=255, verbose_name='Asunto')
     description = models.TextField(blank=True, null=True, verbose_name='Descripción')
     company = models.ForeignKey(Company, on_delete=models.CASCADE, verbose_name='Empresa')
@@ -31,4 +81,4 @@ class Attachment(TimeStampedModel):
         verbose_name_plural = 'Adjuntos'
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
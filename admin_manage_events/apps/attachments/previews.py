@@ -0,0 +1,107 @@
+# apps/attachments/previews.py
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from .models import Attachment, SIGNATURE_LENGTH, sniff_file_extensions
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_SIZE = (240, 240)
+PREVIEW_QUALITY = 70
+
+_executor = None
+
+
+def _open_image(path):
+    # Pillow es opcional: sin él no se generan miniaturas
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image.open(path)
+
+
+def _pdf_first_page(path, output_dir):
+    # La primera página del PDF se rasteriza con pdftoppm (poppler) si está instalado
+    if not shutil.which('pdftoppm'):
+        return None
+    prefix = os.path.join(output_dir, 'page')
+    subprocess.run(
+        ['pdftoppm', '-png', '-singlefile', '-f', '1', '-l', '1', '-scale-to', str(max(PREVIEW_SIZE)), path, prefix],
+        check=True, capture_output=True, timeout=30,
+    )
+    return prefix + '.png'
+
+
+def render_preview(path):
+    """Miniatura WebP del archivo en `path`, o None si no se puede generar."""
+    with open(path, 'rb') as source:
+        extensions = sniff_file_extensions(source.read(SIGNATURE_LENGTH))
+    if extensions is None:
+        return None
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        if extensions == ('.pdf',):
+            path = _pdf_first_page(path, output_dir)
+            if path is None:
+                return None
+        image = _open_image(path)
+        if image is None:
+            return None
+        with image:
+            image.thumbnail(PREVIEW_SIZE)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGB')
+            output = BytesIO()
+            image.save(output, 'WEBP', quality=PREVIEW_QUALITY, method=4)
+    return output.getvalue()
+
+
+def generate_preview(attachment):
+    """Genera y guarda la miniatura de un adjunto. Devuelve True si se generó."""
+    try:
+        data = render_preview(attachment.file.path)
+    except Exception:
+        logger.exception('No se pudo generar la miniatura del adjunto %s', attachment.pk)
+        return False
+    if data is None:
+        return False
+
+    storage = attachment.thumbnail.storage
+    name = storage.save('preview.webp', ContentFile(data))
+    # update() evita disparar de nuevo los signals de guardado del adjunto
+    Attachment.objects.filter(pk=attachment.pk, file=attachment.file.name).update(thumbnail=name)
+    attachment.thumbnail.name = name
+    return True
+
+
+def _generate_in_background(attachment_id):
+    close_old_connections()
+    try:
+        attachment = Attachment.objects.filter(pk=attachment_id).first()
+        if attachment is not None and attachment.file:
+            generate_preview(attachment)
+    finally:
+        close_old_connections()
+
+
+def schedule_preview(attachment):
+    """Encola la miniatura para después del commit, fuera del request."""
+    if not getattr(settings, 'ATTACHMENT_PREVIEWS_IN_BACKGROUND', True):
+        transaction.on_commit(lambda: generate_preview(attachment))
+        return
+
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='attachment-previews')
+    attachment_id = attachment.pk
+    transaction.on_commit(lambda: _executor.submit(_generate_in_background, attachment_id))
@@ -0,0 +1,132 @@
+# apps/attachments/serving.py
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .storage import blob_digest
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def _etag(name, stat):
+    # Para blobs el hash del contenido es un ETag fuerte; para archivos antiguos tamaño + fecha
+    digest = blob_digest(name)
+    if digest:
+        return f'"{digest}"'
+    return f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def _parse_range(header, size):
+    """Devuelve (inicio, fin) inclusivos, None si no aplica o 'invalid' si no se puede satisfacer.
+
+    Solo se atiende un rango; con varios se responde el archivo completo.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return 'invalid'
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return 'invalid'
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == int(last_modified)
+
+
+def _read_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, field_file, filename=None, content_type=None, as_attachment=False, cache_control='private, no-cache'):
+    """Entrega un archivo del storage con ETag, peticiones condicionales y rangos.
+
+    Si ATTACHMENT_SENDFILE está configurado la transferencia la hace el servidor
+    web (X-Accel-Redirect para nginx, X-Sendfile para Apache/lighttpd) y el
+    worker de Python queda libre apenas valida permisos.
+    Si el archivo ya no está en el storage responde 404.
+    """
+    try:
+        stat = os.stat(field_file.path)
+    except FileNotFoundError:
+        raise Http404('El archivo no existe.')
+    etag = _etag(field_file.name, stat)
+    filename = filename or os.path.basename(field_file.name)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        response = _build_response(request, field_file, stat, etag, filename, content_type, as_attachment)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = cache_control
+    if response.status_code in (200, 206):
+        response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _build_response(request, field_file, stat, etag, filename, content_type, as_attachment):
+    backend = getattr(settings, 'ATTACHMENT_SENDFILE', None)
+    if backend:
+        response = HttpResponse(content_type=content_type)
+        if backend == 'x-accel-redirect':
+            prefix = getattr(settings, 'ATTACHMENT_SENDFILE_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(field_file.name)
+        else:
+            response['X-Sendfile'] = field_file.path
+        disposition = 'attachment' if as_attachment else 'inline'
+        response['Content-Disposition'] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+        return response
+
+    byte_range = None
+    if 'Range' in request.headers and _if_range_matches(request, etag, stat.st_mtime):
+        byte_range = _parse_range(request.headers['Range'], stat.st_size)
+
+    if byte_range == 'invalid':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+
+    if byte_range is not None:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(field_file.path, start, end), status=206, content_type=content_type)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        return response
+
+    try:
+        file = open(field_file.path, 'rb')
+    except FileNotFoundError:
+        # borrado entre el stat y la apertura
+        raise Http404('El archivo no existe.')
+    return FileResponse(file, as_attachment=as_attachment, filename=filename, content_type=content_type)
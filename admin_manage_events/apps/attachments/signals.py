@@ -0,0 +1,27 @@
+# apps/attachments/signals.py
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+from .models import Attachment
+from .previews import schedule_preview
+
+
+@receiver(pre_save, sender=Attachment)
+def remember_previous_file(sender, instance, **kwargs):
+    # guardamos el blob anterior para saber si el archivo fue reemplazado
+    instance._previous_file = None
+    if instance.pk and not kwargs.get('raw'):
+        instance._previous_file = Attachment.objects.filter(pk=instance.pk).values_list('file', flat=True).first()
+
+
+@receiver(post_save, sender=Attachment)
+def refresh_blobs_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.file:
+        return
+    previous = getattr(instance, '_previous_file', None)
+    if previous and previous != instance.file.name:
+        # el archivo cambió: la miniatura anterior ya no corresponde (los blobs
+        # anteriores los borra collect_attachment_blobs si nadie más los usa)
+        Attachment.objects.filter(pk=instance.pk).update(thumbnail='')
+        instance.thumbnail.name = ''
+    if created or previous and previous != instance.file.name:
+        schedule_preview(instance)
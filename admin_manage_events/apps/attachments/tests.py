@@ -429,3 +429,353 @@ class AttachmentMigrationCompatibilityTests(TestCase):
             '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
         }
         return mime_types.get(extension, 'application/octet-stream')
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Tests del almacenamiento por hash de contenido"""
+
+    def setUp(self):
+        """Empresa, evento y MEDIA_ROOT temporal"""
+        from datetime import timedelta
+        from django.test import override_settings
+        from django.utils import timezone
+        from apps.events.models import Event
+        from apps.ticket_categories.models import Company
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.company = Company.objects.create(name="Storage Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Evento", description="Evento", location="Sala",
+            start_time=now, end_time=now + timedelta(hours=2),
+        )
+
+    def tearDown(self):
+        import shutil
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _create(self, name, content=b"%PDF-1.4 recibo"):
+        return Attachment.objects.create(
+            event=self.event, company=self.company, name=name,
+            file=SimpleUploadedFile(name, content),
+        )
+
+    def test_same_content_is_stored_once(self):
+        """Test CAS-001: Dos adjuntos con el mismo contenido comparten blob"""
+        first = self._create("recibo_1.pdf")
+        second = self._create("recibo_2.pdf")
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(first.file.name.startswith("cas/"))
+        blobs = [files for _, _, files in os.walk(os.path.join(self.media_root, "cas")) if files]
+        self.assertEqual(blobs, [[os.path.basename(first.file.name)]])
+
+    def test_blob_collected_after_last_reference(self):
+        """Test CAS-002: El blob queda en disco al borrar adjuntos y la limpieza lo elimina sin referencias"""
+        from django.core.management import call_command
+
+        first = self._create("recibo_1.pdf")
+        second = self._create("recibo_2.pdf")
+        path = first.file.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        call_command("collect_attachment_blobs", min_age=0, stdout=open(os.devnull, "w"))
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertTrue(os.path.exists(path))
+        call_command("collect_attachment_blobs", min_age=0, stdout=open(os.devnull, "w"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_collect_orphan_blobs(self):
+        """Test CAS-003: El comando de limpieza borra solo blobs huérfanos"""
+        from django.core.management import call_command
+        from apps.attachments.storage import blob_name
+
+        kept = self._create("recibo.pdf")
+        orphan = os.path.join(self.media_root, blob_name("f" * 64, ".pdf"))
+        os.makedirs(os.path.dirname(orphan))
+        with open(orphan, "wb") as f:
+            f.write(b"huerfano")
+
+        call_command("collect_attachment_blobs", min_age=0, stdout=open(os.devnull, "w"))
+
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(kept.file.path))
+
+    def test_archived_blob_is_not_collected(self):
+        """Test CAS-004: La limpieza no elimina el blob que usa un evento archivado (tabla ArchivedBlob)"""
+        from datetime import timedelta
+        from django.core.management import call_command
+        from django.db import transaction
+        from django.utils import timezone
+        from apps.events.archive import archive_event, restore_archived_event
+        from apps.events.models import ArchivedBlob, Event
+
+        old = Event.objects.create(
+            company=self.company, title="Pasado", description="Pasado", location="Sala",
+            start_time=timezone.now() - timedelta(days=400), end_time=timezone.now() - timedelta(days=399),
+        )
+        Attachment.objects.create(event=old, company=self.company, name="recibo", file=SimpleUploadedFile("recibo.pdf", b"%PDF-1.4 recibo"))
+        with transaction.atomic():
+            archived = archive_event(old)
+        later = self._create("recibo_nuevo.pdf")
+        path = later.file.path
+
+        self.assertEqual(list(archived.blobs.values_list("name", flat=True)), [later.file.name])
+        with self.captureOnCommitCallbacks(execute=True):
+            later.delete()
+        call_command("collect_attachment_blobs", min_age=0, stdout=open(os.devnull, "w"))
+        self.assertTrue(os.path.exists(path))
+
+        restore_archived_event(archived)
+        self.assertFalse(ArchivedBlob.objects.exists())
+        self.assertTrue(os.path.exists(Attachment.objects.get(event=old).file.path))
+
+    def test_dedup_hit_refreshes_blob_mtime(self):
+        """Test CAS-005: Reutilizar un blob existente renueva su fecha para la limpieza por antigüedad"""
+        import time
+
+        first = self._create("recibo_1.pdf")
+        old = time.time() - 3 * 3600
+        os.utime(first.file.path, (old, old))
+
+        self._create("recibo_2.pdf")
+        self.assertGreater(os.path.getmtime(first.file.path), old + 3600)
+
+
+class AttachmentUploadHandlerTests(TestCase):
+    """Tests de la validación de adjuntos durante la subida"""
+
+    def _upload(self, name, content, field_name="file"):
+        from django.test import RequestFactory
+        request = RequestFactory().post("/", {field_name: SimpleUploadedFile(name, content)})
+        return request.FILES[field_name]
+
+    def test_valid_pdf_is_streamed_to_temp_file(self):
+        """Test UPL-001: Un PDF válido se escribe a un archivo temporal"""
+        upload = self._upload("recibo.pdf", b"%PDF-1.4\n" + b"0" * 1024)
+
+        self.assertTrue(hasattr(upload, "temporary_file_path"))
+        self.assertIsNone(getattr(upload, "upload_error", None))
+
+    def test_fake_extension_rejected_on_first_chunk(self):
+        """Test UPL-002: Un ejecutable renombrado a .png se rechaza por su contenido"""
+        from apps.attachments.models import validate_file_signature
+
+        upload = self._upload("foto.png", b"MZ\x90\x00" + b"\x00" * 4096)
+
+        self.assertIn("no corresponde", upload.upload_error)
+        self.assertEqual(upload.read(), b"")
+        with self.assertRaises(ValidationError):
+            validate_file_signature(upload)
+
+    def test_oversized_upload_rejected(self):
+        """Test UPL-003: Un archivo mayor a 5 MB se rechaza sin guardarse completo"""
+        upload = self._upload("grande.pdf", b"%PDF-1.4\n" + b"0" * (5 * 1024 * 1024))
+
+        self.assertIn("tamaño máximo", upload.upload_error)
+
+    def test_other_fields_are_not_validated(self):
+        """Test UPL-004: Las importaciones CSV no pasan por la validación de adjuntos"""
+        upload = self._upload("compras.csv", b"purchase_id,buyer\n1,Ana\n", field_name="import_file")
+
+        self.assertIsNone(getattr(upload, "upload_error", None))
+
+    def test_extension_must_match_content(self):
+        """Test UPL-005: La extensión debe corresponder al contenido"""
+        from apps.attachments.models import validate_file_signature
+
+        with self.assertRaises(ValidationError):
+            validate_file_signature(SimpleUploadedFile("recibo.pdf", b"\x89PNG\r\n\x1a\n datos"))
+        validate_file_signature(SimpleUploadedFile("recibo.png", b"\x89PNG\r\n\x1a\n datos"))
+
+
+class AttachmentPreviewTests(TestCase):
+    """Tests de las miniaturas de adjuntos"""
+
+    def setUp(self):
+        """Empresa, evento, superusuario y MEDIA_ROOT temporal"""
+        from datetime import timedelta
+        from django.test import override_settings
+        from django.utils import timezone
+        from accounts.models import CustomUser
+        from apps.events.models import Event
+        from apps.ticket_categories.models import Company
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, ATTACHMENT_PREVIEWS_IN_BACKGROUND=False)
+        self.settings_override.enable()
+        self.company = Company.objects.create(name="Preview Company")
+        self.admin_user = CustomUser.objects.create_superuser(
+            username="preview_admin", email="admin@example.com", password="pass12345", company=self.company
+        )
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Evento", description="Evento", location="Sala",
+            start_time=now, end_time=now + timedelta(hours=2),
+        )
+
+    def tearDown(self):
+        import shutil
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _png(self, size=(1200, 900)):
+        from io import BytesIO
+        from PIL import Image
+        output = BytesIO()
+        Image.new("RGB", size, (200, 30, 30)).save(output, "PNG")
+        return output.getvalue()
+
+    def test_image_thumbnail_generated_after_commit(self):
+        """Test PRV-001: Se genera una miniatura WebP pequeña para imágenes"""
+        with self.captureOnCommitCallbacks(execute=True):
+            attachment = Attachment.objects.create(
+                event=self.event, company=self.company, name="foto",
+                file=SimpleUploadedFile("foto.png", self._png()),
+            )
+
+        attachment.refresh_from_db()
+        self.assertTrue(attachment.thumbnail.name.endswith(".webp"))
+        with attachment.thumbnail.open("rb") as thumbnail:
+            data = thumbnail.read()
+        self.assertEqual(data[8:12], b"WEBP")
+        self.assertLess(len(data), 10 * 1024)
+
+    def test_thumbnail_served_with_cache_headers(self):
+        """Test PRV-002: La miniatura se sirve cacheable y con ETag"""
+        from django.urls import reverse
+
+        with self.captureOnCommitCallbacks(execute=True):
+            attachment = Attachment.objects.create(
+                event=self.event, company=self.company, name="foto",
+                file=SimpleUploadedFile("foto.png", self._png()),
+            )
+        self.client.force_login(self.admin_user)
+        url = reverse("admin:attachments_attachment_thumbnail", args=[attachment.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response["Cache-Control"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_changelist_shows_thumbnail(self):
+        """Test PRV-003: El listado muestra la miniatura en vez del archivo"""
+        from django.urls import reverse
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Attachment.objects.create(
+                event=self.event, company=self.company, name="foto",
+                file=SimpleUploadedFile("foto.png", self._png()),
+            )
+        self.client.force_login(self.admin_user)
+
+        response = self.client.get(reverse("admin:attachments_attachment_changelist"))
+
+        self.assertContains(response, 'loading="lazy"')
+
+
+class AttachmentDownloadTests(TestCase):
+    """Tests de la descarga de adjuntos"""
+
+    def setUp(self):
+        """Dos empresas, un adjunto y usuarios staff de cada empresa"""
+        from datetime import timedelta
+        from django.contrib.auth.models import Permission
+        from django.test import override_settings
+        from django.urls import reverse
+        from django.utils import timezone
+        from accounts.models import CustomUser
+        from apps.events.models import Event
+        from apps.ticket_categories.models import Company
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.company = Company.objects.create(name="Download Company")
+        other_company = Company.objects.create(name="Other Company")
+        view_permission = Permission.objects.get(codename="view_attachment")
+        self.user = CustomUser.objects.create_user(username="staff", password="pass12345", company=self.company, is_staff=True)
+        self.other_user = CustomUser.objects.create_user(username="other", password="pass12345", company=other_company, is_staff=True)
+        self.user.user_permissions.add(view_permission)
+        self.other_user.user_permissions.add(view_permission)
+        now = timezone.now()
+        event = Event.objects.create(
+            company=self.company, title="Evento", description="Evento", location="Sala",
+            start_time=now, end_time=now + timedelta(hours=2),
+        )
+        self.content = b"%PDF-1.4\n" + bytes(range(256)) * 40
+        attachment = Attachment.objects.create(
+            event=event, company=self.company, name="recibo",
+            file=SimpleUploadedFile("recibo.pdf", self.content),
+        )
+        self.attachment = attachment
+        self.url = reverse("admin:attachments_attachment_download", args=[attachment.pk])
+
+    def tearDown(self):
+        import shutil
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_full_download_with_etag(self):
+        """Test DWN-001: Descarga completa con ETag y revalidación"""
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_request(self):
+        """Test DWN-002: Peticiones parciales con Range"""
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.content)}")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.content)}-")
+        self.assertEqual(response.status_code, 416)
+
+    def test_sendfile_offload(self):
+        """Test DWN-003: Con X-Accel-Redirect el servidor web entrega el archivo"""
+        self.client.force_login(self.user)
+
+        with self.settings(ATTACHMENT_SENDFILE="x-accel-redirect"):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["X-Accel-Redirect"].startswith("/protected-media/cas/"))
+        self.assertEqual(response.content, b"")
+
+    def test_other_company_cannot_download(self):
+        """Test DWN-004: Usuarios de otra empresa no pueden descargar el adjunto"""
+        self.client.force_login(self.other_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_blob_is_not_found(self):
+        """Test DWN-005: Si el archivo ya no está en el storage la descarga responde 404"""
+        self.client.force_login(self.user)
+        os.remove(self.attachment.file.path)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,67 @@
+# apps/attachments/uploadhandler.py
+from io import BytesIO
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+from .models import MAX_UPLOAD_SIZE_KB, SIGNATURE_LENGTH, sniff_file_extensions
+
+
+class RejectedUpload(UploadedFile):
+    """Archivo rechazado durante la subida; el motivo se reporta en la validación del modelo."""
+
+    def __init__(self, name, content_type, size, charset, upload_error):
+        super().__init__(BytesIO(), name, content_type, size, charset)
+        self.upload_error = upload_error
+
+
+class AttachmentUploadHandler(FileUploadHandler):
+    """Valida los adjuntos mientras se reciben, antes de que lleguen al disco.
+
+    Debe ir antes de TemporaryFileUploadHandler en FILE_UPLOAD_HANDLERS. Revisa
+    los magic bytes del primer bloque y el tamaño acumulado; ante una violación
+    deja de pasar bloques al siguiente handler y entrega un RejectedUpload vacío.
+    Los campos que no son adjuntos pasan sin cambios.
+    """
+
+    field_names = ('file',)
+    max_size = MAX_UPLOAD_SIZE_KB * 1024
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name in self.field_names
+        self.header = b''
+        self.received = 0
+        self.upload_error = None
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        if self.upload_error:
+            return None
+
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.upload_error = f"El tamaño máximo del archivo es {MAX_UPLOAD_SIZE_KB} KB"
+            return None
+
+        if len(self.header) < SIGNATURE_LENGTH:
+            self.header += raw_data[:SIGNATURE_LENGTH - len(self.header)]
+            if len(self.header) >= SIGNATURE_LENGTH and not self._header_allowed():
+                return None
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        if not self.upload_error:
+            self._header_allowed()  # archivos más cortos que la firma
+        if self.upload_error:
+            return RejectedUpload(self.file_name, self.content_type, self.received, self.charset, self.upload_error)
+        return None
+
+    def _header_allowed(self):
+        if sniff_file_extensions(self.header) is None:
+            self.upload_error = 'El contenido del archivo no corresponde a un PDF, PNG o JPEG.'
+            return False
+        return True
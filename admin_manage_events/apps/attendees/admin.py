@@ -1,15 +1,34 @@
 # apps/attendees/admin.py
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import Attendee
-from .forms import AttendeeForm
-from .models import Purchase, Attendee, Ticket
-from .resources import PurchaseResource
+from .forms import AttendeeForm, TicketForm
+from .models import Purchase, Attendee, Ticket, TicketEmail
+from .emails import enqueue_ticket_emails
+from .resources import AttendeeResource, PurchaseResource
+from .search import search_attendees
+from .tokens import ticket_qr_svg, ticket_token
 from import_export.admin import ImportExportModelAdmin
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 
-class AttendeeAdmin(admin.ModelAdmin):
+class AttendeeAdmin(ImportExportModelAdmin):
     form = AttendeeForm
-    list_display = ('name', 'phone_number', 'created_at','updated_at')
+    resource_class = AttendeeResource
+    list_display = ('name', 'document_type', 'document_number', 'email', 'phone_number', 'created_at','updated_at')
+    # Solo para mostrar la caja de búsqueda: la búsqueda la hace search_attendees con índices
+    search_fields = ('name', 'email', 'document_number')
+    search_help_text = 'Nombre (o su comienzo), correo o número de documento'
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_attendees(search_term, queryset), False
+
+    def get_import_resource_kwargs(self, request, **kwargs):
+        # Las filas de personas que ya existen se buscan solo entre los asistentes que ve el usuario
+        return {**super().get_import_resource_kwargs(request, **kwargs), 'attendees': self.get_queryset(request)}
 
     def get_form(self, request, obj=None, **kwargs):
 
@@ -19,6 +38,8 @@ class AttendeeAdmin(admin.ModelAdmin):
         form = super(AttendeeAdmin, self).get_form(request, obj, **kwargs)
         # 
         form.user = request.user
+        # Para avisar, al agregar, que la persona ya está registrada (ver AttendeeForm.clean)
+        form.attendees = self.get_queryset(request)
         return form
 
     def get_queryset(self, request):
@@ -37,6 +58,7 @@ class AttendeeAdmin(admin.ModelAdmin):
          
 class TicketInline(admin.TabularInline):  
     model = Ticket  
+    form = TicketForm
     extra = 1  
 
 
@@ -60,6 +82,74 @@ class PurchaseAdmin(ImportExportModelAdmin):
         return [f for f in formats if f().get_title() in ['csv', 'xlsx']]
 
 
+class TicketAdmin(admin.ModelAdmin):
+    list_display = ('ticket_id', 'attendee', 'purchase', 'ticket_confirmed', 'checked_in_at', 'checkin_gate')
+    list_select_related = ('attendee', 'purchase__event', 'purchase__ticket_category')
+    readonly_fields = ('checked_in_at', 'checkin_gate', 'token', 'qr_code', 'pdf')
+    actions = ['send_by_email']
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        try:
+            if request.user.is_superuser:
+                return qs
+            return qs.filter(purchase__company=request.user.company)
+        except Exception:
+            return qs.none()
+
+    @admin.display(description='Token')
+    def token(self, obj):
+        return ticket_token(obj) if obj.pk else '-'
+
+    @admin.display(description='Código QR')
+    def qr_code(self, obj):
+        if not obj.pk:
+            return '-'
+        svg = ticket_qr_svg(ticket_token(obj))
+        # el SVG lo genera la librería qrcode a partir del token (base32), no incluye datos del usuario
+        return mark_safe(svg.split('?>', 1)[-1]) if svg else '-'
+
+    @admin.display(description='PDF')
+    def pdf(self, obj):
+        if not obj.ticket_pdf_id:
+            return '-'
+        url = reverse('admin:attachments_attachment_download', args=[obj.ticket_pdf_id])
+        return format_html('<a href="{}">Descargar</a>', url)
+
+    @admin.action(description='Enviar boletos por correo')
+    def send_by_email(self, request, queryset):
+        queued = enqueue_ticket_emails(queryset)
+        self.message_user(request, f'{queued} boletos en cola de envío.', messages.SUCCESS)
+
+
+class TicketEmailAdmin(admin.ModelAdmin):
+    list_display = ('ticket', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    list_select_related = ('ticket__attendee', 'ticket__purchase__event', 'ticket__purchase__ticket_category')
+    readonly_fields = ('ticket', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'last_error')
+    actions = ['retry']
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        try:
+            if request.user.is_superuser:
+                return qs
+            return qs.filter(ticket__purchase__company=request.user.company)
+        except Exception:
+            return qs.none()
+
+    @admin.action(description='Reintentar envío')
+    def retry(self, request, queryset):
+        updated = queryset.filter(status=TicketEmail.STATUS_FAILED).update(
+            status=TicketEmail.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f'{updated} correos reenviados a la cola.', messages.SUCCESS)
+
+
 admin.site.register(Purchase, PurchaseAdmin)  
 admin.site.register(Attendee, AttendeeAdmin)  
-admin.site.register(Ticket)  
\ No newline at end of file
+admin.site.register(Ticket, TicketAdmin)
+admin.site.register(TicketEmail, TicketEmailAdmin)
@@ -1,6 +1,12 @@
 # apps/attendees/apps.py
 from django.apps import AppConfig
 
+from .xlsx import register_lazy_xlsx
+
+# Aquí y no en ready(): el admin (primero en INSTALLED_APPS) hace el
+# autodiscover en su ready() e importa import_export antes que esta app.
+register_lazy_xlsx()
+
 
 class AttendeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -10,3 +16,4 @@ class AttendeesConfig(AppConfig):
     def ready(self):
         # activamos los signals
         import apps.attendees.signals  # Importar las señales
+        import apps.attendees.checks  # noqa: F401  (registra las verificaciones del sistema)
@@ -0,0 +1,163 @@
+# apps/attendees/bundles.py
+import contextlib
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .checkin import Scan, apply_scans
+from .models import Ticket
+from .tokens import TOKEN_VERSION, event_key, make_ticket_token, verify_ticket_token
+
+BUNDLE_VERSION = 1
+BUNDLE_CHUNK_SIZE = 2000
+MAX_SYNC_SCANS = 50000
+
+BUNDLE_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE tickets (
+    ticket_id INTEGER PRIMARY KEY,
+    token_hash BLOB NOT NULL,
+    attendee_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    confirmed INTEGER NOT NULL
+);
+"""
+
+
+class SyncError(ValueError):
+    pass
+
+
+def token_hash(token):
+    """Hash corto del token para que el escáner lo compare sin conocer la clave."""
+    return hashlib.sha256(token.encode('ascii')).digest()[:16]
+
+
+def write_checkin_bundle(event, path):
+    """Escribe en `path` el paquete SQLite de ingreso de un evento. Devuelve cuántos boletos incluye.
+
+    Contiene la clave del evento (para verificar tokens sin conexión) y una
+    fila por boleto ordenada por ticket_id, de modo que el escáner busca por
+    la clave primaria. Solo se guarda un hash del token, no el documento.
+    """
+    key = event_key(event.pk)
+    rows = (
+        Ticket.objects.filter(purchase__event=event)
+        .order_by('pk')
+        .values_list(
+            'pk', 'attendee__name', 'attendee__document_type', 'attendee__document_number',
+            'purchase__ticket_category__name', 'ticket_confirmed',
+        )
+    )
+
+    if os.path.exists(path):
+        os.remove(path)
+    database = sqlite3.connect(path)
+    count = 0
+    try:
+        database.executescript(BUNDLE_SCHEMA)
+        database.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', [
+            ('bundle_version', str(BUNDLE_VERSION)),
+            ('token_version', str(TOKEN_VERSION)),
+            ('event_id', str(event.pk)),
+            ('event_title', event.title),
+            ('event_key', key.hex()),
+            ('generated_at', timezone.now().isoformat()),
+        ])
+        batch = []
+        for ticket_id, name, document_type, document_number, category, confirmed in rows.iterator(chunk_size=BUNDLE_CHUNK_SIZE):
+            token = make_ticket_token(ticket_id, event.pk, document_type, document_number, key=key)
+            batch.append((ticket_id, token_hash(token), name, category, int(confirmed)))
+            if len(batch) >= BUNDLE_CHUNK_SIZE:
+                database.executemany('INSERT INTO tickets VALUES (?, ?, ?, ?, ?)', batch)
+                count += len(batch)
+                batch = []
+        database.executemany('INSERT INTO tickets VALUES (?, ?, ?, ?, ?)', batch)
+        count += len(batch)
+        database.commit()
+    finally:
+        database.close()
+    return count
+
+
+class TemporaryBundleFile(io.FileIO):
+    """Archivo de solo lectura que borra su ruta al cerrarse.
+
+    Se borra después de cerrar y no mientras está abierto, que en Windows
+    falla con PermissionError.
+    """
+
+    def __init__(self, path):
+        super().__init__(path, 'rb')
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.name)
+
+
+def checkin_bundle_file(event):
+    """Genera el paquete en un archivo temporal ya abierto; se borra al cerrarlo."""
+    fd, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(fd)
+    try:
+        write_checkin_bundle(event, path)
+    except BaseException:
+        os.remove(path)
+        raise
+    return TemporaryBundleFile(path)
+
+
+def _parse_scan(entry, event_id, default_gate, key):
+    """Convierte una entrada del registro del escáner en Scan, o None si no es válida."""
+    if not isinstance(entry, dict):
+        return None
+    if entry.get('token'):
+        parsed = verify_ticket_token(str(entry['token']), key=key)
+        if parsed is None or parsed.event_id != event_id:
+            return None
+        ticket_id = parsed.ticket_id
+    else:
+        try:
+            ticket_id = int(entry['ticket'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    try:
+        scanned_at = parse_datetime(str(entry.get('scanned_at', '')))
+    except ValueError:
+        return None
+    if scanned_at is None:
+        return None
+    if timezone.is_naive(scanned_at):
+        scanned_at = timezone.make_aware(scanned_at)
+    gate = str(entry.get('gate') or default_gate)[:50]
+    return Scan(ticket_id, event_id, gate, scanned_at)
+
+
+def sync_scans(event_id, entries, gate=''):
+    """Ingresa el registro de escaneos de un dispositivo sin conexión.
+
+    Cada entrada trae `token` (verificado con la clave del evento) o `ticket`
+    (ya validado por el escáner contra el paquete), más `scanned_at` y
+    opcionalmente `gate`. Devuelve (recibidos, rechazados, actualizados).
+    """
+    if not isinstance(entries, list):
+        raise SyncError('El campo scans debe ser una lista.')
+    if len(entries) > MAX_SYNC_SCANS:
+        raise SyncError(f'Se aceptan como máximo {MAX_SYNC_SCANS} escaneos por sincronización.')
+
+    key = event_key(event_id)
+    scans = []
+    for entry in entries:
+        scan = _parse_scan(entry, event_id, gate, key)
+        if scan is not None:
+            scans.append(scan)
+    return len(entries), len(entries) - len(scans), apply_scans(scans)
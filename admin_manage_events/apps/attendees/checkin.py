@@ -0,0 +1,273 @@
+# apps/attendees/checkin.py
+import atexit
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.db import close_old_connections, connections, router, transaction
+from django.utils import timezone
+
+from .models import Ticket
+from .tokens import verify_ticket_token
+
+logger = logging.getLogger(__name__)
+
+CheckinResult = namedtuple('CheckinResult', 'status ticket_id checked_in_at gate')
+Scan = namedtuple('Scan', 'ticket_id event_id gate scanned_at')
+
+CHECKIN_OK = 'ok'
+CHECKIN_DUPLICATE = 'duplicate'
+CHECKIN_NOT_FOUND = 'not_found'
+CHECKIN_WRONG_EVENT = 'wrong_event'
+CHECKIN_INVALID = 'invalid'
+
+
+def check_in_ticket(ticket_id, event_id, gate='', company_id=None, now=None):
+    """Confirma el ingreso de un boleto con un único UPDATE condicional.
+
+    El UPDATE solo afecta boletos aún no confirmados, así que dos escaneos
+    simultáneos del mismo boleto no pueden ingresar ambos. Al no llamar a
+    save() no se dispara el recálculo de tickets_sold (la venta no cambia).
+    Solo cuando el UPDATE no afecta filas se consulta el motivo.
+    """
+    now = now or timezone.now()
+    tickets = Ticket.objects.filter(pk=ticket_id, purchase__event_id=event_id)
+    if company_id is not None:
+        tickets = tickets.filter(purchase__company_id=company_id)
+
+    updated = tickets.filter(ticket_confirmed=False).update(
+        ticket_confirmed=True, checked_in_at=now, checkin_gate=gate, updated_at=now,
+    )
+    if updated:
+        return CheckinResult(CHECKIN_OK, ticket_id, now, gate)
+
+    previous = tickets.values_list('checked_in_at', 'checkin_gate').first()
+    if previous is None:
+        return CheckinResult(CHECKIN_NOT_FOUND, ticket_id, None, None)
+    return CheckinResult(CHECKIN_DUPLICATE, ticket_id, *previous)
+
+
+# Por encima de este número de boletos se lee el evento completo en vez de un IN enorme
+MAX_IN_LIST = 900
+CHECKIN_FIELDS = ['ticket_confirmed', 'checked_in_at', 'checkin_gate', 'updated_at']
+
+
+def apply_scans(scans):
+    """Escribe en bloque una lista de Scan. Devuelve cuántos boletos se actualizaron.
+
+    Si un boleto aparece varias veces (o ya estaba confirmado) prevalece el
+    escaneo más antiguo. Los escaneos de boletos inexistentes o de otro evento
+    se descartan. Todo ocurre en una transacción con un SELECT y un UPDATE,
+    sin importar cuántos escaneos lleguen.
+    """
+    earliest = {}
+    for scan in scans:
+        current = earliest.get(scan.ticket_id)
+        if current is None or scan.scanned_at < current.scanned_at:
+            earliest[scan.ticket_id] = scan
+    if not earliest:
+        return 0
+
+    if len(earliest) > MAX_IN_LIST:
+        tickets = Ticket.objects.filter(purchase__event_id__in={scan.event_id for scan in earliest.values()})
+    else:
+        tickets = Ticket.objects.filter(pk__in=list(earliest))
+
+    now = timezone.now()
+    changed = []
+    with transaction.atomic():
+        rows = tickets.select_for_update().values_list('pk', 'purchase__event_id', 'ticket_confirmed', 'checked_in_at')
+        for ticket_id, event_id, confirmed, checked_in_at in rows:
+            scan = earliest.get(ticket_id)
+            if scan is None or scan.event_id != event_id:
+                continue
+            if confirmed and checked_in_at is not None and checked_in_at <= scan.scanned_at:
+                continue
+            changed.append(Ticket(
+                pk=ticket_id, ticket_confirmed=True, checked_in_at=scan.scanned_at,
+                checkin_gate=scan.gate, updated_at=now,
+            ))
+        if changed:
+            _write_checkins(changed, now)
+    return len(changed)
+
+
+def _supports_update_from(connection):
+    if connection.vendor == 'postgresql':
+        return True
+    # UPDATE ... FROM existe en SQLite desde 3.33
+    return connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 33)
+
+
+def _write_checkins(tickets, now):
+    """Actualiza los boletos con una tabla temporal y un único UPDATE ... FROM.
+
+    bulk_update genera un CASE por campo y en SQLite se parte en lotes de
+    ~100 filas por el límite de parámetros; con miles de escaneos eso son
+    cientos de consultas. En otros motores se usa bulk_update.
+    """
+    connection = connections[router.db_for_write(Ticket)]
+    if not _supports_update_from(connection):
+        Ticket.objects.bulk_update(tickets, CHECKIN_FIELDS, batch_size=500)
+        return
+
+    meta = Ticket._meta
+    quote = connection.ops.quote_name
+    table = quote(meta.db_table)
+    pk_column = quote(meta.pk.column)
+    columns = {name: quote(meta.get_field(name).column) for name in CHECKIN_FIELDS}
+    datetime_type = meta.get_field('checked_in_at').db_type(connection)
+    adapt = connection.ops.adapt_datetimefield_value
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE checkin_sync (ticket_id integer PRIMARY KEY, checked_in_at {datetime_type}, gate varchar(50))'
+        )
+        try:
+            cursor.executemany(
+                'INSERT INTO checkin_sync (ticket_id, checked_in_at, gate) VALUES (%s, %s, %s)',
+                [(ticket.pk, adapt(ticket.checked_in_at), ticket.checkin_gate) for ticket in tickets],
+            )
+            cursor.execute(
+                f'UPDATE {table} SET {columns["ticket_confirmed"]} = %s, '
+                f'{columns["checked_in_at"]} = checkin_sync.checked_in_at, '
+                f'{columns["checkin_gate"]} = checkin_sync.gate, {columns["updated_at"]} = %s '
+                f'FROM checkin_sync WHERE {table}.{pk_column} = checkin_sync.ticket_id',
+                [True, adapt(now)],
+            )
+        finally:
+            cursor.execute('DROP TABLE checkin_sync')
+
+
+class ScanBuffer:
+    """Cola en memoria de escaneos ya verificados por firma.
+
+    La puerta responde sin esperar la escritura; un hilo escribe los
+    escaneos pendientes cada `max_delay` segundos o al llegar a `max_size`.
+    Recuerda los boletos ya escaneados en este proceso para rechazar un
+    segundo ingreso sin consultar la base; dos escaneos simultáneos en
+    procesos distintos se resuelven al escribir (gana el más antiguo).
+    Un escaneo que no se puede escribir en `max_attempts` intentos se
+    descarta (queda en el log) para no reintentarlo para siempre.
+    """
+
+    def __init__(self, max_size=500, max_delay=1.0, max_seen=200000, max_attempts=5, background=True):
+        self.background = background
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_seen = max_seen
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._pending = []
+        self._attempts = {}
+        self._seen = OrderedDict()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def add(self, scan):
+        """Agrega un escaneo; devuelve el escaneo anterior si el boleto ya había ingresado."""
+        with self._lock:
+            previous = self._seen.get(scan.ticket_id)
+            if previous is not None:
+                return previous
+            self._seen[scan.ticket_id] = scan
+            if len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+            self._pending.append(scan)
+            pending = len(self._pending)
+            self._ensure_thread()
+        if pending >= self.max_size:
+            self._wakeup.set()
+        return None
+
+    def seen(self, ticket_id):
+        """Escaneo de este proceso para el boleto (quizá aún sin escribir), o None."""
+        with self._lock:
+            return self._seen.get(ticket_id)
+
+    def flush(self):
+        with self._lock:
+            scans, self._pending = self._pending, []
+        if not scans:
+            return 0
+        try:
+            written = apply_scans(scans)
+        except Exception:
+            logger.exception('No se pudieron guardar %s escaneos', len(scans))
+            self._retry(scans)
+            return 0
+        with self._lock:
+            for scan in scans:
+                self._attempts.pop(scan, None)
+        return written
+
+    def _retry(self, scans):
+        """Devuelve los escaneos a la cola, salvo los que agotaron sus intentos."""
+        retry, dropped = [], []
+        with self._lock:
+            for scan in scans:
+                attempts = self._attempts.get(scan, 0) + 1
+                if attempts >= self.max_attempts:
+                    self._attempts.pop(scan, None)
+                    # olvidarlo permite volver a escanear el boleto
+                    if self._seen.get(scan.ticket_id) == scan:
+                        del self._seen[scan.ticket_id]
+                    dropped.append(scan.ticket_id)
+                else:
+                    self._attempts[scan] = attempts
+                    retry.append(scan)
+            self._pending[:0] = retry
+        if dropped:
+            logger.error('Se descartan %s escaneos tras %s intentos fallidos: boletos %s', len(dropped), self.max_attempts, dropped)
+
+    def _ensure_thread(self):
+        if not self.background:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='checkin-scan-buffer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.max_delay)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+
+scan_buffer = ScanBuffer()
+atexit.register(scan_buffer.flush)
+
+
+def check_in_token(token, event_id, gate='', company_id=None, buffer=None):
+    """Ingreso con token firmado en la puerta del evento `event_id`.
+
+    La firma se verifica sin consultar la base de datos; un token de otro
+    evento se rechaza sin consultas. Una lectura por clave primaria revisa
+    que el boleto exista, sea de ese evento (y de la empresa) y no haya
+    ingresado ya por /checkin/ o por otro proceso. La escritura queda en la
+    cola de escaneos.
+    """
+    parsed = verify_ticket_token(token)
+    if parsed is None:
+        return CheckinResult(CHECKIN_INVALID, None, None, None)
+    if parsed.event_id != event_id:
+        return CheckinResult(CHECKIN_WRONG_EVENT, parsed.ticket_id, None, None)
+
+    stored = Ticket.objects.filter(pk=parsed.ticket_id).values_list(
+        'purchase__event_id', 'purchase__company_id', 'ticket_confirmed', 'checked_in_at', 'checkin_gate',
+    ).first()
+    if stored is None or (company_id is not None and stored[1] != company_id):
+        return CheckinResult(CHECKIN_NOT_FOUND, parsed.ticket_id, None, None)
+    ticket_event_id, _, confirmed, checked_in_at, checkin_gate = stored
+    if ticket_event_id != event_id:
+        return CheckinResult(CHECKIN_WRONG_EVENT, parsed.ticket_id, None, None)
+    if confirmed:
+        return CheckinResult(CHECKIN_DUPLICATE, parsed.ticket_id, checked_in_at, checkin_gate)
+
+    buffer = buffer or scan_buffer
+    scan = Scan(parsed.ticket_id, event_id, gate, timezone.now())
+    previous = buffer.add(scan)
+    if previous is not None:
+        return CheckinResult(CHECKIN_DUPLICATE, parsed.ticket_id, previous.scanned_at, previous.gate)
+    return CheckinResult(CHECKIN_OK, parsed.ticket_id, scan.scanned_at, gate)
@@ -0,0 +1,22 @@
+# apps/attendees/checks.py
+from django.contrib.staticfiles import finders
+from django.core.checks import Tags, Warning, register
+
+from .forms import INTL_TEL_INPUT_FILES, INTL_TEL_INPUT_VERSION
+
+
+@register(Tags.staticfiles)
+def intl_tel_input_vendored(app_configs, **kwargs):
+    """Avisa si intl-tel-input no está copiado en static/vendor/ y el admin lo carga del CDN."""
+    missing = [
+        path for path in INTL_TEL_INPUT_FILES
+        if not finders.find(f'vendor/intl-tel-input/{INTL_TEL_INPUT_VERSION}/{path}')
+    ]
+    if not missing:
+        return []
+    return [Warning(
+        f'intl-tel-input {INTL_TEL_INPUT_VERSION} no está en static/vendor/ ({", ".join(missing)}); '
+        'el formulario de asistentes lo carga desde el CDN.',
+        hint='Ejecute "python manage.py vendor_intl_tel_input" y agregue los archivos al repositorio.',
+        id='attendees.W001',
+    )]
@@ -0,0 +1,198 @@
+# apps/attendees/emails.py
+import logging
+import smtplib
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections, router, transaction
+from django.template.loader import get_template
+from django.utils import timezone
+
+from .models import Ticket, TicketEmail
+from .tokens import event_key, make_ticket_token
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 60  # segundos; se duplica en cada intento
+RETRY_MAX_DELAY = 6 * 60 * 60
+CLAIM_TIMEOUT = 15 * 60  # si el proceso muere con un lote reservado, se retoma pasado este tiempo
+
+
+class RateLimiter:
+    """Espacia los envíos para no superar `per_minute` mensajes por minuto (None = sin límite)."""
+
+    def __init__(self, per_minute=None, sleep=time.sleep, clock=time.monotonic):
+        self.interval = 60.0 / per_minute if per_minute else 0
+        self.sleep = sleep
+        self.clock = clock
+        self.next_slot = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = self.clock()
+        if self.next_slot is not None and now < self.next_slot:
+            self.sleep(self.next_slot - now)
+            now = self.next_slot
+        self.next_slot = now + self.interval
+
+
+def enqueue_ticket_emails(tickets):
+    """Encola el envío de los boletos que no tienen ya un correo pendiente. Devuelve cuántos se encolaron."""
+    ticket_ids = (
+        tickets.exclude(emails__status=TicketEmail.STATUS_PENDING)
+        .order_by()
+        .values_list('pk', flat=True)
+        .distinct()
+    )
+    emails = TicketEmail.objects.bulk_create(
+        [TicketEmail(ticket_id=ticket_id) for ticket_id in ticket_ids.iterator()], batch_size=1000,
+    )
+    return len(emails)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY))
+
+
+def _claim_batch(limit, now):
+    """Reserva hasta `limit` correos vencidos moviendo su próximo intento hacia el futuro.
+
+    Cada llamada marca las filas con su propio claim_token en un UPDATE
+    condicional (solo filas aún pendientes y vencidas) y después lee solo
+    las que quedaron con ese token, así dos procesos que leen el mismo lote
+    no envían el mismo correo. Donde la base lo permite, SELECT ... FOR
+    UPDATE SKIP LOCKED hace además que cada proceso lea un lote distinto.
+    """
+    token = uuid.uuid4().hex
+    lease = now + timedelta(seconds=CLAIM_TIMEOUT)
+    due = TicketEmail.objects.filter(status=TicketEmail.STATUS_PENDING, next_attempt_at__lte=now)
+    with transaction.atomic():
+        candidates = due.order_by('next_attempt_at')
+        if connections[router.db_for_write(TicketEmail)].features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('pk', flat=True)[:limit])
+        if not ids:
+            return []
+        due.filter(pk__in=ids).update(next_attempt_at=lease, claim_token=token)
+    return list(
+        TicketEmail.objects.filter(pk__in=ids, claim_token=token)
+        .select_related('ticket__attendee', 'ticket__purchase__event', 'ticket__purchase__ticket_category')
+    )
+
+
+class TicketEmailRenderer:
+    """Arma los mensajes de un lote reutilizando las plantillas y las claves de evento."""
+
+    subject = 'Tu boleto para {event}'
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.text_template = get_template('attendees/ticket_email.txt')
+        self.html_template = get_template('attendees/ticket_email.html')
+        self.keys = {}
+
+    def render(self, ticket):
+        attendee = ticket.attendee
+        event = ticket.purchase.event
+        key = self.keys.get(event.pk)
+        if key is None:
+            key = self.keys[event.pk] = event_key(event.pk)
+        context = {
+            'ticket': ticket,
+            'attendee': attendee,
+            'event': event,
+            'category': ticket.purchase.ticket_category,
+            'token': make_ticket_token(ticket.pk, event.pk, attendee.document_type, attendee.document_number, key=key),
+        }
+        message = EmailMultiAlternatives(
+            self.subject.format(event=event.title),
+            self.text_template.render(context),
+            settings.DEFAULT_FROM_EMAIL,
+            [attendee.email],
+            connection=self.connection,
+        )
+        message.attach_alternative(self.html_template.render(context), 'text/html')
+        return message
+
+
+def _send(connection, message):
+    try:
+        if not connection.send_messages([message]):
+            raise smtplib.SMTPException('El servidor no aceptó el mensaje.')
+    except smtplib.SMTPServerDisconnected:
+        # se reabre la conexión para el resto del lote; este mensaje se reintenta luego
+        connection.close()
+        connection.open()
+        raise
+
+
+def _record_results(sent, failed, max_attempts, now):
+    for email in sent + failed:
+        email.claim_token = ''
+    for email in sent:
+        email.status = TicketEmail.STATUS_SENT
+        email.attempts += 1
+        email.sent_at = now
+        email.last_error = ''
+        email.updated_at = now
+    for email in failed:
+        email.attempts += 1
+        email.updated_at = now
+        if email.attempts >= max_attempts:
+            email.status = TicketEmail.STATUS_FAILED
+        else:
+            email.next_attempt_at = now + retry_delay(email.attempts)
+
+    with transaction.atomic():
+        TicketEmail.objects.bulk_update(
+            sent + failed, ['status', 'attempts', 'next_attempt_at', 'sent_at', 'last_error', 'claim_token', 'updated_at'], batch_size=500,
+        )
+        if sent:
+            Ticket.objects.filter(pk__in=[email.ticket_id for email in sent]).update(ticket_send_by_email=True, updated_at=now)
+
+
+def send_ticket_emails(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS, rate=None, connection=None, sleep=time.sleep):
+    """Envía los correos pendientes de la cola por una sola conexión SMTP.
+
+    Procesa lotes de `batch_size` hasta vaciar la cola. Cada mensaje se envía
+    por separado sobre la conexión abierta para saber cuál falló; los fallidos
+    se reintentan con espera exponencial y tras `max_attempts` quedan como
+    fallidos. Sin `rate` se usa TICKET_EMAIL_RATE_PER_MINUTE. Devuelve
+    (enviados, fallidos).
+    """
+    if rate is None:
+        rate = getattr(settings, 'TICKET_EMAIL_RATE_PER_MINUTE', None)
+    connection = connection or get_connection()
+    limiter = RateLimiter(rate, sleep=sleep)
+    renderer = TicketEmailRenderer(connection)
+    sent_total = failed_total = 0
+
+    connection.open()
+    try:
+        while True:
+            batch = _claim_batch(batch_size, timezone.now())
+            if not batch:
+                break
+            sent, failed = [], []
+            for email in batch:
+                limiter.wait()
+                try:
+                    _send(connection, renderer.render(email.ticket))
+                except Exception as error:
+                    logger.warning('No se pudo enviar el boleto %s: %s', email.ticket_id, error)
+                    email.last_error = str(error)[:1000]
+                    failed.append(email)
+                else:
+                    sent.append(email)
+            _record_results(sent, failed, max_attempts, timezone.now())
+            sent_total += len(sent)
+            failed_total += len(failed)
+    finally:
+        connection.close()
+    return sent_total, failed_total
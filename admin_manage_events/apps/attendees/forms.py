@@ -1,8 +1,27 @@
 # apps/attendees/forms.py
 from django import forms
-from .models import Attendee
+from django.contrib.staticfiles import finders
+from django.urls import reverse
+from django.utils.html import format_html
+from .identity import company_attendees, find_attendee, get_or_create_attendee
+from .models import Attendee, Ticket
+
+INTL_TEL_INPUT_VERSION = '17.0.3'
+INTL_TEL_INPUT_FILES = ('js/intlTelInput.min.js', 'css/intlTelInput.css', 'img/flags.png', 'img/flags@2x.png')
+INTL_TEL_INPUT_CDN = f'https://cdn.jsdelivr.net/npm/intl-tel-input@{INTL_TEL_INPUT_VERSION}/build/'
+
+
+def intl_tel_input(path):
+    """Ruta de un archivo de intl-tel-input: la copia local si está en static/, si no el CDN."""
+    local = f'vendor/intl-tel-input/{INTL_TEL_INPUT_VERSION}/{path}'
+    if finders.find(local):
+        return local
+    return INTL_TEL_INPUT_CDN + path
+
 
 class AttendeeForm(forms.ModelForm):
+    # Asistentes que ve el usuario, los asigna AttendeeAdmin.get_form
+    attendees = None
 
     class Meta:
         model = Attendee 
@@ -10,13 +29,12 @@ class AttendeeForm(forms.ModelForm):
     
     class Media:
         css = {
-            'all': ('https://cdn.jsdelivr.net/npm/intl-tel-input@17.0.3/build/css/intlTelInput.css',
+            'all': (intl_tel_input('css/intlTelInput.css'),
                     'css/phone_number.css')
         }
 
         js = (
-            'https://cdn.jsdelivr.net/npm/intl-tel-input@17.0.3/build/js/intlTelInput.min.js',
-            'https://cdnjs.cloudflare.com/ajax/libs/intl-tel-input/17.0.3/js/intlTelInput.min.js',
+            intl_tel_input('js/intlTelInput.min.js'),
             'js/phone_number_init.js',  # Archivo JS personalizado
         )
 
@@ -52,4 +70,64 @@ class AttendeeForm(forms.ModelForm):
                 self.cleaned_data['phone_number'] = '+'
                 self.add_error('phone_number', 'Debe incluir el prefijo de marcación internacional.')
 
-        return cleaned_data
\ No newline at end of file
+        # Agregar a alguien que ya está registrado (mismo documento) lleva a su registro:
+        # no se crea otro ni se guarda encima de él
+        if self.attendees is not None and self.instance._state.adding:
+            existing = find_attendee(
+                cleaned_data.get('document_type'), cleaned_data.get('document_number') or '',
+                cleaned_data.get('email') or '', queryset=self.attendees,
+            )
+            if existing is not None:
+                raise forms.ValidationError(format_html(
+                    '{} ya está registrado con ese documento: <a href="{}">abrir su registro</a>.',
+                    existing, reverse('admin:attendees_attendee_change', args=[existing.pk]),
+                ))
+
+        return cleaned_data
+
+
+class TicketForm(forms.ModelForm):
+    """Boleto de una compra: se elige al asistente o se identifica por su documento.
+
+    Con documento, nombre y correo se usa get_or_create_attendee entre los
+    asistentes de la empresa de la compra: la misma persona no se registra
+    otra vez y un registro existente no se modifica.
+    """
+    attendee_document_type = forms.ChoiceField(
+        choices=Attendee.DOCUMENT_TYPE_CHOICES, initial='DNI', required=False, label='Tipo documento',
+    )
+    attendee_document_number = forms.CharField(max_length=100, required=False, label='Número documento')
+    attendee_name = forms.CharField(max_length=255, required=False, label='Nombres asistente')
+    attendee_email = forms.EmailField(required=False, label='Correo')
+    attendee_phone_number = forms.CharField(max_length=100, required=False, label='Teléfono')
+
+    class Meta:
+        model = Ticket
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['attendee'].required = False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('attendee') is None and not cleaned_data.get('DELETE'):
+            missing = [
+                name for name in ('attendee_document_number', 'attendee_name', 'attendee_email')
+                if not cleaned_data.get(name)
+            ]
+            if len(missing) == 3:
+                raise forms.ValidationError('Elija un asistente o ingrese su documento, nombre y correo.')
+            for name in missing:
+                self.add_error(name, 'Requerido para identificar al asistente.')
+        return cleaned_data
+
+    def save(self, commit=True):
+        if self.instance.attendee_id is None:
+            data = self.cleaned_data
+            self.instance.attendee, _ = get_or_create_attendee(
+                data['attendee_document_type'] or 'DNI', data['attendee_document_number'], data['attendee_email'],
+                queryset=company_attendees(self.instance.purchase.company_id),
+                name=data['attendee_name'], phone_number=data['attendee_phone_number'],
+            )
+        return super().save(commit)
@@ -0,0 +1,228 @@
+# apps/attendees/identity.py
+"""Identidad de asistentes: no crear duplicados y fusionar los que ya existen.
+
+Dos registros son la misma persona si tienen el mismo número de documento
+normalizado (normalize_document_number: sin espacios, puntos ni guiones y
+en mayúsculas) y además:
+
+- el mismo tipo de documento, o
+- el mismo correo normalizado (el DNI que una compra cargó como "Otros").
+
+Un mismo correo con documentos distintos no une registros: suele ser una
+familia o una empresa que compra con un solo correo. Los registros sin
+número de documento no se unen con nadie.
+
+La identidad es por empresa: solo se unen registros con boletos de las
+mismas empresas (la empresa es parte de la clave), porque al fusionar el
+registro conservado toma datos de los demás y cada empresa ve y edita los
+asistentes de sus compras.
+
+find_duplicates no compara registros de a pares: la base agrupa por cada
+clave de bloque, (tipo, documento) y (correo, documento), con GROUP BY ...
+HAVING COUNT(*) > 1; solo se leen las filas de esos bloques y un union-find
+junta los bloques que comparten filas. merge_duplicates conserva el
+registro más antiguo de cada grupo y mueve los boletos de los demás con un
+UPDATE por lote.
+"""
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.functions import Lower, Replace, Trim, Upper
+from django.utils import timezone
+
+from .models import DOCUMENT_SEPARATORS, Attendee, Ticket, normalize_document_number, normalize_email
+
+MERGE_CHUNK_SIZE = 500
+# Datos que el registro conservado toma de un duplicado si él no los tiene. El
+# recibo (attachment) no: es de la compra de otra empresa, no de la persona.
+FILL_FIELDS = ('phone_number', 'address', 'date_of_birth')
+BLOCKING_KEYS = (('document_type', 'document_key'), ('email_key', 'document_key'))
+
+DedupResult = namedtuple('DedupResult', 'groups merged tickets normalized')
+
+
+def document_key():
+    """normalize_document_number(document_number) en SQL."""
+    expression = F('document_number')
+    for char in DOCUMENT_SEPARATORS:
+        expression = Replace(expression, Value(char), Value(''))
+    return Upper(expression)
+
+
+def email_key():
+    """normalize_email(email) en SQL."""
+    return Lower(Trim('email'))
+
+
+def find_attendee(document_type, document_number, email='', queryset=None):
+    """El asistente más antiguo con esa identidad, o None.
+
+    queryset limita la búsqueda (en el admin, a los asistentes que ve el
+    usuario: nunca se devuelve el de otra empresa); por defecto busca en
+    todos. Usa los índices de búsqueda (attendee_document_idx y
+    attendee_email_lower_idx) sobre los valores normalizados, así que los
+    registros guardados antes de la normalización se encuentran después de
+    correr dedup_attendees.
+    """
+    queryset = Attendee.objects.all() if queryset is None else queryset
+    number = normalize_document_number(document_number)
+    if not number:
+        return None
+    attendee = queryset.filter(document_type=document_type, document_number=number).order_by('pk').first()
+    email = normalize_email(email)
+    if attendee is None and email:
+        attendee = (
+            queryset.alias(email_lower=Lower('email'))
+            .filter(email_lower=email, document_number=number).order_by('pk').first()
+        )
+    return attendee
+
+
+def get_or_create_attendee(document_type, document_number, email, queryset=None, **fields):
+    """(asistente, creado): el que ya existe con esa identidad o uno nuevo.
+
+    queryset limita la búsqueda como en find_attendee (las compras pasan los
+    asistentes de su empresa). Un asistente existente no se modifica. No hay
+    restricción única en la tabla: dos compras simultáneas de la misma
+    persona nueva pueden crear dos registros, que dedup_attendees junta
+    después.
+    """
+    attendee = find_attendee(document_type, document_number, email, queryset=queryset)
+    if attendee is not None:
+        return attendee, False
+    return Attendee.objects.create(
+        document_type=document_type, document_number=document_number, email=email, **fields,
+    ), True
+
+
+def company_attendees(company_id):
+    """Asistentes con boletos de la empresa, el alcance de identidad de sus compras."""
+    return Attendee.objects.filter(purchase__company_id=company_id)
+
+
+def find_duplicates(queryset=None):
+    """Grupos de ids de asistentes duplicados, cada uno ordenado (el primero es el más antiguo)."""
+    queryset = Attendee.objects.all() if queryset is None else queryset
+    keyed = queryset.annotate(document_key=document_key(), email_key=email_key()).exclude(document_key='')
+    parent = {}
+
+    def root(pk):
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    for fields in BLOCKING_KEYS:
+        # sin correo no hay bloque por correo: dos registros sin correo no son por eso la misma persona
+        blocked = keyed.exclude(email_key='') if 'email_key' in fields else keyed
+        repeated = blocked.values(*fields).annotate(rows=Count('pk')).filter(rows__gt=1).values('document_key')
+        blocks = defaultdict(list)
+        for pk, *key in blocked.filter(document_key__in=repeated).values_list('pk', *fields).iterator():
+            blocks[tuple(key)].append(pk)
+        for pks in blocks.values():
+            if len(pks) < 2:
+                continue
+            for pk in pks:
+                parent.setdefault(pk, pk)
+            for pk in pks[1:]:
+                first, other = root(pks[0]), root(pk)
+                if first != other:
+                    # la raíz es siempre el id menor
+                    parent[max(first, other)] = min(first, other)
+
+    groups = defaultdict(list)
+    for pk in parent:
+        groups[root(pk)].append(pk)
+    return sorted(_split_by_company(sorted(group) for group in groups.values()))
+
+
+def _split_by_company(groups):
+    """Parte cada grupo según las empresas de los boletos de cada registro.
+
+    Solo quedan juntos los registros con boletos de las mismas empresas (o
+    sin boletos): nunca se fusionan asistentes de empresas distintas.
+    """
+    groups = list(groups)
+    pks = [pk for group in groups for pk in group]
+    companies = defaultdict(set)
+    for offset in range(0, len(pks), MERGE_CHUNK_SIZE):
+        rows = (
+            Ticket.objects.filter(attendee_id__in=pks[offset:offset + MERGE_CHUNK_SIZE])
+            .values_list('attendee_id', 'purchase__company_id').distinct()
+        )
+        for attendee_id, company_id in rows:
+            companies[attendee_id].add(company_id)
+    for group in groups:
+        parts = defaultdict(list)
+        for pk in group:
+            parts[frozenset(companies[pk])].append(pk)
+        yield from (part for part in parts.values() if len(part) > 1)
+
+
+def merge_duplicates(groups, chunk_size=MERGE_CHUNK_SIZE):
+    """Fusiona cada grupo en su primer id. Devuelve (asistentes eliminados, boletos movidos)."""
+    merged = moved = 0
+    for offset in range(0, len(groups), chunk_size):
+        chunk_merged, chunk_moved = _merge_chunk(groups[offset:offset + chunk_size])
+        merged += chunk_merged
+        moved += chunk_moved
+    return merged, moved
+
+
+def _merge_chunk(groups):
+    attendees = Attendee.objects.in_bulk([pk for group in groups for pk in group])
+    now = timezone.now()
+    survivor_of, filled = {}, []
+    for group in groups:
+        survivor = attendees.get(group[0])
+        duplicates = [attendees[pk] for pk in group[1:] if pk in attendees]
+        if survivor is None or not duplicates:
+            continue
+        changed = False
+        for field in FILL_FIELDS:
+            if getattr(survivor, field) in (None, ''):
+                value = next((getattr(duplicate, field) for duplicate in duplicates if getattr(duplicate, field) not in (None, '')), None)
+                if value is not None:
+                    setattr(survivor, field, value)
+                    changed = True
+        if changed:
+            survivor.updated_at = now
+            filled.append(survivor)
+        survivor_of.update((duplicate.pk, survivor.pk) for duplicate in duplicates)
+    if not survivor_of:
+        return 0, 0
+
+    with transaction.atomic():
+        moved = Ticket.objects.filter(attendee_id__in=list(survivor_of)).update(
+            attendee_id=Case(*(When(attendee_id=duplicate, then=Value(survivor)) for duplicate, survivor in survivor_of.items())),
+            updated_at=now,
+        )
+        if filled:
+            Attendee.objects.bulk_update(filled, FILL_FIELDS + ('updated_at',))
+        Attendee.objects.filter(pk__in=list(survivor_of)).delete()
+    return len(survivor_of), moved
+
+
+def unnormalized(queryset=None):
+    """Asistentes cuyo documento o correo guardado no está normalizado (anteriores a Attendee.save)."""
+    queryset = Attendee.objects.all() if queryset is None else queryset
+    return queryset.alias(document_key=document_key(), email_key=email_key()).exclude(
+        document_number=F('document_key'), email=F('email_key'),
+    )
+
+
+def deduplicate(queryset=None, dry_run=False, chunk_size=MERGE_CHUNK_SIZE):
+    """Fusiona los duplicados y normaliza documento y correo de los registros restantes."""
+    groups = find_duplicates(queryset)
+    duplicate_ids = [pk for group in groups for pk in group[1:]]
+    if dry_run:
+        tickets = sum(
+            Ticket.objects.filter(attendee_id__in=duplicate_ids[offset:offset + chunk_size]).count()
+            for offset in range(0, len(duplicate_ids), chunk_size)
+        )
+        return DedupResult(len(groups), len(duplicate_ids), tickets, unnormalized(queryset).count())
+
+    merged, tickets = merge_duplicates(groups, chunk_size)
+    normalized = unnormalized(queryset).update(document_number=document_key(), email=email_key())
+    return DedupResult(len(groups), merged, tickets, normalized)
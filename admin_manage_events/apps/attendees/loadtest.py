@@ -0,0 +1,147 @@
+# apps/attendees/loadtest.py
+"""Generador de carga de compras concurrentes y verificación de invariantes.
+
+Reproduce la contención de una apertura de ventas: varios hilos o procesos
+compran boletos de la misma categoría de evento por el camino real
+(Purchase.save con su validación de cupo, get_or_create_attendee,
+Ticket.objects.create y los signals que recalculan tickets_sold), cada
+compra en su propia transacción como en el admin. Al final se revisa que los contadores cuadren con los
+boletos realmente guardados.
+"""
+import time
+import uuid
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.core.exceptions import ValidationError
+from django.db import connection, connections, transaction
+from django.db.models import Count, Q
+
+from apps.events.models import EventTicketCategory
+from apps.inventory.models import InventoryItem
+from .identity import company_attendees, get_or_create_attendee
+from .models import Purchase, Ticket
+
+OUTCOME_OK = 'ok'
+OUTCOME_SOLD_OUT = 'agotado'
+
+LoadResult = namedtuple('LoadResult', 'attempts outcomes latencies elapsed')
+
+BUYER_PREFIX = 'Prueba de carga'
+
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, round(fraction * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def buy(link, run, number, tickets_per_purchase):
+    """Una compra de `tickets_per_purchase` boletos, igual que desde el admin."""
+    with transaction.atomic():
+        purchase = Purchase(
+            buyer=f'{BUYER_PREFIX} {run} #{number}', event_id=link.event_id,
+            ticket_category_id=link.ticket_category_id, company_id=link.event.company_id,
+        )
+        purchase.save()
+        attendees = company_attendees(purchase.company_id)
+        for position in range(tickets_per_purchase):
+            attendee, _ = get_or_create_attendee(
+                'DNI', f'{run}-{number:07d}-{position:03d}', f'carga{number}.{position}@example.com', queryset=attendees,
+                name=f'Carga {number}-{position}', phone_number='+573001234567', gender='O',
+            )
+            Ticket.objects.create(purchase=purchase, attendee=attendee, ticket_owner=position == 0)
+
+
+def _worker_init():
+    # En procesos hijos (spawn) Django no está configurado; con fork ya lo está
+    # y setup() no hace nada. Ninguna conexión se hereda del padre.
+    django.setup()
+    connections.close_all()
+
+
+def _run_worker(link_id, run, numbers, tickets_per_purchase, start_at):
+    """Compras de un hilo o proceso. Devuelve [(resultado, latencia)]."""
+    link = EventTicketCategory.objects.select_related('event').get(pk=link_id)
+    samples = []
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+    try:
+        for number in numbers:
+            started = time.perf_counter()
+            try:
+                buy(link, run, number, tickets_per_purchase)
+                outcome = OUTCOME_OK
+            except ValidationError:
+                outcome = OUTCOME_SOLD_OUT
+            except Exception as error:  # se reportan todos los fallos, p. ej. "database is locked"
+                outcome = f'{type(error).__name__}: {error}'
+            samples.append((outcome, time.perf_counter() - started))
+    finally:
+        connection.close()
+    return samples
+
+
+def run_load(link, purchases, workers=4, processes=False, tickets_per_purchase=1, run=None):
+    """Lanza `purchases` compras repartidas entre `workers` hilos (o procesos).
+
+    Todos los trabajadores esperan hasta el mismo instante para empezar, de
+    modo que las primeras compras compitan de verdad por el cupo.
+    """
+    run = run or uuid.uuid4().hex[:8]
+    workers = max(1, min(workers, purchases))
+    slices = [range(index, purchases, workers) for index in range(workers)]
+    if processes:
+        # las conexiones abiertas no deben cruzar un fork
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_worker_init)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    start_at = time.time() + (1.0 if processes else 0.2)
+    with executor:
+        futures = [
+            executor.submit(_run_worker, link.pk, run, numbers, tickets_per_purchase, start_at)
+            for numbers in slices
+        ]
+        samples = [sample for future in futures for sample in future.result()]
+    elapsed = time.time() - start_at
+
+    outcomes = Counter(outcome for outcome, _ in samples)
+    latencies = sorted(latency for outcome, latency in samples if outcome == OUTCOME_OK)
+    return LoadResult(purchases, outcomes, latencies, elapsed)
+
+
+def check_invariants(event_id):
+    """Lista de violaciones de invariantes del evento; vacía si todo cuadra.
+
+    - tickets_sold de cada categoría es igual al número de boletos guardados.
+    - ninguna categoría tiene más boletos que tickets_available.
+    - ningún item de inventario del evento queda con cantidades negativas.
+    """
+    violations = []
+    links = EventTicketCategory.objects.filter(event_id=event_id).select_related('ticket_category')
+    sold = dict(
+        Ticket.objects.filter(purchase__event_id=event_id)
+        .values_list('purchase__ticket_category').annotate(total=Count('pk')).order_by()
+    )
+    for link in links:
+        counted = sold.get(link.ticket_category_id, 0)
+        name = link.ticket_category.name
+        if link.tickets_sold != counted:
+            violations.append(f'{name}: tickets_sold={link.tickets_sold} pero hay {counted} boletos guardados.')
+        if counted > link.tickets_available:
+            violations.append(f'{name}: sobreventa, {counted} boletos para {link.tickets_available} asignados.')
+
+    negative = InventoryItem.objects.filter(event_id=event_id).filter(
+        Q(quantity_available__lt=0) | Q(quantity_sold__lt=0)
+    )
+    for item in negative:
+        violations.append(
+            f'Inventario {item.name}: disponible={item.quantity_available}, vendido={item.quantity_sold}.'
+        )
+    return violations
@@ -0,0 +1,31 @@
+# apps/attendees/management/commands/dedup_attendees.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.attendees.identity import MERGE_CHUNK_SIZE, deduplicate
+
+
+class Command(BaseCommand):
+    help = (
+        'Fusiona los asistentes duplicados de cada empresa (mismo documento normalizado y mismo tipo o correo), '
+        'mueve sus boletos al registro más antiguo y normaliza documento y correo del resto.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar lo que se fusionaría, sin modificar nada.')
+        parser.add_argument('--chunk-size', type=int, default=MERGE_CHUNK_SIZE, help='Grupos de duplicados por transacción.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size debe ser mayor que cero.')
+
+        result = deduplicate(dry_run=options['dry_run'], chunk_size=options['chunk_size'])
+        if options['dry_run']:
+            self.stdout.write(
+                f'{result.groups} personas con duplicados: se eliminarían {result.merged} asistentes, '
+                f'se moverían {result.tickets} boletos y se normalizarían {result.normalized} registros.'
+            )
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.groups} personas con duplicados: {result.merged} asistentes fusionados, '
+            f'{result.tickets} boletos movidos y {result.normalized} registros normalizados.'
+        ))
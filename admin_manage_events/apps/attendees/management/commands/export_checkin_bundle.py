@@ -0,0 +1,23 @@
+# apps/attendees/management/commands/export_checkin_bundle.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.attendees.bundles import write_checkin_bundle
+from apps.events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Exporta el paquete SQLite de ingreso de un evento para escáneres sin conexión.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_id', type=int, help='ID del evento.')
+        parser.add_argument('--output', help='Archivo de salida (por defecto checkin-<evento>.sqlite3).')
+
+    def handle(self, *args, **options):
+        try:
+            event = Event.objects.get(pk=options['event_id'])
+        except Event.DoesNotExist:
+            raise CommandError(f'No existe el evento {options["event_id"]}.')
+
+        path = options['output'] or f'checkin-{event.pk}.sqlite3'
+        count = write_checkin_bundle(event, path)
+        self.stdout.write(self.style.SUCCESS(f'{count} boletos exportados a {path}.'))
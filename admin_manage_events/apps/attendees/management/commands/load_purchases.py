@@ -0,0 +1,72 @@
+# apps/attendees/management/commands/load_purchases.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.attendees.loadtest import BUYER_PREFIX, OUTCOME_OK, check_invariants, percentile, run_load
+from apps.attendees.models import Attendee, Purchase, Ticket
+from apps.events.models import EventTicketCategory
+from utils.signals import muted_receivers
+
+
+class Command(BaseCommand):
+    help = (
+        'Compra boletos de una misma categoría desde varios hilos o procesos para reproducir la '
+        'contención de una apertura de ventas, mide rendimiento y latencias y verifica que no haya sobreventa.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ticket_category', type=int, help='ID de la categoría del evento (EventTicketCategory).')
+        parser.add_argument('--purchases', type=int, default=200, help='Compras a intentar en total.')
+        parser.add_argument('--workers', type=int, default=8, help='Hilos o procesos concurrentes.')
+        parser.add_argument('--processes', action='store_true', help='Usar procesos en lugar de hilos.')
+        parser.add_argument('--tickets-per-purchase', type=int, default=1, help='Boletos por compra.')
+        parser.add_argument('--cleanup', action='store_true', help='Borrar al terminar las compras de prueba de carga del evento.')
+
+    def handle(self, *args, **options):
+        try:
+            link = EventTicketCategory.objects.select_related('event', 'ticket_category').get(pk=options['event_ticket_category'])
+        except EventTicketCategory.DoesNotExist:
+            raise CommandError('La categoría de evento no existe.')
+        if options['purchases'] < 1 or options['workers'] < 1 or options['tickets_per_purchase'] < 1:
+            raise CommandError('--purchases, --workers y --tickets-per-purchase deben ser mayores que cero.')
+
+        mode = 'procesos' if options['processes'] else 'hilos'
+        self.stdout.write(
+            f'{link} | base de datos: {connection.vendor} | {options["purchases"]} compras en {options["workers"]} {mode}'
+        )
+        result = run_load(
+            link, options['purchases'], workers=options['workers'], processes=options['processes'],
+            tickets_per_purchase=options['tickets_per_purchase'],
+        )
+
+        for outcome, count in result.outcomes.most_common():
+            self.stdout.write(f'  {outcome}: {count}')
+        successful = result.outcomes[OUTCOME_OK]
+        self.stdout.write(f'Rendimiento: {successful / result.elapsed:.1f} compras/s en {result.elapsed:.2f} s')
+        if result.latencies:
+            latencies = result.latencies
+            self.stdout.write('Latencia (ms): ' + ' '.join(
+                f'{label}={percentile(latencies, fraction) * 1000:.1f}'
+                for label, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))
+            ))
+
+        violations = check_invariants(link.event_id)
+        if options['cleanup']:
+            self._cleanup(link)
+        if violations:
+            for violation in violations:
+                self.stderr.write(f'  {violation}')
+            raise CommandError(f'{len(violations)} invariantes violadas.')
+        self.stdout.write(self.style.SUCCESS('Invariantes correctas: sin sobreventa y contadores consistentes.'))
+
+    def _cleanup(self, link):
+        purchases = Purchase.objects.filter(event_id=link.event_id, buyer__startswith=BUYER_PREFIX)
+        attendee_ids = list(purchases.values_list('ticket__attendee_id', flat=True))
+        # los signals recalcularían tickets_sold boleto por boleto; se recalcula una sola vez al final
+        with muted_receivers():
+            purchases.delete()
+            Attendee.objects.filter(pk__in=attendee_ids).delete()
+        link.tickets_sold = Ticket.objects.filter(
+            purchase__event_id=link.event_id, purchase__ticket_category_id=link.ticket_category_id,
+        ).count()
+        link.save(update_fields=['tickets_sold'])
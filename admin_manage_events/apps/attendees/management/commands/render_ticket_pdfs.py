@@ -0,0 +1,30 @@
+# apps/attendees/management/commands/render_ticket_pdfs.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.attendees.models import Ticket
+from apps.attendees.ticket_pdfs import CHUNK_SIZE, render_ticket_pdfs
+
+
+class Command(BaseCommand):
+    help = 'Genera los PDF imprimibles de los boletos de un evento o una compra en un pool de procesos.'
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--event', type=int, help='ID del evento.')
+        target.add_argument('--purchase', type=int, help='ID de la compra.')
+        parser.add_argument('--workers', type=int, help='Procesos de render (por defecto uno por núcleo, 0 = sin pool).')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Boletos por bloque.')
+        parser.add_argument('--force', action='store_true', help='Regenerar aunque los datos no hayan cambiado.')
+
+    def handle(self, *args, **options):
+        if options['event']:
+            tickets = Ticket.objects.filter(purchase__event_id=options['event'])
+        else:
+            tickets = Ticket.objects.filter(purchase_id=options['purchase'])
+        if not tickets.exists():
+            raise CommandError('No hay boletos para generar.')
+
+        generated, unchanged = render_ticket_pdfs(
+            tickets, workers=options['workers'], chunk_size=options['chunk_size'], force=options['force'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'{generated} PDF generados, {unchanged} sin cambios.'))
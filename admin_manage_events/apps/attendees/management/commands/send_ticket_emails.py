@@ -0,0 +1,30 @@
+# apps/attendees/management/commands/send_ticket_emails.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.attendees.emails import BATCH_SIZE, MAX_ATTEMPTS, send_ticket_emails
+
+
+class Command(BaseCommand):
+    help = 'Envía por correo los boletos encolados, por lotes y sobre una sola conexión SMTP.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Correos por lote.')
+        parser.add_argument('--rate', type=int, help='Máximo de correos por minuto (por defecto TICKET_EMAIL_RATE_PER_MINUTE).')
+        parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS, help='Intentos antes de marcar el correo como fallido.')
+        parser.add_argument('--loop', action='store_true', help='Seguir revisando la cola en lugar de terminar al vaciarla.')
+        parser.add_argument('--interval', type=float, default=10, help='Segundos entre revisiones con --loop.')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            sent, failed = send_ticket_emails(
+                batch_size=options['batch_size'], max_attempts=options['max_attempts'], rate=options['rate'],
+            )
+            if sent or failed or not options['loop']:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'{sent} enviados, {failed} fallidos en {elapsed:.1f} s.')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
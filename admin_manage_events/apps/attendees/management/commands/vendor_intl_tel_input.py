@@ -0,0 +1,43 @@
+# apps/attendees/management/commands/vendor_intl_tel_input.py
+import os
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.attendees.forms import INTL_TEL_INPUT_CDN, INTL_TEL_INPUT_FILES, INTL_TEL_INPUT_VERSION
+
+
+class Command(BaseCommand):
+    help = (
+        'Descarga la versión fijada de intl-tel-input a static/vendor/ para servirla junto con los '
+        'demás estáticos (con hash y comprimida) en lugar de desde el CDN.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            help='Copiar desde un directorio build/ local (p. ej. node_modules/intl-tel-input/build) en lugar de descargar.',
+        )
+
+    def handle(self, *args, **options):
+        target = os.path.join(settings.BASE_DIR, 'static', 'vendor', 'intl-tel-input', INTL_TEL_INPUT_VERSION)
+        # primero se obtienen todos los archivos: si uno falla no queda una copia a medias
+        contents = {path: self.fetch(path, options['source']) for path in INTL_TEL_INPUT_FILES}
+        for path, content in contents.items():
+            destination = os.path.join(target, path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            with open(destination, 'wb') as output:
+                output.write(content)
+            self.stdout.write(f'{path}: {len(content)} bytes')
+        self.stdout.write(self.style.SUCCESS(f'intl-tel-input {INTL_TEL_INPUT_VERSION} copiado en {target}. Agregue los archivos al repositorio.'))
+
+    def fetch(self, path, source):
+        try:
+            if source:
+                with open(os.path.join(source, path), 'rb') as local:
+                    return local.read()
+            with urlopen(INTL_TEL_INPUT_CDN + path, timeout=30) as response:
+                return response.read()
+        except OSError as error:
+            raise CommandError(f'No se pudo obtener {path}: {error}')
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendees', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Ingreso'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='checkin_gate',
+            field=models.CharField(blank=True, default='', max_length=50, verbose_name='Puerta de ingreso'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-19 14:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendees', '0002_ticket_checked_in_at_ticket_checkin_gate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creado el')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Actualizado el')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('sent', 'Enviado'), ('failed', 'Fallido')], default='pending', max_length=10, verbose_name='Estado')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próximo intento')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Enviado el')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Último error')),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emails', to='attendees.ticket', verbose_name='Boleto')),
+            ],
+            options={
+                'verbose_name': 'Correo de boleto',
+                'verbose_name_plural': 'Correos de boletos',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ticketemail',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='ticketemail_due_idx'),
+        ),
+    ]
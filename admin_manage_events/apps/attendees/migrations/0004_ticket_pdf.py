@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-19 14:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0004_attachment_thumbnail'),
+        ('attendees', '0003_ticketemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='ticket_pdf',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='attachments.attachment', verbose_name='PDF del boleto'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='ticket_pdf_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='Hash del PDF'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-19 15:00
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendees', '0004_ticket_pdf'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendee',
+            index=models.Index(fields=['document_type', 'document_number'], name='attendee_document_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendee',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='attendee_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2 on 2026-10-19 15:00
+
+from django.db import migrations
+
+# Índice de nombres de asistentes según la base de datos (ver apps/attendees/search.py).
+# SQLite: tabla FTS5 con el nombre sin tildes, sincronizada por triggers.
+# PostgreSQL: índice GIN de trigramas sobre UPPER(name), el que usa name__icontains.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE attendees_attendee_fts USING fts5(
+        name, content='attendees_attendee', content_rowid='attendee_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER attendees_attendee_fts_insert AFTER INSERT ON attendees_attendee BEGIN
+        INSERT INTO attendees_attendee_fts(rowid, name) VALUES (new.attendee_id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER attendees_attendee_fts_delete AFTER DELETE ON attendees_attendee BEGIN
+        INSERT INTO attendees_attendee_fts(attendees_attendee_fts, rowid, name) VALUES ('delete', old.attendee_id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER attendees_attendee_fts_update AFTER UPDATE OF name ON attendees_attendee BEGIN
+        INSERT INTO attendees_attendee_fts(attendees_attendee_fts, rowid, name) VALUES ('delete', old.attendee_id, old.name);
+        INSERT INTO attendees_attendee_fts(rowid, name) VALUES (new.attendee_id, new.name);
+    END
+    """,
+    "INSERT INTO attendees_attendee_fts(attendees_attendee_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS attendees_attendee_fts_update',
+    'DROP TRIGGER IF EXISTS attendees_attendee_fts_delete',
+    'DROP TRIGGER IF EXISTS attendees_attendee_fts_insert',
+    'DROP TABLE IF EXISTS attendees_attendee_fts',
+]
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS attendee_name_trgm_idx ON attendees_attendee USING gin (UPPER(name::text) gin_trgm_ops)',
+]
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS attendee_name_trgm_idx',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendees', '0005_attendee_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
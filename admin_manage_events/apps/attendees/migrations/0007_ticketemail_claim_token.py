@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 15:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendees', '0006_attendee_name_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticketemail',
+            name='claim_token',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32, verbose_name='Reserva'),
+        ),
+    ]
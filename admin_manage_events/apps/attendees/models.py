@@ -1,12 +1,13 @@
 # apps/attendees/models.py
 from django.db import models
+from django.db.models.functions import Lower
 from apps.ticket_categories.models import TicketCategory,Company
 from apps.events.models import Event, EventTicketCategory
 from apps.attachments.models import Attachment
 from utils.models import TimeStampedModel
 from django.utils.translation import gettext_lazy as _
-from phonenumber_field.modelfields import PhoneNumberField
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 #name 'ValidationError' is not defined
 
@@ -39,6 +40,21 @@ class Purchase(TimeStampedModel):
         self.clean()
         super().save(*args, **kwargs)
 
+# Documento y correo se guardan normalizados para que la misma persona se
+# encuentre con una búsqueda exacta (ver apps/attendees/identity.py).
+DOCUMENT_SEPARATORS = ' .-'
+_WITHOUT_SEPARATORS = str.maketrans('', '', DOCUMENT_SEPARATORS)
+
+
+def normalize_document_number(value):
+    """'12.345.678-k ' -> '12345678K'."""
+    return (value or '').translate(_WITHOUT_SEPARATORS).upper()
+
+
+def normalize_email(value):
+    return (value or '').strip().lower()
+
+
 # Esta tabla manejará la información de los asistentes a los eventos, 
 # la cual es ingresada por el creador del evento.
 class Attendee(TimeStampedModel):
@@ -67,10 +83,20 @@ class Attendee(TimeStampedModel):
     class Meta:
         verbose_name = 'Asistente'  # Nombre singular para el modelo en la interfaz de administración
         verbose_name_plural = 'Asistentes'  # Nombre plural para el modelo en la interfaz de administración
+        # Búsquedas exactas de search.py; el índice de nombres (FTS5 / pg_trgm) se crea en la migración 0006
+        indexes = [
+            models.Index(fields=['document_type', 'document_number'], name='attendee_document_idx'),
+            models.Index(Lower('email'), name='attendee_email_lower_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.document_type}: {self.document_number})"  # Representación en cadena del modelo
 
+    def save(self, *args, **kwargs):
+        self.document_number = normalize_document_number(self.document_number)
+        self.email = normalize_email(self.email)
+        super().save(*args, **kwargs)
+
 
 class Ticket(TimeStampedModel):
     ticket_id = models.AutoField(primary_key=True)  # Identificador único para cada boleto
@@ -79,6 +105,10 @@ class Ticket(TimeStampedModel):
     ticket_confirmed = models.BooleanField(default=False, verbose_name='Ticket Confirmado')  # Indica si el boleto está confirmado
     ticket_owner = models.BooleanField(default=False, verbose_name='Titular Ticket')  # Indica quien el comprador del boleto
     ticket_send_by_email = models.BooleanField(default=False, verbose_name='Ticket por correo')  # Indica si el boleto fue enviado por correo electrónico
+    checked_in_at = models.DateTimeField(blank=True, null=True, verbose_name='Ingreso')  # Fecha y hora del ingreso al evento
+    checkin_gate = models.CharField(max_length=50, blank=True, default='', verbose_name='Puerta de ingreso')  # Puerta donde se escaneó el boleto
+    ticket_pdf = models.ForeignKey(Attachment, on_delete=models.SET_NULL, blank=True, null=True, editable=False, related_name='+', verbose_name='PDF del boleto')  # Boleto imprimible generado
+    ticket_pdf_hash = models.CharField(max_length=64, blank=True, default='', editable=False, verbose_name='Hash del PDF')  # Hash de los datos con que se generó el PDF
     
 
     class Meta:
@@ -87,3 +117,32 @@ class Ticket(TimeStampedModel):
 
     def __str__(self):
         return f"Boleto para {self.attendee.name} (Compra: {self.purchase.buyer})"  # Representación en cadena del modelo
+
+
+# Cola de envío de boletos por correo. Cada fila es un envío pendiente o
+# realizado; el comando send_ticket_emails la procesa por lotes.
+class TicketEmail(TimeStampedModel):
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_SENT, 'Enviado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='emails', verbose_name='Boleto')  # Boleto a enviar
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='Estado')  # Estado del envío
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')  # Intentos de envío realizados
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name='Próximo intento')  # Cuándo se puede volver a intentar
+    sent_at = models.DateTimeField(blank=True, null=True, verbose_name='Enviado el')  # Fecha y hora del envío
+    last_error = models.TextField(blank=True, default='', verbose_name='Último error')  # Error del último intento fallido
+    claim_token = models.CharField(max_length=32, blank=True, default='', editable=False, verbose_name='Reserva')  # Proceso que reservó el envío (send_ticket_emails)
+
+    class Meta:
+        verbose_name = 'Correo de boleto'  # Nombre singular para el modelo en la interfaz de administración
+        verbose_name_plural = 'Correos de boletos'  # Nombre plural para el modelo en la interfaz de administración
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='ticketemail_due_idx')]
+
+    def __str__(self):
+        return f"Correo del boleto {self.ticket_id} ({self.get_status_display()})"  # Representación en cadena del modelo
@@ -0,0 +1,113 @@
+# apps/attendees/pdf.py
+"""PDF imprimible de un boleto, escrito a mano sin dependencias.
+
+El módulo no importa Django para que los procesos del pool de render solo
+reciban diccionarios con los datos del boleto y devuelvan bytes. El PDF no
+incluye fechas de creación, así que los mismos datos producen exactamente
+los mismos bytes.
+"""
+import hashlib
+import json
+import zlib
+
+# Cambiar al modificar el diseño para invalidar los PDF ya generados
+LAYOUT_VERSION = 1
+
+PAGE_WIDTH = 298  # A6 en puntos
+PAGE_HEIGHT = 420
+MARGIN = 24
+QR_SIZE = 170
+
+
+def content_hash(data):
+    """Hash de los datos del boleto y la versión del diseño; identifica el PDF resultante."""
+    payload = json.dumps({'layout': LAYOUT_VERSION, **data}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _text(value):
+    # Las fuentes estándar usan WinAnsiEncoding (cp1252); se escapan los delimitadores
+    raw = str(value).encode('cp1252', errors='replace')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _qr_matrix(token):
+    try:
+        import qrcode
+    except ImportError:
+        return None
+    code = qrcode.QRCode(border=0, error_correction=qrcode.constants.ERROR_CORRECT_M)
+    code.add_data(token)
+    return code.get_matrix()
+
+
+def _qr_commands(matrix, left, top, size):
+    """Módulos oscuros del QR como rectángulos, uniendo los contiguos de cada fila."""
+    module = size / len(matrix)
+    commands = []
+    for row_index, row in enumerate(matrix):
+        y = top - (row_index + 1) * module
+        column = 0
+        while column < len(row):
+            if not row[column]:
+                column += 1
+                continue
+            start = column
+            while column < len(row) and row[column]:
+                column += 1
+            commands.append(b'%.2f %.2f %.2f %.2f re' % (left + start * module, y, (column - start) * module, module))
+    commands.append(b'f')
+    return commands
+
+
+def _content_stream(data):
+    lines = [b'BT', b'/F2 14 Tf', b'%d %d Td' % (MARGIN, PAGE_HEIGHT - MARGIN - 14), _text(data['event'][:34]) + b' Tj', b'/F1 9 Tf', b'0 -14 Td']
+    for label, key in (('Lugar', 'location'), ('Fecha', 'date')):
+        lines += [_text(f'{label}: {data[key]}'[:52]) + b' Tj', b'0 -12 Td']
+    lines += [b'0 -6 Td', b'/F2 11 Tf', _text(data['attendee'][:40]) + b' Tj', b'/F1 9 Tf', b'0 -13 Td']
+    for label, key in (('Documento', 'document'), ('Categoría', 'category'), ('Boleto N.°', 'ticket')):
+        lines += [_text(f'{label}: {data[key]}'[:52]) + b' Tj', b'0 -12 Td']
+    lines.append(b'ET')
+
+    qr_top = PAGE_HEIGHT - 170
+    matrix = _qr_matrix(data['token'])
+    if matrix:
+        lines += _qr_commands(matrix, (PAGE_WIDTH - QR_SIZE) / 2, qr_top, QR_SIZE)
+    lines += [
+        b'BT', b'/F3 7 Tf',
+        b'%d %d Td' % (MARGIN, qr_top - QR_SIZE - 16),
+        _text(data['token']) + b' Tj',
+        b'ET',
+    ]
+    return b'\n'.join(lines)
+
+
+def render_ticket_pdf(data):
+    """Devuelve los bytes del PDF de un boleto.
+
+    `data` trae event, location, date, attendee, document, category, ticket
+    y token como texto.
+    """
+    stream = zlib.compress(_content_stream(data), 6)
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R /F2 6 0 R /F3 7 0 R >> >> >>' % (PAGE_WIDTH, PAGE_HEIGHT),
+        b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>',
+    ]
+
+    output = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(output)
@@ -3,6 +3,7 @@ from .models import Purchase, Attendee
 from import_export import resources, fields
 from .models import Ticket
 from import_export.widgets import ManyToManyWidget
+from .identity import find_attendee
 
 
 class PurchaseResource(resources.ModelResource):
@@ -63,4 +64,36 @@ class PurchaseResource(resources.ModelResource):
             pass
         except Exception as e:
             raise e
-        
+
+
+class AttendeeResource(resources.ModelResource):
+    # Solo se exporta: un id del archivo no debe apuntar la fila a otro registro
+    attendee_id = fields.Field(attribute='attendee_id', column_name='attendee_id', readonly=True)
+
+    class Meta:
+        model = Attendee
+        fields = ('attendee_id', 'name', 'email', 'document_type', 'document_number', 'phone_number', 'address', 'date_of_birth', 'gender')
+        export_order = fields
+        import_id_fields = ('document_type', 'document_number')
+        skip_unchanged = True
+        report_skipped = True
+
+    def __init__(self, attendees=None, **kwargs):
+        super().__init__(**kwargs)
+        # Asistentes entre los que se buscan las filas que ya existen: en el admin, los que ve
+        # quien importa (AttendeeAdmin.get_import_resource_kwargs); None busca en todos
+        self.attendees = attendees
+
+    def get_instance(self, instance_loader, row):
+        # Una fila de una persona que ya existe se asocia a ese registro aunque el archivo
+        # traiga el documento con puntos o guiones, otro tipo de documento con el mismo correo,
+        # o no traiga el tipo (se asume el valor por defecto, DNI)
+        document_type = row.get('document_type') or Attendee._meta.get_field('document_type').default
+        return find_attendee(document_type, row.get('document_number'), row.get('email'), queryset=self.attendees)
+
+    def import_field(self, field, instance, row, is_m2m=False, **kwargs):
+        # Un registro que ya existía solo toma los datos que le faltan: la fila no
+        # reemplaza lo guardado, y menos con valores vacíos
+        if not instance._state.adding and getattr(instance, field.attribute or '', None) not in (None, ''):
+            return
+        super().import_field(field, instance, row, is_m2m=is_m2m, **kwargs)
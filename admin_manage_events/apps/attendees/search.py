@@ -0,0 +1,73 @@
+# apps/attendees/search.py
+"""Búsqueda de asistentes en la puerta y en el admin.
+
+El texto buscado decide la consulta, y cada una usa un índice:
+
+- un correo (contiene "@"): LOWER(email) exacto, índice attendee_email_lower_idx;
+- un número de documento (contiene dígitos y no espacios): (document_type,
+  document_number) exacto y normalizado como se guarda ("12.345.678" busca
+  "12345678"), índice attendee_document_idx. Sin tipo de
+  documento se buscan todos los tipos con IN, que recorre el índice una vez
+  por tipo;
+- cualquier otra cosa: nombre. En SQLite con la tabla FTS5 de la migración
+  0006 cada palabra se busca como prefijo y sin tildes ("mar gonz" encuentra
+  a "María González"); en PostgreSQL cada palabra es un icontains, que usa
+  el índice de trigramas. Sin índice (otros motores, o los tests con
+  settings_test, que no ejecutan migraciones) se usa icontains sin índice.
+
+Si una migración futura reconstruye la tabla de asistentes en SQLite
+(ALTER de columnas), los triggers de la tabla FTS se pierden y hay que
+volver a crearlos.
+"""
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+
+from .models import Attendee, normalize_document_number
+
+FTS_TABLE = 'attendees_attendee_fts'
+DOCUMENT_TYPES = [value for value, label in Attendee.DOCUMENT_TYPE_CHOICES]
+
+_WORD = re.compile(r'\w+')
+
+
+def _has_fts(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    # se revisa una vez por conexión
+    if not hasattr(connection, '_attendee_fts'):
+        connection._attendee_fts = FTS_TABLE in connection.introspection.table_names()
+    return connection._attendee_fts
+
+
+def fts_query(text):
+    """Consulta FTS5 con cada palabra como prefijo: 'mar gonz' -> '"mar"* "gonz"*'."""
+    return ' '.join(f'"{word}"*' for word in _WORD.findall(text))
+
+
+def search_attendees(text, queryset=None, document_type=None):
+    """Asistentes de `queryset` (todos por defecto) que coinciden con `text`."""
+    queryset = Attendee.objects.all() if queryset is None else queryset
+    text = text.strip()
+    if not text:
+        return queryset.none()
+
+    if '@' in text:
+        return queryset.alias(email_lower=Lower('email')).filter(email_lower=text.lower())
+
+    if ' ' not in text and any(char.isdigit() for char in text):
+        types = [document_type] if document_type else DOCUMENT_TYPES
+        return queryset.filter(document_type__in=types, document_number=normalize_document_number(text))
+
+    words = _WORD.findall(text)
+    if not words:
+        return queryset.none()
+    if _has_fts(connections[queryset.db]):
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [fts_query(text)],
+        ))
+    for word in words:
+        queryset = queryset.filter(name__icontains=word)
+    return queryset
@@ -4,8 +4,10 @@ from django.dispatch import receiver
 from .models import Purchase
 from apps.events.models import EventTicketCategory
 from django.core.exceptions import ValidationError
+from utils.signals import skip_when_muted
 
 @receiver(pre_save, sender=Purchase)
+@skip_when_muted
 def validate_ticket_availability(sender, instance, **kwargs):
     event_ticket_category = EventTicketCategory.objects.get(event=instance.event, ticket_category=instance.ticket_category)
     if event_ticket_category.tickets_sold >= event_ticket_category.tickets_available:
@@ -14,6 +14,7 @@ from apps.attendees.models import Attendee, Purchase, Ticket
 from apps.events.models import Event, EventTicketCategory
 from apps.ticket_categories.models import TicketCategory, Company
 from apps.attachments.models import Attachment
+from utils.testing import QueryBudgetMixin
 
 User = get_user_model()
 
@@ -669,3 +670,1157 @@ class DataMigrationTests(TestCase):
         self.assertIsInstance(serialized_data['attendee_id'], int)
         self.assertIsInstance(serialized_data['name'], str)
         self.assertIsInstance(serialized_data['email'], str)
+
+
+class TicketCheckinTests(TestCase):
+    """Tests del registro de ingreso en la puerta"""
+
+    def setUp(self):
+        """Evento con un boleto vendido y usuario staff de la empresa"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Checkin Company")
+        self.user = User.objects.create_user(username="door", password="pass12345", company=self.company, is_staff=True)
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Concierto", description="Concierto", location="Estadio",
+            start_time=now, end_time=now + timedelta(hours=4),
+        )
+        category = TicketCategory.objects.create(name="General", price=10, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=category, tickets_available=10)
+        purchase = Purchase.objects.create(buyer="Comprador", event=self.event, ticket_category=category, company=self.company)
+        attendee = Attendee.objects.create(
+            name="Asistente", email="asistente@example.com", document_number="123",
+            phone_number="+573001234567", gender="M",
+        )
+        self.ticket = Ticket.objects.create(purchase=purchase, attendee=attendee)
+
+    def test_checkin_is_a_single_update(self):
+        """Test CHK-001: El ingreso válido se registra con una sola consulta"""
+        from apps.attendees.checkin import CHECKIN_OK, check_in_ticket
+
+        with self.assertNumQueries(1):
+            result = check_in_ticket(self.ticket.pk, self.event.pk, gate="A1")
+
+        self.assertEqual(result.status, CHECKIN_OK)
+        self.ticket.refresh_from_db()
+        self.assertTrue(self.ticket.ticket_confirmed)
+        self.assertEqual(self.ticket.checkin_gate, "A1")
+        self.assertIsNotNone(self.ticket.checked_in_at)
+
+    def test_double_entry_rejected(self):
+        """Test CHK-002: Un boleto no puede ingresar dos veces"""
+        from apps.attendees.checkin import CHECKIN_DUPLICATE, check_in_ticket
+
+        first = check_in_ticket(self.ticket.pk, self.event.pk, gate="A1")
+        second = check_in_ticket(self.ticket.pk, self.event.pk, gate="B2")
+
+        self.assertEqual(second.status, CHECKIN_DUPLICATE)
+        self.assertEqual(second.gate, "A1")
+        self.assertEqual(second.checked_in_at, first.checked_in_at)
+
+    def test_checkin_endpoint(self):
+        """Test CHK-003: Endpoint de ingreso con respuestas por estado"""
+        from django.urls import reverse
+
+        self.client.force_login(self.user)
+        url = reverse("attendees:checkin")
+        data = {"code": self.ticket.pk, "event": self.event.pk, "gate": "Norte"}
+
+        self.assertEqual(self.client.post(url, data).status_code, 200)
+        self.assertEqual(self.client.post(url, data).status_code, 409)
+        self.assertEqual(self.client.post(url, {**data, "code": 999999}).status_code, 404)
+        self.assertEqual(self.client.post(url, {**data, "code": "abc"}).status_code, 400)
+
+    def test_checkin_scoped_to_company(self):
+        """Test CHK-004: Un usuario de otra empresa no puede registrar el ingreso"""
+        from django.urls import reverse
+
+        other = User.objects.create_user(
+            username="other_door", password="pass12345",
+            company=Company.objects.create(name="Otra"), is_staff=True,
+        )
+        self.client.force_login(other)
+
+        response = self.client.post(reverse("attendees:checkin"), {"code": self.ticket.pk, "event": self.event.pk})
+
+        self.assertEqual(response.status_code, 404)
+        self.ticket.refresh_from_db()
+        self.assertFalse(self.ticket.ticket_confirmed)
+
+    def test_lookup_by_code_is_read_only(self):
+        """Test CHK-005: La consulta async de ingreso informa el estado sin registrarlo"""
+        from django.urls import reverse
+        from apps.attendees.checkin import check_in_ticket
+
+        url = reverse("attendees:checkin_lookup")
+        params = {"code": self.ticket.pk, "event": self.event.pk}
+        self.assertEqual(self.client.get(url, params).status_code, 403)
+
+        self.client.force_login(self.user)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["attendee"], "Asistente")
+        self.assertFalse(response.json()["checked_in"])
+        self.ticket.refresh_from_db()
+        self.assertFalse(self.ticket.ticket_confirmed)
+
+        check_in_ticket(self.ticket.pk, self.event.pk, gate="Sur")
+        self.assertEqual(self.client.get(url, params).json()["gate"], "Sur")
+        self.assertEqual(self.client.get(url, {**params, "code": 999999}).status_code, 404)
+        self.assertEqual(self.client.post(url, params).status_code, 405)
+
+    def test_lookup_by_token_sees_pending_scans(self):
+        """Test CHK-006: Por token se ve el ingreso aún en la cola de escaneos y se respeta la empresa"""
+        from django.urls import reverse
+        from apps.attendees.checkin import ScanBuffer, check_in_token
+        from apps.attendees.tokens import ticket_token
+
+        buffer = ScanBuffer(background=False)
+        token = ticket_token(Ticket.objects.select_related("purchase", "attendee").get(pk=self.ticket.pk))
+        check_in_token(token, self.event.pk, gate="Oriente", buffer=buffer)
+        url = reverse("attendees:checkin_lookup")
+
+        self.client.force_login(self.user)
+        with patch("apps.attendees.views.scan_buffer", buffer):
+            response = self.client.get(url, {"token": token})
+        self.assertTrue(response.json()["checked_in"])
+        self.assertEqual(response.json()["gate"], "Oriente")
+        self.assertEqual(self.client.get(url, {"token": "XXXX"}).status_code, 400)
+
+        other = User.objects.create_user(
+            username="lookup_other", password="pass12345",
+            company=Company.objects.create(name="Otra consulta"), is_staff=True,
+        )
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url, {"token": token}).status_code, 404)
+
+
+class TicketTokenTests(TestCase):
+    """Tests de los tokens firmados de boletos"""
+
+    def setUp(self):
+        """Evento con un boleto vendido"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Token Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Festival", description="Festival", location="Parque",
+            start_time=now, end_time=now + timedelta(hours=8),
+        )
+        category = TicketCategory.objects.create(name="General", price=10, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=category, tickets_available=10)
+        purchase = Purchase.objects.create(buyer="Comprador", event=self.event, ticket_category=category, company=self.company)
+        attendee = Attendee.objects.create(
+            name="Asistente", email="asistente@example.com", document_number="1020304050",
+            phone_number="+573001234567", gender="F",
+        )
+        self.ticket = Ticket.objects.create(purchase=purchase, attendee=attendee)
+
+    def test_token_roundtrip(self):
+        """Test TOK-001: El token se verifica con la clave del evento"""
+        from apps.attendees.tokens import document_hash, event_key, ticket_token, verify_ticket_token
+
+        token = ticket_token(self.ticket)
+        parsed = verify_ticket_token(token, key=event_key(self.event.pk))
+
+        self.assertRegex(token, r"^[A-Z2-7]+$")
+        self.assertEqual(parsed.ticket_id, self.ticket.pk)
+        self.assertEqual(parsed.event_id, self.event.pk)
+        self.assertEqual(parsed.document_hash, document_hash("DNI", "1020304050"))
+
+    def test_tampered_token_rejected(self):
+        """Test TOK-002: Un token alterado o de otro evento no es válido"""
+        from apps.attendees.tokens import event_key, make_ticket_token, ticket_token, verify_ticket_token
+
+        token = ticket_token(self.ticket)
+        tampered = ("A" if token[5] != "A" else "B").join([token[:5], token[6:]])
+
+        self.assertIsNone(verify_ticket_token(tampered))
+        self.assertIsNone(verify_ticket_token("no-es-un-token"))
+        self.assertIsNone(verify_ticket_token(token, key=event_key(self.event.pk + 1)))
+        forged = make_ticket_token(self.ticket.pk, self.event.pk, "DNI", "1", key=b"otra clave")
+        self.assertIsNone(verify_ticket_token(forged))
+
+    def test_token_checkin_without_database(self):
+        """Test TOK-003: Cada escaneo con token hace una sola lectura por clave y se escribe en bloque"""
+        from apps.attendees.checkin import CHECKIN_DUPLICATE, CHECKIN_OK, ScanBuffer, check_in_token
+        from apps.attendees.tokens import ticket_token
+
+        buffer = ScanBuffer(background=False)
+        token = ticket_token(self.ticket)
+
+        with self.assertNumQueries(2):
+            first = check_in_token(token, self.event.pk, gate="A", buffer=buffer)
+            second = check_in_token(token, self.event.pk, gate="B", buffer=buffer)
+        self.assertEqual(first.status, CHECKIN_OK)
+        self.assertEqual(second.status, CHECKIN_DUPLICATE)
+
+        self.assertEqual(buffer.flush(), 1)
+        self.ticket.refresh_from_db()
+        self.assertTrue(self.ticket.ticket_confirmed)
+        self.assertEqual(self.ticket.checkin_gate, "A")
+
+    def test_token_checkin_rejects_ticket_already_in_database(self):
+        """Test TOK-005: Un boleto que ya ingresó por otra vía o en otro proceso es duplicado"""
+        from apps.attendees.checkin import CHECKIN_DUPLICATE, ScanBuffer, check_in_ticket, check_in_token
+        from apps.attendees.tokens import ticket_token
+
+        check_in_ticket(self.ticket.pk, self.event.pk, gate="Norte")
+        buffer = ScanBuffer(background=False)
+        result = check_in_token(ticket_token(self.ticket), self.event.pk, gate="Sur", buffer=buffer)
+
+        self.assertEqual(result.status, CHECKIN_DUPLICATE)
+        self.assertEqual(result.gate, "Norte")
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_failed_scans_dropped_after_max_attempts(self):
+        """Test TOK-006: Los escaneos que no se pueden escribir se descartan tras max_attempts"""
+        from apps.attendees.checkin import CHECKIN_OK, ScanBuffer, check_in_token
+        from apps.attendees.tokens import ticket_token
+
+        buffer = ScanBuffer(background=False, max_attempts=2)
+        token = ticket_token(self.ticket)
+        check_in_token(token, self.event.pk, gate="A", buffer=buffer)
+        with patch("apps.attendees.checkin.apply_scans", side_effect=RuntimeError("database is locked")), \
+                self.assertLogs("apps.attendees.checkin", level="ERROR"):
+            buffer.flush()
+            self.assertEqual(len(buffer._pending), 1)
+            buffer.flush()
+        self.assertEqual(buffer._pending, [])
+        self.assertIsNone(buffer.seen(self.ticket.pk))
+        self.assertEqual(check_in_token(token, self.event.pk, gate="B", buffer=buffer).status, CHECKIN_OK)
+
+    def test_token_checked_against_gate_event(self):
+        """Test TOK-007: La puerta de otro evento, un boleto eliminado o de otra empresa no registran el ingreso"""
+        from datetime import timedelta
+        from django.urls import reverse
+        from apps.attendees.checkin import ScanBuffer
+        from apps.attendees.tokens import ticket_token
+
+        token = ticket_token(self.ticket)
+        other_event = Event.objects.create(
+            company=self.company, title="Otro", description="Otro", location="Sala",
+            start_time=self.event.start_time, end_time=self.event.start_time + timedelta(hours=2),
+        )
+        user = User.objects.create_user(username="token_gate", password="pass12345", company=self.company, is_staff=True)
+        url = reverse("attendees:checkin_token")
+        self.client.force_login(user)
+
+        with patch("apps.attendees.checkin.scan_buffer", ScanBuffer(background=False)) as buffer:
+            self.assertEqual(self.client.post(url, {"token": token}).status_code, 400)
+            wrong_gate = self.client.post(url, {"token": token, "event": other_event.pk})
+            self.assertEqual(wrong_gate.status_code, 409)
+            self.assertEqual(wrong_gate.json()["status"], "wrong_event")
+
+            outsider = User.objects.create_user(
+                username="token_outsider", password="pass12345",
+                company=Company.objects.create(name="Otra puerta"), is_staff=True,
+            )
+            self.client.force_login(outsider)
+            self.assertEqual(self.client.post(url, {"token": token, "event": self.event.pk}).status_code, 404)
+
+            self.client.force_login(user)
+            self.assertEqual(self.client.post(url, {"token": token, "event": self.event.pk}).status_code, 202)
+            self.assertEqual(buffer.flush(), 1)
+
+            deleted = Ticket.objects.create(purchase=self.ticket.purchase, attendee=self.ticket.attendee)
+            deleted_token = ticket_token(deleted)
+            deleted.delete()
+            self.assertEqual(self.client.post(url, {"token": deleted_token, "event": self.event.pk}).status_code, 404)
+            self.assertEqual(buffer._pending, [])
+
+    def test_qr_code_rendered(self):
+        """Test TOK-004: El token se puede representar como código QR"""
+        from apps.attendees.tokens import ticket_qr_svg, ticket_token
+
+        svg = ticket_qr_svg(ticket_token(self.ticket))
+
+        self.assertIn("<svg", svg)
+
+
+class CheckinBundleTests(TestCase):
+    """Tests del paquete de ingreso sin conexión y la sincronización en bloque"""
+
+    def setUp(self):
+        """Evento con varios boletos vendidos y usuario staff de la empresa"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Offline Company")
+        self.user = User.objects.create_user(username="scanner", password="pass12345", company=self.company, is_staff=True)
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Feria", description="Feria", location="Recinto",
+            start_time=now, end_time=now + timedelta(hours=6),
+        )
+        category = TicketCategory.objects.create(name="VIP", price=50, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=category, tickets_available=100)
+        purchase = Purchase.objects.create(buyer="Comprador", event=self.event, ticket_category=category, company=self.company)
+        self.tickets = []
+        for index in range(5):
+            attendee = Attendee.objects.create(
+                name=f"Asistente {index}", email=f"asistente{index}@example.com", document_number=f"90{index}",
+                phone_number="+573001234567", gender="M",
+            )
+            self.tickets.append(Ticket.objects.create(purchase=purchase, attendee=attendee))
+
+    def test_bundle_contents(self):
+        """Test OFF-001: El paquete contiene la clave del evento y los boletos ordenados"""
+        import os
+        import sqlite3
+        import tempfile
+        from apps.attendees.bundles import token_hash, write_checkin_bundle
+        from apps.attendees.tokens import event_key, ticket_token
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bundle.sqlite3")
+            self.assertEqual(write_checkin_bundle(self.event, path), 5)
+            database = sqlite3.connect(path)
+            meta = dict(database.execute("SELECT key, value FROM meta"))
+            rows = database.execute("SELECT ticket_id, token_hash, attendee_name, category FROM tickets").fetchall()
+            database.close()
+
+        self.assertEqual(meta["event_key"], event_key(self.event.pk).hex())
+        self.assertEqual([row[0] for row in rows], sorted(ticket.pk for ticket in self.tickets))
+        first = Ticket.objects.select_related("purchase", "attendee").get(pk=rows[0][0])
+        self.assertEqual(rows[0][1], token_hash(ticket_token(first)))
+        self.assertEqual(rows[0][3], "VIP")
+
+    def test_bundle_file_removed_on_close(self):
+        """Test OFF-005: El archivo temporal del paquete se borra al cerrarlo, no mientras está abierto"""
+        import os
+        from apps.attendees.bundles import checkin_bundle_file
+
+        bundle = checkin_bundle_file(self.event)
+        self.assertTrue(os.path.exists(bundle.name))
+        self.assertTrue(bundle.read(16).startswith(b"SQLite format 3"))
+        bundle.close()
+        self.assertFalse(os.path.exists(bundle.name))
+
+    def test_bundle_endpoint_scoped_to_company(self):
+        """Test OFF-002: Solo el staff de la empresa del evento descarga el paquete"""
+        from django.urls import reverse
+
+        url = reverse("attendees:checkin_bundle", args=[self.event.pk])
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"SQLite format 3"))
+
+        other = User.objects.create_user(
+            username="other_scanner", password="pass12345",
+            company=Company.objects.create(name="Otra"), is_staff=True,
+        )
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_sync_resolves_earliest_scan(self):
+        """Test OFF-003: La sincronización conserva el escaneo más antiguo y descarta los inválidos"""
+        import json
+        from datetime import timedelta
+        from django.urls import reverse
+        from apps.attendees.tokens import ticket_token
+
+        base = timezone.now().replace(microsecond=0)
+        ticket = Ticket.objects.select_related("purchase", "attendee").get(pk=self.tickets[0].pk)
+        scans = [
+            {"token": ticket_token(ticket), "scanned_at": (base + timedelta(minutes=5)).isoformat(), "gate": "B"},
+            {"ticket": ticket.pk, "scanned_at": base.isoformat(), "gate": "A"},
+            {"ticket": self.tickets[1].pk, "scanned_at": base.isoformat()},
+            {"token": "NOESUNTOKEN", "scanned_at": base.isoformat()},
+            {"ticket": self.tickets[2].pk, "scanned_at": "ayer"},
+        ]
+
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse("attendees:checkin_sync", args=[self.event.pk]),
+            json.dumps({"gate": "Norte", "scans": scans}), content_type="application/json",
+        )
+
+        self.assertEqual(response.json(), {"received": 5, "rejected": 2, "updated": 2})
+        ticket.refresh_from_db()
+        self.assertTrue(ticket.ticket_confirmed)
+        self.assertEqual((ticket.checked_in_at, ticket.checkin_gate), (base, "A"))
+        self.assertEqual(Ticket.objects.get(pk=self.tickets[1].pk).checkin_gate, "Norte")
+        self.assertFalse(Ticket.objects.get(pk=self.tickets[2].pk).ticket_confirmed)
+
+    def test_sync_query_count_independent_of_size(self):
+        """Test OFF-004: Sincronizar muchos escaneos usa las mismas consultas que pocos"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.attendees.checkin import Scan, apply_scans
+
+        now = timezone.now()
+        scans = [Scan(ticket.pk, self.event.pk, "A", now) for ticket in self.tickets] * 400
+
+        with CaptureQueriesContext(connection) as few:
+            apply_scans(scans[:1])
+        Ticket.objects.update(ticket_confirmed=False, checked_in_at=None)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(apply_scans(scans), 5)
+
+        self.assertEqual(len(few), len(many))
+        self.assertLessEqual(len(many), 8)
+
+
+class TicketEmailQueueTests(TestCase):
+    """Tests de la cola de envío de boletos por correo"""
+
+    def setUp(self):
+        """Evento con tres boletos vendidos"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Mail Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Teatro", description="Teatro", location="Sala 1",
+            start_time=now, end_time=now + timedelta(hours=2),
+        )
+        category = TicketCategory.objects.create(name="Platea", price=30, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=category, tickets_available=10)
+        purchase = Purchase.objects.create(buyer="Comprador", event=self.event, ticket_category=category, company=self.company)
+        self.tickets = []
+        for index in range(3):
+            attendee = Attendee.objects.create(
+                name=f"Asistente {index}", email=f"correo{index}@example.com", document_number=f"70{index}",
+                phone_number="+573001234567", gender="F",
+            )
+            self.tickets.append(Ticket.objects.create(purchase=purchase, attendee=attendee))
+
+    def test_enqueue_skips_pending(self):
+        """Test EML-001: Un boleto con correo pendiente no se vuelve a encolar"""
+        from apps.attendees.emails import enqueue_ticket_emails
+        from apps.attendees.models import TicketEmail
+
+        self.assertEqual(enqueue_ticket_emails(Ticket.objects.all()), 3)
+        self.assertEqual(enqueue_ticket_emails(Ticket.objects.all()), 0)
+        self.assertEqual(TicketEmail.objects.count(), 3)
+
+    def test_send_marks_tickets(self):
+        """Test EML-002: El envío usa una conexión y marca los boletos como enviados"""
+        from django.core import mail
+        from apps.attendees.emails import enqueue_ticket_emails, send_ticket_emails
+        from apps.attendees.models import TicketEmail
+        from apps.attendees.tokens import ticket_token
+
+        enqueue_ticket_emails(Ticket.objects.all())
+        sent, failed = send_ticket_emails(batch_size=2)
+
+        self.assertEqual((sent, failed), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(Ticket.objects.filter(ticket_send_by_email=True).count(), 3)
+        self.assertEqual(TicketEmail.objects.filter(status=TicketEmail.STATUS_SENT).count(), 3)
+        ticket = Ticket.objects.select_related("purchase", "attendee").get(pk=self.tickets[0].pk)
+        message = next(m for m in mail.outbox if m.to == [ticket.attendee.email])
+        self.assertIn(ticket_token(ticket), message.body)
+        self.assertEqual(send_ticket_emails(), (0, 0))
+
+    def test_failed_sends_back_off(self):
+        """Test EML-003: Los envíos fallidos se reintentan con espera y luego quedan como fallidos"""
+        import smtplib
+        from django.core.mail.backends.locmem import EmailBackend
+        from apps.attendees.emails import enqueue_ticket_emails, send_ticket_emails
+        from apps.attendees.models import TicketEmail
+
+        rejected = self.tickets[0].attendee.email
+
+        class RejectingBackend(EmailBackend):
+            def send_messages(self, messages):
+                if any(rejected in message.to for message in messages):
+                    raise smtplib.SMTPRecipientsRefused({rejected: (550, b"rechazado")})
+                return super().send_messages(messages)
+
+        enqueue_ticket_emails(Ticket.objects.all())
+        self.assertEqual(send_ticket_emails(connection=RejectingBackend()), (2, 1))
+
+        email = TicketEmail.objects.get(ticket=self.tickets[0])
+        self.assertEqual((email.status, email.attempts), (TicketEmail.STATUS_PENDING, 1))
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertFalse(Ticket.objects.get(pk=self.tickets[0].pk).ticket_send_by_email)
+
+        TicketEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        send_ticket_emails(connection=RejectingBackend(), max_attempts=2)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (TicketEmail.STATUS_FAILED, 2))
+
+    def test_rate_limiter(self):
+        """Test EML-004: El limitador espacia los envíos según el máximo por minuto"""
+        from apps.attendees.emails import RateLimiter
+
+        clock = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            clock[0] += seconds
+
+        limiter = RateLimiter(per_minute=600, sleep=sleep, clock=lambda: clock[0])
+        for _ in range(4):
+            limiter.wait()
+
+        self.assertEqual(len(waits), 3)
+        self.assertAlmostEqual(sum(waits), 0.3)
+
+    def test_claim_by_token(self):
+        """Test EML-005: Cada reserva toma sus filas por claim_token, sin depender de la precisión de las fechas"""
+        from apps.attendees.emails import _claim_batch, enqueue_ticket_emails
+        from apps.attendees.models import TicketEmail
+
+        enqueue_ticket_emails(Ticket.objects.all())
+        now = timezone.now()
+        first = _claim_batch(2, now)
+        second = _claim_batch(5, now)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(len({email.claim_token for email in first}), 1)
+        self.assertNotEqual(first[0].claim_token, second[0].claim_token)
+        self.assertEqual(_claim_batch(5, now), [])
+        self.assertEqual(TicketEmail.objects.filter(next_attempt_at__gt=now).count(), 3)
+
+    @override_settings(TICKET_EMAIL_RATE_PER_MINUTE=600)
+    def test_rate_setting_applies_without_command(self):
+        """Test EML-006: send_ticket_emails respeta TICKET_EMAIL_RATE_PER_MINUTE aunque no se llame desde el comando"""
+        from apps.attendees.emails import enqueue_ticket_emails, send_ticket_emails
+
+        waits = []
+        enqueue_ticket_emails(Ticket.objects.all())
+        send_ticket_emails(sleep=waits.append)
+        self.assertEqual(len(waits), 2)
+
+
+class TicketPdfTests(TestCase):
+    """Tests de la generación de boletos en PDF"""
+
+    def setUp(self):
+        """Evento con dos boletos y MEDIA_ROOT temporal"""
+        import tempfile
+        from datetime import timedelta
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.company = Company.objects.create(name="Print Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Ópera", description="Ópera", location="Teatro (centro)",
+            start_time=now, end_time=now + timedelta(hours=3),
+        )
+        category = TicketCategory.objects.create(name="Palco", price=80, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=category, tickets_available=10)
+        self.purchase = Purchase.objects.create(buyer="Comprador", event=self.event, ticket_category=category, company=self.company)
+        for index in range(2):
+            attendee = Attendee.objects.create(
+                name=f"Asistente {index}", email=f"pdf{index}@example.com", document_number=f"50{index}",
+                phone_number="+573001234567", gender="M",
+            )
+            Ticket.objects.create(purchase=self.purchase, attendee=attendee)
+
+    def tearDown(self):
+        import shutil
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_pdf_is_deterministic(self):
+        """Test PDF-001: Los mismos datos producen el mismo PDF válido"""
+        from apps.attendees.pdf import render_ticket_pdf
+        from apps.attendees.ticket_pdfs import ticket_pdf_data
+
+        ticket = Ticket.objects.select_related("attendee", "purchase__event", "purchase__ticket_category").first()
+        data = ticket_pdf_data(ticket)
+        pdf = render_ticket_pdf(data)
+
+        self.assertTrue(pdf.startswith(b"%PDF-1.4"))
+        self.assertTrue(pdf.endswith(b"%%EOF\n"))
+        self.assertEqual(pdf, render_ticket_pdf(data))
+        self.assertNotEqual(pdf, render_ticket_pdf({**data, "attendee": "Otro"}))
+
+    def test_render_stores_attachments_and_skips_unchanged(self):
+        """Test PDF-002: Los PDF se guardan como adjuntos y solo se regeneran si cambian los datos"""
+        from apps.attendees.ticket_pdfs import render_ticket_pdfs
+
+        tickets = Ticket.objects.filter(purchase=self.purchase)
+        self.assertEqual(render_ticket_pdfs(tickets, workers=0), (2, 0))
+        self.assertEqual(Attachment.objects.filter(event=self.event).count(), 2)
+        self.assertFalse(tickets.filter(ticket_pdf__isnull=True).exists())
+
+        self.assertEqual(render_ticket_pdfs(tickets, workers=0), (0, 2))
+
+        Attendee.objects.filter(pk=tickets.first().attendee_id).update(name="Nombre corregido")
+        self.assertEqual(render_ticket_pdfs(tickets, workers=0), (1, 1))
+        self.assertEqual(Attachment.objects.filter(event=self.event).count(), 2)
+
+    def test_render_in_process_pool(self):
+        """Test PDF-003: El render en procesos produce los mismos archivos que en línea"""
+        from apps.attendees.ticket_pdfs import render_ticket_pdfs
+
+        tickets = Ticket.objects.filter(purchase__event=self.event)
+        self.assertEqual(render_ticket_pdfs(tickets, workers=2, chunk_size=1), (2, 0))
+        pooled = sorted(tickets.values_list("ticket_pdf__file", flat=True))
+
+        self.assertEqual(render_ticket_pdfs(tickets, workers=0, force=True), (2, 0))
+        self.assertEqual(sorted(tickets.values_list("ticket_pdf__file", flat=True)), pooled)
+
+
+class AttendeeQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Tests de número de consultas del admin y de importación/exportación de compras"""
+
+    def setUp(self):
+        """Evento con cinco compras de dos boletos y un superusuario"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Budget Company")
+        self.user = User.objects.create_superuser(
+            username="budget", email="budget@example.com", password="pass12345", company=self.company,
+        )
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Congreso", description="Congreso", location="Auditorio",
+            start_time=now, end_time=now + timedelta(hours=8),
+        )
+        category = TicketCategory.objects.create(name="General", price=20, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=category, tickets_available=50)
+        for index in range(5):
+            purchase = Purchase.objects.create(buyer=f"Comprador {index}", event=self.event, ticket_category=category, company=self.company)
+            for position in range(2):
+                attendee = Attendee.objects.create(
+                    name=f"Asistente {index}-{position}", email=f"budget{index}{position}@example.com",
+                    document_number=f"8{index}{position}", phone_number="+573001234567", gender="O",
+                )
+                Ticket.objects.create(purchase=purchase, attendee=attendee, ticket_owner=position == 0)
+        self.client.force_login(self.user)
+
+    def test_purchase_changelist_queries(self):
+        """Test QB-001: Listado de compras dentro del presupuesto de consultas"""
+        with self.assertQueryBudget():
+            response = self.client.get("/admin/attendees/purchase/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_ticket_changelist_queries(self):
+        """Test QB-002: Listado de boletos dentro del presupuesto de consultas"""
+        with self.assertQueryBudget():
+            response = self.client.get("/admin/attendees/ticket/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_attendee_changelist_queries(self):
+        """Test QB-003: Listado de asistentes dentro del presupuesto de consultas"""
+        with self.assertQueryBudget():
+            response = self.client.get("/admin/attendees/attendee/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_purchase_change_form_queries(self):
+        """Test QB-004: Formulario de compra con boletos en línea dentro del presupuesto"""
+        purchase = Purchase.objects.first()
+        with self.assertQueryBudget():
+            response = self.client.get(f"/admin/attendees/purchase/{purchase.pk}/change/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_purchase_export_queries(self):
+        """Test QB-005: Exportación de compras dentro del presupuesto de consultas"""
+        from apps.attendees.resources import PurchaseResource
+
+        with self.assertQueryBudget():
+            dataset = PurchaseResource().export(Purchase.objects.order_by("pk"))
+        self.assertEqual(len(dataset), 5)
+
+    def test_purchase_import_queries(self):
+        """Test QB-006: Importación de compras dentro del presupuesto de consultas"""
+        from apps.attendees.resources import PurchaseResource
+
+        dataset = PurchaseResource().export(Purchase.objects.order_by("pk"))
+        with self.assertQueryBudget():
+            result = PurchaseResource().import_data(dataset, dry_run=True)
+        self.assertFalse(result.has_errors())
+
+    @patch.dict("os.environ", {"UPDATE_QUERY_BUDGETS": ""})
+    def test_budget_exceeded_fails(self):
+        """Test QB-007: Superar el presupuesto o no tenerlo (en la configuración actual) hace fallar el test"""
+        import json
+        import os
+        import tempfile
+        from utils.testing import QueryBudget, budget_profile
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "budgets.json")
+            with open(path, "w") as output:
+                json.dump({budget_profile(): {f"{self.id()}:dos": 1}, "otra": {f"{self.id()}:sin-presupuesto": 10}}, output)
+
+            with self.assertRaises(AssertionError) as raised:
+                with QueryBudget(self, "dos", path=path):
+                    list(Purchase.objects.all())
+                    list(Ticket.objects.all())
+            self.assertIn("presupuesto es 1", str(raised.exception))
+
+            with self.assertRaises(AssertionError):
+                with QueryBudget(self, "sin-presupuesto", path=path):
+                    list(Purchase.objects.all())
+
+
+class PurchaseLoadTests(TransactionTestCase):
+    """Tests del generador de carga de compras concurrentes"""
+
+    def setUp(self):
+        """Evento con una categoría de cinco boletos"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Load Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Apertura", description="Apertura", location="Arena",
+            start_time=now, end_time=now + timedelta(hours=2),
+        )
+        self.category = TicketCategory.objects.create(name="Pista", price=80, company=self.company)
+        self.link = EventTicketCategory.objects.create(event=self.event, ticket_category=self.category, tickets_available=5)
+
+    def test_sequential_load_respects_capacity(self):
+        """Test LOAD-001: Sin concurrencia se venden exactamente los boletos asignados"""
+        from apps.attendees.loadtest import OUTCOME_OK, OUTCOME_SOLD_OUT, check_invariants, run_load
+
+        result = run_load(self.link, purchases=8, workers=1)
+
+        self.assertEqual(result.outcomes[OUTCOME_OK], 5)
+        self.assertEqual(result.outcomes[OUTCOME_SOLD_OUT], 3)
+        self.assertEqual(len(result.latencies), 5)
+        self.assertEqual(check_invariants(self.event.pk), [])
+
+    def test_concurrent_load_reports_every_attempt(self):
+        """Test LOAD-004: Con varios hilos cada intento queda registrado con su resultado"""
+        from apps.attendees.loadtest import OUTCOME_OK, run_load
+
+        result = run_load(self.link, purchases=12, workers=4)
+
+        self.assertEqual(sum(result.outcomes.values()), 12)
+        self.assertEqual(Purchase.objects.count(), result.outcomes[OUTCOME_OK])
+
+    def test_invariants_detect_oversell_and_drift(self):
+        """Test LOAD-002: Se detectan sobreventa y contadores desfasados"""
+        from apps.attendees.loadtest import check_invariants, run_load
+
+        # el cupo solo se valida por compra: una compra de 7 boletos sobrevende
+        run_load(self.link, purchases=1, workers=1, tickets_per_purchase=7)
+        EventTicketCategory.objects.filter(pk=self.link.pk).update(tickets_sold=2)
+        violations = check_invariants(self.event.pk)
+
+        self.assertEqual(len(violations), 2)
+        self.assertIn("sobreventa", violations[1])
+
+    def test_command_reports_and_cleans_up(self):
+        """Test LOAD-003: El comando concurrente reporta latencias y limpia sus compras"""
+        from io import StringIO
+        from django.core.management import call_command
+
+        output = StringIO()
+        call_command("load_purchases", self.link.pk, purchases=6, workers=1, cleanup=True, stdout=output)
+
+        self.assertIn("p50=", output.getvalue())
+        self.assertIn("Invariantes correctas", output.getvalue())
+        self.assertFalse(Purchase.objects.exists())
+        self.assertFalse(Attendee.objects.exists())
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.tickets_sold, 0)
+
+
+class StaticAssetsTests(TestCase):
+    """Tests de los estáticos con hash, comprimidos y servidos con caché larga"""
+
+    def setUp(self):
+        """STATIC_ROOT temporal"""
+        import shutil
+        import tempfile
+
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+        # solo static/ del proyecto: comprimir los estáticos de todas las apps toma varios segundos
+        self.settings_override = override_settings(
+            STATIC_ROOT=self.static_root,
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def _storage(self):
+        from utils.staticfiles import StaticFilesStorage
+        return StaticFilesStorage()
+
+    def test_urls_without_manifest_are_plain(self):
+        """Test STA-001: Sin collectstatic las URLs no llevan hash y no fallan"""
+        self.assertEqual(self._storage().url("css/phone_number.css"), "/static/css/phone_number.css")
+
+    def test_collectstatic_hashes_compresses_and_serves_immutable(self):
+        """Test STA-002: collectstatic genera nombres con hash, .gz y .br, y se sirven inmutables"""
+        import os
+        from django.core.management import call_command
+        from django.test import Client
+
+        call_command("collectstatic", interactive=False, verbosity=0)
+        url = self._storage().url("css/styles.css")
+        self.assertRegex(url, r"^/static/css/styles\.[0-9a-f]{12}\.css$")
+        path = os.path.join(self.static_root, url[len("/static/"):])
+        self.assertTrue(os.path.exists(path + ".gz"))
+        self.assertTrue(os.path.exists(path + ".br"))
+
+        # WhiteNoise indexa STATIC_ROOT al crearse el middleware de cada Client
+        response = Client().get(url, HTTP_ACCEPT_ENCODING="br, gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("max-age=315360000", response["Cache-Control"])
+
+    def test_attendee_form_media_has_no_duplicates(self):
+        """Test STA-003: El formulario de asistentes carga intl-tel-input una sola vez"""
+        from apps.attendees.forms import AttendeeForm
+
+        scripts = [path for path in AttendeeForm.Media.js if "intlTelInput" in path]
+        self.assertEqual(len(scripts), 1)
+
+    def test_vendor_command_and_check(self):
+        """Test STA-004: vendor_intl_tel_input copia los archivos fijados y la verificación deja de avisar"""
+        import os
+        import tempfile
+        from django.contrib.staticfiles import finders
+        from django.core.management import call_command
+        from apps.attendees.checks import intl_tel_input_vendored
+        from apps.attendees.forms import INTL_TEL_INPUT_FILES, intl_tel_input
+
+        base = tempfile.mkdtemp(dir=self.static_root)
+        source = os.path.join(base, "build")
+        for path in INTL_TEL_INPUT_FILES:
+            os.makedirs(os.path.dirname(os.path.join(source, path)), exist_ok=True)
+            with open(os.path.join(source, path), "wb") as f:
+                f.write(b"/* intl-tel-input */")
+
+        with override_settings(BASE_DIR=base, STATICFILES_DIRS=[os.path.join(base, "static")]):
+            finders.get_finder.cache_clear()
+            self.addCleanup(finders.get_finder.cache_clear)
+            self.assertEqual([warning.id for warning in intl_tel_input_vendored(None)], ["attendees.W001"])
+            call_command("vendor_intl_tel_input", source=source, stdout=open(os.devnull, "w"))
+            finders.get_finder.cache_clear()
+            self.assertEqual(intl_tel_input_vendored(None), [])
+            self.assertEqual(intl_tel_input("js/intlTelInput.min.js"), "vendor/intl-tel-input/17.0.3/js/intlTelInput.min.js")
+
+
+class LazyXlsxTests(TestCase):
+    """Tests del formato xlsx cargado en el primer uso"""
+
+    def test_xlsx_registered_lazily_and_round_trips(self):
+        """Test LAZY-001: xlsx sigue disponible para import_export y exporta e importa igual"""
+        import tablib
+        from import_export.formats.base_formats import DEFAULT_FORMATS, XLSX
+        from tablib.formats import registry
+        from apps.attendees.xlsx import LazyXLSXFormat
+
+        self.assertIsInstance(registry.get_format("xlsx"), LazyXLSXFormat)
+        self.assertIn(XLSX, DEFAULT_FORMATS)
+        dataset = tablib.Dataset(["Ana", 2], headers=["buyer", "tickets"])
+        content = XLSX().export_data(dataset)
+        self.assertEqual(XLSX().create_dataset(content).dict, [{"buyer": "Ana", "tickets": 2}])
+
+
+class AttendeeSearchTests(TestCase):
+    """Tests de la búsqueda de asistentes por nombre, correo y documento"""
+
+    def setUp(self):
+        """Asistentes de dos empresas con boletos y un usuario staff de la primera"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Search Company")
+        self.other = Company.objects.create(name="Other Search Company")
+        self.user = User.objects.create_user(username="search_staff", password="pass12345", company=self.company, is_staff=True)
+        now = timezone.now()
+        self.people = {}
+        for company, names in ((self.company, ["María José González", "Mario Gómez"]), (self.other, ["Marina Gonzalo"])):
+            event = Event.objects.create(
+                company=company, title="Congreso", description="Congreso", location="Centro",
+                start_time=now, end_time=now + timedelta(hours=8),
+            )
+            category = TicketCategory.objects.create(name="General", price=10, company=company)
+            EventTicketCategory.objects.create(event=event, ticket_category=category, tickets_available=10)
+            purchase = Purchase.objects.create(buyer="Comprador", event=event, ticket_category=category, company=company)
+            for name in names:
+                attendee = Attendee.objects.create(
+                    name=name, email=f"{name.split()[0].lower()}@Example.com", document_type="DNI",
+                    document_number=str(1000 + len(self.people)), phone_number="+573001234567", gender="O",
+                )
+                Ticket.objects.create(purchase=purchase, attendee=attendee)
+                self.people[name] = attendee
+        self.event = event
+
+    def names(self, queryset):
+        return {attendee.name for attendee in queryset}
+
+    def test_exact_lookups(self):
+        """Test SRCH-001: Correo sin distinguir mayúsculas y documento con o sin tipo"""
+        from apps.attendees.search import search_attendees
+
+        self.assertEqual(self.names(search_attendees("MARIO@example.COM")), {"Mario Gómez"})
+        self.assertEqual(self.names(search_attendees("1000")), {"María José González"})
+        self.assertEqual(self.names(search_attendees("1000", document_type="DNI")), {"María José González"})
+        self.assertEqual(self.names(search_attendees("1000", document_type="Pasaporte")), set())
+        self.assertEqual(self.names(search_attendees("   ")), set())
+
+    def test_name_prefix_search(self):
+        """Test SRCH-002: Cada palabra del nombre se busca como comienzo o parte, sin importar mayúsculas"""
+        from apps.attendees.search import search_attendees
+
+        self.assertEqual(self.names(search_attendees("mar gonz")), {"María José González", "Marina Gonzalo"})
+        self.assertEqual(self.names(search_attendees("Mario")), {"Mario Gómez"})
+
+        renamed = self.people["Mario Gómez"]
+        renamed.name = "Mario Pérez"
+        renamed.save()
+        self.assertEqual(self.names(search_attendees("mario gom")), set())
+        self.assertEqual(self.names(search_attendees("mario pér")), {"Mario Pérez"})
+
+    def test_name_search_uses_fts_on_sqlite(self):
+        """Test SRCH-003: En SQLite con migraciones el nombre se busca en la tabla FTS5, sin tildes"""
+        from django.db import connection
+        from apps.attendees.search import FTS_TABLE, _has_fts, search_attendees
+
+        if connection.vendor != "sqlite":
+            self.skipTest("La tabla FTS5 la crea la migración 0006 solo en SQLite")
+        # settings_test también migra attendees (MIGRATED_APPS)
+        self.assertTrue(_has_fts(connection))
+
+        queryset = search_attendees("maria jose")
+        self.assertIn(FTS_TABLE, str(queryset.query))
+        self.assertEqual(self.names(queryset), {"María José González"})
+        self.assertIn("attendee_document_idx", search_attendees("1000").explain())
+        self.assertIn("attendee_email_lower_idx", search_attendees("mario@example.com").explain())
+
+    def test_admin_and_api_search(self):
+        """Test SRCH-004: El admin y la API buscan con índices y la API se limita a la empresa"""
+        from django.urls import reverse
+
+        admin = User.objects.create_superuser(username="search_admin", password="pass12345", email="a@example.com", company=self.company)
+        self.client.force_login(admin)
+        response = self.client.get("/admin/attendees/attendee/", {"q": "gonz"})
+        self.assertEqual(self.names(response.context["cl"].result_list), {"María José González", "Marina Gonzalo"})
+
+        self.client.force_login(self.user)
+        url = reverse("attendees:attendee_search")
+        response = self.client.get(url, {"q": "mar gonz"})
+        self.assertEqual([row["name"] for row in response.json()["results"]], ["María José González"])
+        self.assertEqual(self.client.get(url, {"q": "marina@example.com"}).json()["results"], [])
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(url, {"q": "mario"}).status_code, 403)
+
+
+class AttendeeIdentityTests(TestCase):
+    """Tests de la identidad de asistentes: normalización, get-or-create y fusión de duplicados"""
+
+    def setUp(self):
+        """Un evento con una categoría y una compra"""
+        from datetime import timedelta
+
+        self.company = Company.objects.create(name="Identity Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Feria", description="Feria", location="Centro",
+            start_time=now, end_time=now + timedelta(hours=8),
+        )
+        category = TicketCategory.objects.create(name="General", price=10, company=self.company)
+        self.link = EventTicketCategory.objects.create(event=self.event, ticket_category=category, tickets_available=20)
+        self.purchase = Purchase.objects.create(buyer="Comprador", event=self.event, ticket_category=category, company=self.company)
+
+    def legacy(self, name, document_number, email, document_type="DNI", **fields):
+        """Asistente guardado sin pasar por Attendee.save (datos anteriores a la normalización), con un boleto"""
+        attendee = Attendee.objects.bulk_create([Attendee(
+            name=name, email=email, document_type=document_type, document_number=document_number,
+            phone_number=fields.pop("phone_number", "+573001234567"), gender="O", **fields,
+        )])[0]
+        if attendee.pk is None:
+            attendee = Attendee.objects.order_by("-pk").first()
+        Ticket.objects.create(purchase=self.purchase, attendee=attendee)
+        return attendee
+
+    def test_save_normalizes_and_get_or_create_reuses(self):
+        """Test IDN-001: Documento y correo se normalizan y get_or_create encuentra a la misma persona"""
+        from apps.attendees.identity import find_attendee, get_or_create_attendee
+
+        attendee, created = get_or_create_attendee(
+            "DNI", " 12.345.678-k ", "Ana@Example.COM", name="Ana", phone_number="+573001234567", gender="F",
+        )
+        self.assertTrue(created)
+        self.assertEqual((attendee.document_number, attendee.email), ("12345678K", "ana@example.com"))
+
+        self.assertEqual(get_or_create_attendee("DNI", "12345678-K", "otro@example.com", name="Ana")[0], attendee)
+        # otro tipo de documento con el mismo número y correo: es la misma persona
+        self.assertEqual(find_attendee("Otros", "12345678k", "ANA@example.com"), attendee)
+        # mismo correo con otro documento: otra persona (p. ej. un familiar)
+        self.assertIsNone(find_attendee("DNI", "87654321", "ana@example.com"))
+        self.assertIsNone(find_attendee("Pasaporte", "12345678K", "otro@example.com"))
+        self.assertEqual(Attendee.objects.count(), 1)
+
+    def test_find_duplicates_by_blocking_keys(self):
+        """Test IDN-002: Los duplicados se agrupan por documento y por correo + documento, sin unir familias"""
+        from apps.attendees.identity import find_duplicates
+
+        first = self.legacy("Luis", "1.000.000", "luis@example.com")
+        same_document = self.legacy("Luis Pérez", "1000000", "otro@example.com")
+        other_type = self.legacy("Luis P.", "1000000", " LUIS@example.com", document_type="Otros")
+        family = self.legacy("Hija de Luis", "2000000", "luis@example.com")
+        alone = self.legacy("Sin par", "1000000", "nadie@example.com", document_type="Pasaporte")
+        self.legacy("Sin documento", "", "vacio@example.com")
+        self.legacy("Sin documento 2", "", "vacio@example.com")
+        # sin correo, el mismo número con otro tipo no los une
+        self.legacy("Sin correo", "3000000", "")
+        self.legacy("Sin correo 2", "3000000", "", document_type="Pasaporte")
+
+        self.assertEqual(find_duplicates(), [[first.pk, same_document.pk, other_type.pk]])
+        self.assertNotIn(family.pk, find_duplicates()[0])
+        self.assertNotIn(alone.pk, find_duplicates()[0])
+
+    def test_deduplicate_moves_tickets_and_merges(self):
+        """Test IDN-003: La fusión mueve los boletos al registro más antiguo y completa sus datos"""
+        from io import StringIO
+        from django.core.management import call_command
+        from apps.attendees.identity import deduplicate
+
+        first = self.legacy("Eva", "5.555-5", "eva@example.com", address=None)
+        second = self.legacy("Eva Ruiz", "55555", "EVA@example.com", address="Calle 1")
+        third = self.legacy("Eva R.", "55555", "eva@example.com", document_type="Otros")
+        Ticket.objects.create(purchase=self.purchase, attendee=third)
+        other = self.legacy("Otro", "66.666", "otro@example.com")
+
+        dry = deduplicate(dry_run=True)
+        self.assertEqual(dry.groups, 1)
+        self.assertEqual(dry.merged, 2)
+        self.assertEqual(dry.tickets, 3)
+        self.assertEqual(Attendee.objects.count(), 4)
+
+        out = StringIO()
+        call_command("dedup_attendees", stdout=out)
+        self.assertIn("2 asistentes fusionados, 3 boletos movidos", out.getvalue())
+
+        self.assertEqual(set(Attendee.objects.values_list("pk", flat=True)), {first.pk, other.pk})
+        self.assertEqual(Ticket.objects.filter(attendee=first).count(), 4)
+        self.assertEqual(Ticket.objects.filter(purchase=self.purchase).count(), 5)
+        first.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((first.document_number, first.address), ("55555", "Calle 1"))
+        self.assertEqual(other.document_number, "66666")
+        self.assertEqual(deduplicate(), (0, 0, 0, 0))
+
+    def test_admin_add_and_import_reuse_existing(self):
+        """Test IDN-004: Agregar desde el admin o importar a una persona existente la enlaza sin sobrescribir sus datos"""
+        import tablib
+        from apps.attendees.resources import AttendeeResource
+
+        existing = Attendee.objects.create(
+            name="Juan", email="juan@example.com", document_type="DNI", document_number="77.777.777",
+            phone_number="+573001234567", gender="M",
+        )
+        admin = User.objects.create_superuser(username="identity_admin", password="pass12345", email="a@example.com", company=self.company)
+        self.client.force_login(admin)
+        response = self.client.post("/admin/attendees/attendee/add/", {
+            "name": "Juan Díaz", "email": "JUAN@example.com", "document_type": "Otros",
+            "document_number": "77777777", "phone_number": "+573009999999", "gender": "M",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"/admin/attendees/attendee/{existing.pk}/change/")
+        self.assertEqual(Attendee.objects.count(), 1)
+        existing.refresh_from_db()
+        self.assertEqual((existing.name, existing.phone_number, existing.document_type), ("Juan", "+573001234567", "DNI"))
+
+        dataset = tablib.Dataset(headers=["attendee_id", "name", "email", "document_type", "document_number", "phone_number", "address", "gender"])
+        dataset.append(["", "Juan D.", "juan@example.com", "Otros", "77.777.777", "", "Calle 9", "M"])
+        dataset.append([existing.pk, "Nueva", "nueva@example.com", "DNI", "88.888.888", "+573002222222", "", "F"])
+        result = AttendeeResource().import_data(dataset, dry_run=False)
+        self.assertFalse(result.has_errors())
+        self.assertEqual(Attendee.objects.count(), 2)
+        existing.refresh_from_db()
+        # solo se completa lo que faltaba; el id del archivo no apunta la fila nueva a otro registro
+        self.assertEqual(
+            (existing.name, existing.phone_number, existing.document_type, existing.address),
+            ("Juan", "+573001234567", "DNI", "Calle 9"),
+        )
+        self.assertNotEqual(Attendee.objects.get(document_number="88888888").pk, existing.pk)
+
+    def test_lookup_is_limited_to_visible_attendees(self):
+        """Test IDN-005: Un usuario de otra empresa no encuentra ni modifica a los asistentes ajenos"""
+        import tablib
+        from django.contrib.admin.sites import site
+        from django.test import RequestFactory
+        from apps.attendees.identity import find_attendee
+
+        existing = Attendee.objects.create(
+            name="Marta", email="marta@example.com", document_type="DNI", document_number="44444444",
+            phone_number="+573001234567", gender="F", address="Calle 1",
+        )
+        Ticket.objects.create(purchase=self.purchase, attendee=existing)
+        other = Company.objects.create(name="Other Identity Company")
+        staff = User.objects.create_user(username="identity_staff", password="pass12345", company=other, is_staff=True)
+        request = RequestFactory().post("/admin/attendees/attendee/import/")
+        request.user = staff
+        model_admin = site._registry[Attendee]
+
+        visible = model_admin.get_queryset(request)
+        self.assertIsNone(find_attendee("DNI", "44.444.444", "marta@example.com", queryset=visible))
+        self.assertEqual(find_attendee("DNI", "44.444.444", "marta@example.com"), existing)
+
+        resource = model_admin.get_import_resource_classes(request)[0](**model_admin.get_import_resource_kwargs(request))
+        dataset = tablib.Dataset(headers=["name", "email", "document_type", "document_number", "phone_number", "address", "gender"])
+        dataset.append(["M. Ruiz", "marta@example.com", "DNI", "44.444.444", "+573009999999", "", "F"])
+        result = resource.import_data(dataset, dry_run=False)
+
+        self.assertFalse(result.has_errors())
+        existing.refresh_from_db()
+        self.assertEqual((existing.name, existing.phone_number, existing.address), ("Marta", "+573001234567", "Calle 1"))
+        self.assertEqual(Attendee.objects.filter(document_number="44444444").count(), 2)
+
+    def test_duplicates_never_merge_across_companies(self):
+        """Test IDN-006: Asistentes de empresas distintas con el mismo documento no se fusionan"""
+        from datetime import timedelta
+        from apps.attendees.identity import deduplicate, find_duplicates
+
+        other = Company.objects.create(name="Other Identity Company")
+        event = Event.objects.create(
+            company=other, title="Otra feria", description="Otra feria", location="Centro",
+            start_time=self.event.start_time, end_time=self.event.start_time + timedelta(hours=4),
+        )
+        category = TicketCategory.objects.create(name="General", price=10, company=other)
+        EventTicketCategory.objects.create(event=event, ticket_category=category, tickets_available=20)
+        other_purchase = Purchase.objects.create(buyer="Otro comprador", event=event, ticket_category=category, company=other)
+
+        mine = self.legacy("Rosa", "9.999.999", "rosa@example.com", address=None)
+        mine_again = self.legacy("Rosa M.", "9999999", "rosa@example.com", address="Calle 2")
+        theirs = self.legacy("Rosa Otra", "9999999", "rosa@example.com", address="Calle privada", date_of_birth="1990-01-01")
+        Ticket.objects.filter(attendee=theirs).update(purchase=other_purchase)
+
+        self.assertEqual(find_duplicates(), [[mine.pk, mine_again.pk]])
+        self.assertEqual(deduplicate().merged, 1)
+        mine.refresh_from_db()
+        theirs.refresh_from_db()
+        self.assertEqual((mine.address, mine.date_of_birth), ("Calle 2", None))
+        self.assertEqual(Ticket.objects.get(attendee=theirs).purchase, other_purchase)
+
+    def test_purchase_inline_reuses_company_attendee(self):
+        """Test IDN-007: Los boletos de una compra en el admin reutilizan al asistente de la empresa por su documento"""
+        admin = User.objects.create_superuser(username="purchase_admin", password="pass12345", email="p@example.com", company=self.company)
+        self.client.force_login(admin)
+
+        def post(buyer, document_number, email, name):
+            return self.client.post("/admin/attendees/purchase/add/", {
+                "buyer": buyer, "event": self.event.pk, "ticket_category": self.link.ticket_category_id, "company": self.company.pk,
+                "ticket_set-TOTAL_FORMS": "1", "ticket_set-INITIAL_FORMS": "0",
+                "ticket_set-MIN_NUM_FORMS": "0", "ticket_set-MAX_NUM_FORMS": "1000",
+                "ticket_set-0-attendee": "", "ticket_set-0-checkin_gate": "",
+                "ticket_set-0-attendee_document_type": "DNI", "ticket_set-0-attendee_document_number": document_number,
+                "ticket_set-0-attendee_name": name, "ticket_set-0-attendee_email": email,
+                "ticket_set-0-attendee_phone_number": "+573001234567",
+            })
+
+        self.assertEqual(post("Primera", "12.121.212", "pia@example.com", "Pía").status_code, 302)
+        self.assertEqual(post("Segunda", "12121212", "PIA@example.com", "Pía Gómez").status_code, 302)
+
+        attendees = Attendee.objects.filter(document_number="12121212")
+        self.assertEqual(attendees.count(), 1)
+        self.assertEqual(attendees.get().name, "Pía")
+        self.assertEqual(Ticket.objects.filter(attendee=attendees.get()).count(), 2)
+
+        response = post("Tercera", "", "", "")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Elija un asistente o ingrese su documento")
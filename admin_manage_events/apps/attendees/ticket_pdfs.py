@@ -0,0 +1,110 @@
+# apps/attendees/ticket_pdfs.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from apps.attachments.models import Attachment
+from .models import Ticket
+from .pdf import content_hash, render_ticket_pdf
+from .tokens import event_key, make_ticket_token
+
+CHUNK_SIZE = 500
+
+
+def ticket_pdf_data(ticket, key=None):
+    """Datos del boleto que se imprimen en el PDF (solo texto, para enviarlos a otro proceso)."""
+    event = ticket.purchase.event
+    attendee = ticket.attendee
+    return {
+        'event': event.title,
+        'location': event.location,
+        'date': timezone.localtime(event.start_time).strftime('%d/%m/%Y %H:%M'),
+        'attendee': attendee.name,
+        'document': f'{attendee.document_type} {attendee.document_number}',
+        'category': ticket.purchase.ticket_category.name,
+        'ticket': str(ticket.pk),
+        'token': make_ticket_token(
+            ticket.pk, event.pk, attendee.document_type, attendee.document_number, key=key or event_key(event.pk),
+        ),
+    }
+
+
+def _store(items, pdfs):
+    """Guarda los PDF como adjuntos y apunta los boletos a ellos. Devuelve cuántos se guardaron."""
+    tickets = [ticket for ticket, _, _ in items]
+    attachments = [
+        Attachment(
+            event_id=ticket.purchase.event_id,
+            company_id=ticket.purchase.company_id,
+            name=f'Boleto {ticket.pk} - {ticket.attendee.name}'[:255],
+            file=ContentFile(pdf, name=f'boleto-{ticket.pk}.pdf'),
+        )
+        for ticket, pdf in zip(tickets, pdfs)
+    ]
+    replaced = [ticket.ticket_pdf_id for ticket in tickets if ticket.ticket_pdf_id]
+
+    with transaction.atomic():
+        # bulk_create no dispara las miniaturas de adjuntos, innecesarias para boletos
+        Attachment.objects.bulk_create(attachments)
+        for (ticket, _, digest), attachment in zip(items, attachments):
+            ticket.ticket_pdf = attachment
+            ticket.ticket_pdf_hash = digest
+        Ticket.objects.bulk_update(tickets, ['ticket_pdf', 'ticket_pdf_hash'])
+        if replaced:
+            Attachment.objects.filter(pk__in=replaced).delete()
+    return len(attachments)
+
+
+def render_ticket_pdfs(tickets, workers=None, chunk_size=CHUNK_SIZE, force=False):
+    """Genera los PDF de los boletos de `tickets` en un pool de procesos.
+
+    Solo se renderizan los boletos cuyo hash de contenido cambió (o todos con
+    `force`). Los boletos se leen por bloques; mientras el proceso principal
+    guarda un bloque, el pool ya renderiza el siguiente. `workers=0` renderiza
+    en el mismo proceso. Devuelve (generados, sin cambios).
+    """
+    if multiprocessing.current_process().daemon:
+        # un proceso daemon (p. ej. un worker de `manage.py test --parallel`) no puede tener hijos
+        workers = 0
+    ticket_ids = list(tickets.order_by('pk').values_list('pk', flat=True))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    keys = {}
+    generated = unchanged = 0
+    previous = None
+
+    try:
+        for start in range(0, len(ticket_ids), chunk_size):
+            chunk = (
+                Ticket.objects.filter(pk__in=ticket_ids[start:start + chunk_size])
+                .select_related('attendee', 'purchase__event', 'purchase__ticket_category')
+                .order_by('pk')
+            )
+            items = []
+            for ticket in chunk:
+                event_id = ticket.purchase.event_id
+                if event_id not in keys:
+                    keys[event_id] = event_key(event_id)
+                data = ticket_pdf_data(ticket, keys[event_id])
+                digest = content_hash(data)
+                if not force and ticket.ticket_pdf_id and ticket.ticket_pdf_hash == digest:
+                    unchanged += 1
+                    continue
+                items.append((ticket, data, digest))
+
+            datas = [data for _, data, _ in items]
+            if executor is None:
+                pdfs = [render_ticket_pdf(data) for data in datas]
+            else:
+                pdfs = executor.map(render_ticket_pdf, datas, chunksize=16)
+            if previous:
+                generated += _store(*previous)
+            previous = (items, pdfs) if items else None
+        if previous:
+            generated += _store(*previous)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return generated, unchanged
@@ -0,0 +1,84 @@
+# apps/attendees/tokens.py
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+from collections import namedtuple
+from io import BytesIO
+
+from django.utils.crypto import salted_hmac
+
+# Formato del token: versión, ticket_id, event_id y hash del documento del
+# asistente, seguido de un HMAC-SHA256 truncado con la clave del evento.
+# Se codifica en base32 (mayúsculas y dígitos) para usar el modo alfanumérico
+# del QR, que produce códigos más pequeños que el modo binario.
+TOKEN_VERSION = 1
+_PAYLOAD = struct.Struct('>BQI8s')
+MAC_LENGTH = 12
+TOKEN_LENGTH = _PAYLOAD.size + MAC_LENGTH
+
+TicketToken = namedtuple('TicketToken', 'ticket_id event_id document_hash')
+
+
+def event_key(event_id):
+    """Clave de firma por evento, derivada de SECRET_KEY.
+
+    Es la clave que se entrega a los escáneres de ese evento para verificar
+    boletos sin consultar la base de datos; no sirve para otros eventos.
+    """
+    return salted_hmac('apps.attendees.tokens.event', str(event_id), algorithm='sha256').digest()
+
+
+def document_hash(document_type, document_number):
+    normalized = f'{document_type}:{document_number}'.strip().upper()
+    return hashlib.sha256(normalized.encode('utf-8')).digest()[:8]
+
+
+def make_ticket_token(ticket_id, event_id, document_type, document_number, key=None):
+    payload = _PAYLOAD.pack(TOKEN_VERSION, ticket_id, event_id, document_hash(document_type, document_number))
+    mac = hmac.new(key or event_key(event_id), payload, hashlib.sha256).digest()[:MAC_LENGTH]
+    return base64.b32encode(payload + mac).decode('ascii').rstrip('=')
+
+
+def ticket_token(ticket):
+    """Token del boleto (usar select_related('purchase', 'attendee') para evitar consultas)."""
+    attendee = ticket.attendee
+    return make_ticket_token(ticket.pk, ticket.purchase.event_id, attendee.document_type, attendee.document_number)
+
+
+def verify_ticket_token(token, key=None):
+    """Verifica la firma del token sin consultar la base de datos.
+
+    Devuelve un TicketToken o None si el token está mal formado o la firma no
+    coincide. `key` permite verificar con la clave de un evento concreto.
+    """
+    try:
+        padded = token.strip().upper() + '=' * (-len(token.strip()) % 8)
+        raw = base64.b32decode(padded)
+    except (binascii.Error, ValueError, AttributeError):
+        return None
+    if len(raw) != TOKEN_LENGTH:
+        return None
+
+    payload, mac = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+    version, ticket_id, event_id, doc_hash = _PAYLOAD.unpack(payload)
+    if version != TOKEN_VERSION:
+        return None
+    expected = hmac.new(key or event_key(event_id), payload, hashlib.sha256).digest()[:MAC_LENGTH]
+    if not hmac.compare_digest(mac, expected):
+        return None
+    return TicketToken(ticket_id, event_id, doc_hash)
+
+
+def ticket_qr_svg(token):
+    """Código QR del token en SVG, o None si la librería qrcode no está instalada."""
+    try:
+        import qrcode
+        import qrcode.image.svg
+    except ImportError:
+        return None
+    image = qrcode.make(token, image_factory=qrcode.image.svg.SvgPathImage, border=2)
+    output = BytesIO()
+    image.save(output)
+    return output.getvalue().decode('utf-8')
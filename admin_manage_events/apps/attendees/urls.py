@@ -0,0 +1,14 @@
+# apps/attendees/urls.py
+from django.urls import path
+from . import views
+
+app_name = 'attendees'
+
+urlpatterns = [
+    path('checkin/', views.checkin, name='checkin'),
+    path('checkin/token/', views.checkin_token, name='checkin_token'),
+    path('checkin/lookup/', views.checkin_lookup, name='checkin_lookup'),
+    path('search/', views.attendee_search, name='attendee_search'),
+    path('events/<int:event_id>/checkin-bundle/', views.checkin_bundle, name='checkin_bundle'),
+    path('events/<int:event_id>/checkin-sync/', views.checkin_sync, name='checkin_sync'),
+]
@@ -1,3 +1,186 @@
-from django.shortcuts import render
+# apps/attendees/views.py
+import json
 
-# Create your views here.
+from django.db.models import Exists, F, OuterRef
+from django.http import FileResponse, HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET, require_POST
+
+from apps.events.models import Event
+
+from utils.views import company_scope, staff_required_json
+from .bundles import SyncError, checkin_bundle_file, sync_scans
+from .checkin import (
+    CHECKIN_DUPLICATE, CHECKIN_INVALID, CHECKIN_NOT_FOUND, CHECKIN_OK, CHECKIN_WRONG_EVENT, check_in_ticket, check_in_token,
+    scan_buffer,
+)
+from .models import Ticket
+from .search import search_attendees
+from .tokens import verify_ticket_token
+
+CHECKIN_STATUS_CODES = {CHECKIN_OK: 200, CHECKIN_DUPLICATE: 409, CHECKIN_WRONG_EVENT: 409, CHECKIN_INVALID: 400}
+SEARCH_RESULTS = 20
+
+
+@require_POST
+@staff_required_json
+def checkin(request):
+    """Registra el ingreso de un boleto en la puerta del evento."""
+    try:
+        ticket_id = int(request.POST['code'])
+        event_id = int(request.POST['event'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Código de boleto o evento inválido.'}, status=400)
+    gate = request.POST.get('gate', '')[:50]
+
+    result = check_in_ticket(ticket_id, event_id, gate, company_id=company_scope(request.user))
+    return _checkin_response(result)
+
+
+def _checkin_response(result, status=None):
+    return JsonResponse(
+        {
+            'status': result.status,
+            'ticket': result.ticket_id,
+            'checked_in_at': result.checked_in_at,
+            'gate': result.gate,
+        },
+        status=status or CHECKIN_STATUS_CODES.get(result.status, 404),
+    )
+
+
+@require_POST
+@staff_required_json
+def checkin_token(request):
+    """Ingreso con el token firmado del QR en la puerta del evento; la escritura en base de datos se difiere."""
+    try:
+        event_id = int(request.POST['event'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Evento inválido.'}, status=400)
+    token = request.POST.get('token', '')
+    gate = request.POST.get('gate', '')[:50]
+    result = check_in_token(token, event_id, gate, company_id=company_scope(request.user))
+    # 202: el ingreso es válido pero aún no está escrito en la base de datos
+    return _checkin_response(result, status=202 if result.status == CHECKIN_OK else None)
+
+
+@staff_required_json
+async def checkin_lookup(request):
+    """Estado de ingreso de un boleto sin registrarlo, por token del QR o por código y evento.
+
+    Vista async (solo lectura): los escáneres la consultan en paralelo y con
+    ASGI no ocupa un hilo por conexión.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    token = request.GET.get('token')
+    if token:
+        parsed = verify_ticket_token(token)
+        if parsed is None:
+            return JsonResponse({'status': CHECKIN_INVALID, 'error': 'Token inválido.'}, status=400)
+        ticket_id, event_id = parsed.ticket_id, parsed.event_id
+    else:
+        try:
+            ticket_id = int(request.GET['code'])
+            event_id = int(request.GET['event'])
+        except (KeyError, ValueError):
+            return JsonResponse({'error': 'Código de boleto o evento inválido.'}, status=400)
+
+    tickets = Ticket.objects.filter(pk=ticket_id, purchase__event_id=event_id)
+    company_id = company_scope(request.user)
+    if company_id is not None:
+        tickets = tickets.filter(purchase__company_id=company_id)
+    ticket = await tickets.values(
+        'ticket_confirmed', 'checked_in_at', 'checkin_gate',
+        attendee_name=F('attendee__name'), category=F('purchase__ticket_category__name'),
+    ).afirst()
+    if ticket is None:
+        return JsonResponse({'status': CHECKIN_NOT_FOUND, 'ticket': ticket_id}, status=404)
+
+    checked_in, checked_in_at, gate = ticket['ticket_confirmed'], ticket['checked_in_at'], ticket['checkin_gate']
+    # un ingreso por token puede estar todavía en la cola de escaneos de este proceso
+    scan = None if checked_in else scan_buffer.seen(ticket_id)
+    if scan is not None:
+        checked_in, checked_in_at, gate = True, scan.scanned_at, scan.gate
+    return JsonResponse({
+        'ticket': ticket_id,
+        'event': event_id,
+        'attendee': ticket['attendee_name'],
+        'category': ticket['category'],
+        'checked_in': checked_in,
+        'checked_in_at': checked_in_at,
+        'gate': gate,
+    })
+
+
+def _scoped_event(user, event_id):
+    events = Event.objects.all()
+    company_id = company_scope(user)
+    if company_id is not None:
+        events = events.filter(company_id=company_id)
+    return get_object_or_404(events, pk=event_id)
+
+
+@require_GET
+@staff_required_json
+def checkin_bundle(request, event_id):
+    """Paquete SQLite del evento para escáneres sin conexión."""
+    event = _scoped_event(request.user, event_id)
+    return FileResponse(
+        checkin_bundle_file(event), as_attachment=True,
+        filename=f'checkin-{event.pk}.sqlite3', content_type='application/vnd.sqlite3',
+    )
+
+
+@require_POST
+@staff_required_json
+def checkin_sync(request, event_id):
+    """Recibe en bloque el registro de escaneos de un dispositivo sin conexión.
+
+    Cuerpo JSON: {"gate": "...", "scans": [{"token" | "ticket", "scanned_at", "gate"}]}.
+    """
+    event = _scoped_event(request.user, event_id)
+    try:
+        data = json.loads(request.body)
+        received, rejected, updated = sync_scans(event.pk, data.get('scans'), gate=str(data.get('gate', '')))
+    except (ValueError, AttributeError) as error:
+        message = str(error) if isinstance(error, SyncError) else 'El cuerpo debe ser un JSON válido.'
+        return JsonResponse({'error': message}, status=400)
+    return JsonResponse({'received': received, 'rejected': rejected, 'updated': updated})
+
+
+@require_GET
+@staff_required_json
+def attendee_search(request):
+    """Asistentes por nombre, correo o documento (?q=, opcionales &document_type= y &event=).
+
+    Pensada para la puerta del evento: ver search.py para los índices que usa cada búsqueda.
+    """
+    text = request.GET.get('q', '').strip()
+    if not text:
+        return JsonResponse({'error': 'Falta el parámetro q.'}, status=400)
+    tickets = Ticket.objects.filter(attendee=OuterRef('pk'))
+    company_id = company_scope(request.user)
+    if company_id is not None:
+        tickets = tickets.filter(purchase__company_id=company_id)
+    event = request.GET.get('event')
+    if event:
+        if not event.isdigit():
+            return JsonResponse({'error': 'Evento inválido.'}, status=400)
+        tickets = tickets.filter(purchase__event_id=event)
+    attendees = search_attendees(text, document_type=request.GET.get('document_type') or None)
+    if company_id is not None or event:
+        attendees = attendees.filter(Exists(tickets))
+    rows = attendees.order_by('name').values('attendee_id', 'name', 'email', 'document_type', 'document_number')[:SEARCH_RESULTS]
+    return JsonResponse({
+        'results': [
+            {
+                'id': row['attendee_id'],
+                'name': row['name'],
+                'email': row['email'],
+                'document_type': row['document_type'],
+                'document_number': row['document_number'],
+            }
+            for row in rows
+        ],
+    })
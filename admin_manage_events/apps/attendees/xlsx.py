@@ -0,0 +1,29 @@
+# apps/attendees/xlsx.py
+"""Formato xlsx de tablib que importa openpyxl recién al usarse.
+
+import_export arma su lista de formatos al importarse (durante el
+autodiscover del admin) y para saber si xlsx está disponible carga el
+módulo de tablib, que importa openpyxl completo: más de 100 ms en cada
+arranque de proceso aunque nunca se exporte a Excel. Registrando este
+formato en su lugar, xlsx sigue disponible y openpyxl se importa en la
+primera importación o exportación.
+"""
+from importlib.util import find_spec
+
+
+class LazyXLSXFormat:
+    title = 'xlsx'
+    extensions = ('xlsx',)
+
+    def __getattr__(self, name):
+        # detect, import_set, export_set, import_book, export_book
+        from tablib.formats._xlsx import XLSXFormat
+        return getattr(XLSXFormat, name)
+
+
+def register_lazy_xlsx():
+    """Reemplaza el formato xlsx registrado en tablib. Debe llamarse antes del autodiscover del admin."""
+    if not find_spec('openpyxl'):
+        return
+    from tablib.formats import registry
+    registry.register('xlsx', LazyXLSXFormat())
@@ -1,6 +1,12 @@
 # apps/events/admin.py
-from django.contrib import admin
-from .models import Event, EventTicketCategory
+import json
+from itertools import groupby
+from operator import itemgetter
+
+from django.contrib import admin, messages
+from django.utils.html import format_html_join
+from .models import ArchivedEvent, Event, EventTicketCategory
+from .archive import ArchiveError, archived_rows, restore_archived_event
 from apps.inventory.models import InventoryItem
 from .forms import EventForm, InventoryItemInlineForm
 
@@ -54,3 +60,58 @@ class EventAdmin(admin.ModelAdmin):
                         form.instance.save()
 
 admin.site.register(Event, EventAdmin)
+
+
+class ArchivedEventAdmin(admin.ModelAdmin):
+    # Los datos archivados son de solo lectura, solo se pueden restaurar
+    list_display = ('title', 'company', 'start_time', 'end_time', 'archived_at')
+    list_filter = ('company',)
+    fields = ('event_id', 'title', 'company', 'start_time', 'end_time', 'archived_at', 'archived_content', 'archived_data')
+    readonly_fields = fields
+    actions = ['restore_events']
+
+    @admin.display(description='Contenido')
+    def archived_content(self, obj):
+        return format_html_join('', '<div>{}: {}</div>', sorted(obj.summary.items()))
+
+    @admin.display(description='Filas archivadas')
+    def archived_data(self, obj):
+        # Las filas se archivan agrupadas por modelo (ver archive._collect)
+        groups = [(model, list(rows)) for model, rows in groupby(archived_rows(obj), key=itemgetter('model'))]
+        return format_html_join('', '<details><summary>{} ({})</summary><pre>{}</pre></details>', (
+            (model, len(rows), json.dumps(rows, indent=2, ensure_ascii=False)) for model, rows in groups
+        ))
+
+    @admin.action(description='Restaurar eventos seleccionados', permissions=['restore'])
+    def restore_events(self, request, queryset):
+        restored = 0
+        for archived in queryset:
+            try:
+                restore_archived_event(archived)
+                restored += 1
+            except ArchiveError as error:
+                self.message_user(request, str(error), messages.ERROR)
+        self.message_user(request, f'{restored} eventos restaurados.', messages.SUCCESS)
+
+    def has_restore_permission(self, request):
+        return request.user.is_superuser
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).defer('payload')
+        try:
+            if request.user.is_superuser:
+                return qs
+            return qs.filter(company=request.user.company.id)
+        except Exception:
+            return qs.none()
+
+admin.site.register(ArchivedEvent, ArchivedEventAdmin)
@@ -0,0 +1,193 @@
+# apps/events/archive.py
+import itertools
+import json
+import zlib
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core import serializers
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.attachments.models import Attachment
+from apps.attendees.models import Attendee, Purchase, Ticket
+from apps.expenses.models import Expense, ExpenseItem
+from apps.inventory.models import InventoryItem
+from utils.signals import muted_receivers
+from .models import ArchivedBlob, ArchivedEvent, Event, EventTicketCategory
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def archivable_events(days, now=None):
+    """Eventos que finalizaron hace más de `days` días."""
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return Event.objects.past(cutoff).order_by('end_time')
+
+
+def _exclusive_attendee_ids(event):
+    # Solo se archivan los asistentes que no tienen boletos en otros eventos,
+    # los demás siguen siendo datos "calientes".
+    attendee_ids = set(Ticket.objects.filter(purchase__event=event).values_list('attendee_id', flat=True))
+    attendee_ids |= set(Attendee.objects.filter(attachment__event=event).values_list('pk', flat=True))
+    shared_ids = set(
+        Ticket.objects.filter(attendee_id__in=attendee_ids)
+        .exclude(purchase__event=event)
+        .values_list('attendee_id', flat=True)
+    )
+    if Attendee.objects.filter(pk__in=shared_ids, attachment__event=event).exists():
+        raise ArchiveError(
+            f'El evento {event.pk} tiene adjuntos usados por asistentes de otros eventos.'
+        )
+    return attendee_ids - shared_ids
+
+
+# Historial de simple_history entre lo recolectado: se borra aparte
+HISTORY = ('event_history', 'inventory_history', 'expense_history', 'expense_item_history')
+
+
+def _collect(event, attendee_ids):
+    """Querysets a archivar por nombre, en orden de dependencias para poder restaurarlos."""
+    item_ids = list(InventoryItem.objects.filter(event=event).values_list('pk', flat=True))
+    expense_ids = list(Expense.objects.filter(event=event).values_list('pk', flat=True))
+    expense_items = Q(expense_id__in=expense_ids) | Q(inventory_item_id__in=item_ids)
+    return {
+        'events': Event.objects.filter(pk=event.pk),
+        'ticket_categories': EventTicketCategory.objects.filter(event=event),
+        'inventory_items': InventoryItem.objects.filter(pk__in=item_ids),
+        'attachments': Attachment.objects.filter(event=event),
+        'attendees': Attendee.objects.filter(pk__in=attendee_ids),
+        'purchases': Purchase.objects.filter(event=event),
+        'tickets': Ticket.objects.filter(purchase__event=event),
+        'expenses': Expense.objects.filter(pk__in=expense_ids),
+        'expense_items': ExpenseItem.objects.filter(expense_items),
+        'event_history': Event.history.model.objects.filter(event_id=event.pk),
+        'inventory_history': InventoryItem.history.model.objects.filter(event_id=event.pk),
+        'expense_history': Expense.history.model.objects.filter(event_id=event.pk),
+        'expense_item_history': ExpenseItem.history.model.objects.filter(expense_items),
+    }
+
+
+def archive_event(event):
+    """Mueve un evento y sus dependencias a ArchivedEvent.
+
+    Debe ejecutarse dentro de una transacción; los receivers de contadores se
+    silencian porque todas las filas afectadas desaparecen juntas.
+    """
+    attendee_ids = _exclusive_attendee_ids(event)
+    querysets = _collect(event, attendee_ids)
+    rows = list(itertools.chain.from_iterable(qs.order_by('pk') for qs in querysets.values()))
+    summary = Counter(row._meta.label_lower for row in rows)
+    data = serializers.serialize('json', rows)
+
+    archived = ArchivedEvent.objects.create(
+        event_id=event.pk,
+        company_id=event.company_id,
+        title=event.title,
+        start_time=event.start_time,
+        end_time=event.end_time,
+        summary=dict(summary),
+        payload=zlib.compress(data.encode('utf-8')),
+    )
+    blobs = {name for row in rows if isinstance(row, Attachment) for name in (row.file.name, row.thumbnail.name) if name}
+    ArchivedBlob.objects.bulk_create(ArchivedBlob(archived_event=archived, name=name) for name in blobs)
+
+    with muted_receivers():
+        querysets['attendees'].delete()
+        querysets['events'].delete()
+        # simple_history deja un registro "-" por cada borrado, se limpia
+        # junto con el historial que ya quedó archivado.
+        for name in HISTORY:
+            querysets[name].delete()
+    return archived
+
+
+def archive_events(queryset, batch_size=50):
+    """Archiva por lotes, una transacción por lote. Devuelve (archivados, omitidos)."""
+    event_ids = list(queryset.values_list('pk', flat=True))
+    archived, skipped = [], []
+    for start in range(0, len(event_ids), batch_size):
+        batch = event_ids[start:start + batch_size]
+        with transaction.atomic():
+            for event in Event.objects.filter(pk__in=batch):
+                try:
+                    with transaction.atomic():
+                        archived.append(archive_event(event))
+                except ArchiveError as error:
+                    skipped.append((event.pk, str(error)))
+    return archived, skipped
+
+
+def archived_objects(archived):
+    data = zlib.decompress(bytes(archived.payload)).decode('utf-8')
+    return serializers.deserialize('json', data)
+
+
+def archived_rows(archived):
+    """Filas archivadas como diccionarios, para consulta de solo lectura."""
+    data = zlib.decompress(bytes(archived.payload)).decode('utf-8')
+    return json.loads(data)
+
+
+def archived_blob_names():
+    """Nombres de los blobs que usan los eventos archivados (tabla indexada, sin descomprimir)."""
+    return set(ArchivedBlob.objects.values_list('name', flat=True).distinct().iterator())
+
+
+def _check_references(archived, objects):
+    """Revisa las claves foráneas de las filas archivadas a filas que no se archivaron.
+
+    Asistentes compartidos, categorías, usuarios y la empresa siguen en las
+    tablas activas y pueden haberse borrado (o fusionado con dedup_attendees)
+    después de archivar. Si el campo es SET_NULL la referencia se deja vacía
+    como lo habría hecho el borrado; si no, se rechaza la restauración con
+    las filas que faltan en vez de fallar con un IntegrityError.
+    """
+    archived_keys = {(obj.object._meta.concrete_model, obj.object.pk) for obj in objects}
+    references = defaultdict(list)
+    for obj in objects:
+        for field in obj.object._meta.concrete_fields:
+            if not field.is_relation or not field.db_constraint:
+                continue
+            value = getattr(obj.object, field.attname)
+            target = field.related_model._meta.concrete_model
+            if value is not None and (target, value) not in archived_keys:
+                references[target, field.target_field.attname, value].append((obj.object, field))
+
+    values = defaultdict(set)
+    for target, attname, value in references:
+        values[target, attname].add(value)
+    missing = []
+    for (target, attname), wanted in values.items():
+        existing = set(target._base_manager.filter(**{f'{attname}__in': wanted}).values_list(attname, flat=True))
+        missing.extend((target, attname, value) for value in wanted - existing)
+
+    errors = set()
+    for target, attname, value in missing:
+        for instance, field in references[target, attname, value]:
+            if field.null and field.remote_field.on_delete is models.SET_NULL:
+                setattr(instance, field.attname, None)
+            else:
+                errors.add(f'{target._meta.verbose_name} {value}')
+    if errors:
+        raise ArchiveError(
+            f'No se puede restaurar el evento {archived.event_id}: ya no existen '
+            f'{", ".join(sorted(errors))}.'
+        )
+
+
+def restore_archived_event(archived):
+    if Event.objects.filter(pk=archived.event_id).exists():
+        raise ArchiveError(f'El evento {archived.event_id} ya existe en las tablas activas.')
+    objects = list(archived_objects(archived))
+    _check_references(archived, objects)
+    with transaction.atomic(), muted_receivers():
+        for obj in objects:
+            if isinstance(obj.object, Event):
+                # los archivos anteriores a Event.duration no la traen y save() en crudo no la calcula
+                obj.object.duration = obj.object.end_time - obj.object.start_time
+            obj.save()
+        archived.delete()
@@ -0,0 +1,164 @@
+# apps/events/availability.py
+"""Disponibilidad de boletos en vivo por server-sent events.
+
+Cada vez que cambia una EventTicketCategory (los signals de boletos
+recalculan tickets_sold) se invalida el espacio de caché del evento
+(utils.cache), lo que incrementa su versión.
+Cada stream revisa esas versiones una vez por intervalo y solo si
+cambiaron lee la disponibilidad y envía las categorías que cambiaron:
+a lo sumo un mensaje por intervalo, aunque se vendan cientos de boletos en
+ese segundo. Cada `resync` segundos se lee igual, para cambios hechos con
+update() (sin signals) o en procesos que no comparten la caché: llegan
+cuando vencen las filas cacheadas (AVAILABILITY_CACHE_SECONDS).
+
+La disponibilidad se lee de la caché bajo la versión del evento: con muchos
+streams abiertos sobre el mismo evento, el primero que ve la versión nueva
+consulta la base y los demás leen su resultado. Entre consultas el stream
+cierra su conexión, así no retiene una conexión de la base durante toda
+su duración.
+
+Los streams solo se ofrecen con el servidor ASGI (AVAILABILITY_STREAMING,
+lo activa asgi.py): con WSGI cada conexión abierta ocuparía un worker.
+"""
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F
+
+from utils import cache as cache_layer
+from .models import EventTicketCategory
+
+# La disponibilidad cacheada se invalida con los signals, pero con una caché
+# en memoria de cada proceso la invalidación no llega a los demás workers:
+# con este vencimiento corto un worker nunca la sirve más vieja que esto
+AVAILABILITY_CACHE_SECONDS = 5
+
+
+def availability_namespace(event_id):
+    """Espacio de caché (tenant GLOBAL) con la disponibilidad del evento."""
+    return f'availability:{event_id}'
+
+
+def version_key(event_id):
+    return cache_layer.version_key(None, availability_namespace(event_id))
+
+
+def bump_availability(event_id):
+    """Marca que la disponibilidad del evento cambió."""
+    cache_layer.invalidate(None, availability_namespace(event_id))
+
+
+async def availability_rows(event_ids):
+    """{(evento, categoría): disponibilidad} de los eventos."""
+    rows = (
+        EventTicketCategory.objects.filter(event_id__in=event_ids)
+        .values('event_id', 'ticket_category_id', 'tickets_available', 'tickets_sold', name=F('ticket_category__name'))
+    )
+    return {
+        (row['event_id'], row['ticket_category_id']): {
+            'event': row['event_id'],
+            'id': row['ticket_category_id'],
+            'name': row['name'],
+            'available': max(row['tickets_available'] - row['tickets_sold'], 0),
+            'sold_out': row['tickets_sold'] >= row['tickets_available'],
+        }
+        async for row in rows
+    }
+
+
+async def cached_availability_rows(event_ids, versions):
+    """availability_rows() a través de la caché, con las filas de cada evento bajo su versión.
+
+    `versions` son las versiones ya leídas ({version_key: versión}); los
+    eventos que no están en la caché se consultan juntos en una consulta.
+    """
+    keys = {}
+    for event_id in event_ids:
+        version = versions.get(version_key(event_id))
+        if version is None:
+            version = await cache_layer.aget_version(None, availability_namespace(event_id))
+        keys[event_id] = cache_layer.make_key(None, availability_namespace(event_id), 'rows', version)
+    found = await cache.aget_many(list(keys.values()))
+
+    rows = {
+        (row['event'], row['id']): row
+        for key in keys.values() if key in found
+        for row in found[key]
+    }
+    missing = [event_id for event_id, key in keys.items() if key not in found]
+    if missing:
+        fresh = await availability_rows(missing)
+        await release_connections()
+        by_event = {event_id: [] for event_id in missing}
+        for row in fresh.values():
+            by_event[row['event']].append(row)
+        await cache.aset_many(
+            {keys[event_id]: event_rows for event_id, event_rows in by_event.items()},
+            timeout=AVAILABILITY_CACHE_SECONDS,
+        )
+        rows.update(fresh)
+    return rows
+
+
+def _release_connections():
+    # Fuera de una transacción: dentro (p. ej. en los tests) cerrar la
+    # conexión la marcaría para rollback
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+# En el mismo hilo que las consultas async del ORM (thread_sensitive)
+release_connections = sync_to_async(_release_connections)
+
+
+def sse_message(data, event=None, message_id=None):
+    lines = []
+    if event:
+        lines.append(f'event: {event}')
+    if message_id is not None:
+        lines.append(f'id: {message_id}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def availability_stream(event_ids, interval=1.0, resync=10.0, heartbeat=15.0, duration=300.0):
+    """Mensajes SSE de varios eventos: la disponibilidad completa al conectar y luego solo los cambios.
+
+    Un solo stream por cliente aunque la página muestre varios eventos: en
+    cada intervalo se leen las versiones de todos con un get_many y solo se
+    consultan los eventos cuya versión cambió. Cada fila lleva su "event".
+    Termina a los `duration` segundos; el navegador (EventSource) se vuelve a
+    conectar solo, lo que reparte las conexiones entre workers con el tiempo.
+    """
+    keys = {event_id: version_key(event_id) for event_id in event_ids}
+    versions = await cache.aget_many(list(keys.values()))
+    current = await cached_availability_rows(event_ids, versions)
+    yield f'retry: {int(interval * 1000)}\n' + sse_message(list(current.values()), 'snapshot')
+
+    started = last_query = last_sent = time.monotonic()
+    while time.monotonic() - started < duration:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        latest = await cache.aget_many(list(keys.values()))
+        if now - last_query >= resync:
+            stale, last_query = list(keys), now
+        else:
+            stale = [event_id for event_id, key in keys.items() if latest.get(key) != versions.get(key)]
+        if not stale:
+            if now - last_sent >= heartbeat:
+                last_sent = now
+                yield ': ping\n\n'
+            continue
+
+        versions = latest
+        rows = await cached_availability_rows(stale, versions)
+        changed = [row for row_key, row in rows.items() if current.get(row_key) != row]
+        current.update(rows)
+        if changed:
+            last_sent = now
+            yield sse_message(changed, 'availability')
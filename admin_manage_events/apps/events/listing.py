@@ -0,0 +1,113 @@
+# apps/events/listing.py
+"""Listado público de próximos eventos (página de inicio) servido desde la caché.
+
+El listado de cada empresa, y el global, se guarda en utils.cache junto con
+la versión del espacio EVENTS con la que se calculó. Mientras esté fresco
+(LISTING_FRESH_SECONDS) se sirve tal cual. Si venció o cambió algún evento
+se sigue sirviendo el anterior y un solo proceso lo recalcula en segundo
+plano (stale-while-revalidate): los picos de tráfico anónimo después de un
+anuncio no llegan a la base. Solo se consulta en el request cuando no hay
+ningún listado guardado.
+
+Los boletos disponibles de cada tarjeta se actualizan en el navegador con
+el stream SSE; el número del listado puede llevar hasta
+LISTING_FRESH_SECONDS de retraso.
+"""
+import hashlib
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from apps.ticket_categories.models import Company
+from utils import cache as cache_layer
+from .models import Event
+
+UPCOMING_EVENTS = 12
+LISTING_FRESH_SECONDS = 30
+# Pasado este tiempo sin requests el listado se descarta y se calcula en el request
+LISTING_KEEP_SECONDS = 24 * 60 * 60
+REFRESH_LOCK_SECONDS = 30
+
+Listing = namedtuple('Listing', 'events last_modified etag')
+
+_executor = None
+
+
+def remaining_tickets():
+    """Expresión de boletos disponibles de un evento (asignados menos vendidos)."""
+    return Coalesce(Sum('eventticketcategory__tickets_available'), 0) - Coalesce(Sum('eventticketcategory__tickets_sold'), 0)
+
+
+def build_listing(company_id=None):
+    """Próximos eventos (de una empresa o de todas). None si la empresa no existe."""
+    if company_id is not None and not Company.objects.filter(pk=company_id).exists():
+        return None
+    events = list(
+        Event.objects.active().for_company(company_id)
+        .annotate(remaining=remaining_tickets())
+        .values('event_id', 'title', 'location', 'start_time', 'updated_at', 'remaining')[:UPCOMING_EVENTS]
+    )
+    last_modified = max((event['updated_at'] for event in events), default=None)
+    # el ETag cambia también con los boletos vendidos, que no tocan updated_at
+    digest = hashlib.sha256(repr((company_id, [sorted(event.items()) for event in events])).encode())
+    return Listing(events, last_modified, f'"{digest.hexdigest()[:32]}"')
+
+
+def _entry_key(company_id):
+    return cache_layer.tenant_key(company_id, cache_layer.EVENTS, 'public-listing')
+
+
+def refresh_listing(company_id=None):
+    """Recalcula y guarda el listado. Devuelve el Listing (o None)."""
+    version = cache_layer.get_version(company_id, cache_layer.EVENTS)
+    listing = build_listing(company_id)
+    if listing is not None:
+        entry = {'listing': listing, 'version': version, 'fresh_until': time.time() + LISTING_FRESH_SECONDS}
+        cache.set(_entry_key(company_id), entry, timeout=LISTING_KEEP_SECONDS)
+    return listing
+
+
+def _refresh(company_id):
+    try:
+        refresh_listing(company_id)
+    finally:
+        cache.delete(_entry_key(company_id) + ':refresh')
+
+
+def _refresh_in_background(company_id):
+    close_old_connections()
+    try:
+        _refresh(company_id)
+    finally:
+        close_old_connections()
+
+
+def _schedule_refresh(company_id):
+    # solo el primer request que encuentra el listado vencido lo recalcula
+    if not cache.add(_entry_key(company_id) + ':refresh', 1, timeout=REFRESH_LOCK_SECONDS):
+        return
+    if not getattr(settings, 'PUBLIC_LISTING_REFRESH_IN_BACKGROUND', True):
+        _refresh(company_id)
+        return
+
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='public-listing')
+    _executor.submit(_refresh_in_background, company_id)
+
+
+def get_listing(company_id=None):
+    """Listado desde la caché; si está vencido se devuelve igual y se recalcula aparte."""
+    entry = cache.get(_entry_key(company_id))
+    if entry is None:
+        return refresh_listing(company_id)
+    stale = entry['fresh_until'] < time.time()
+    if stale or entry['version'] != cache_layer.get_version(company_id, cache_layer.EVENTS):
+        _schedule_refresh(company_id)
+    return entry['listing']
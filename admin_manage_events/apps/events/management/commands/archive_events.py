@@ -0,0 +1,30 @@
+# apps/events/management/commands/archive_events.py
+from django.core.management.base import BaseCommand
+
+from apps.events.archive import archivable_events, archive_events
+
+
+class Command(BaseCommand):
+    help = 'Archiva los eventos finalizados hace más de N días junto con sus compras, boletos, inventario, ventas y adjuntos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Días desde la finalización del evento.')
+        parser.add_argument('--batch-size', type=int, default=50, help='Eventos por transacción.')
+        parser.add_argument('--company', type=int, help='Limitar a una empresa.')
+        parser.add_argument('--dry-run', action='store_true', help='Solo muestra los eventos que se archivarían.')
+
+    def handle(self, *args, **options):
+        queryset = archivable_events(options['days'])
+        if options['company']:
+            queryset = queryset.filter(company_id=options['company'])
+
+        if options['dry_run']:
+            for event in queryset.only('pk', 'title', 'end_time'):
+                self.stdout.write(f'{event.pk}\t{event.end_time:%Y-%m-%d}\t{event.title}')
+            self.stdout.write(f'{queryset.count()} eventos para archivar.')
+            return
+
+        archived, skipped = archive_events(queryset, batch_size=options['batch_size'])
+        for event_id, reason in skipped:
+            self.stderr.write(self.style.WARNING(f'Evento {event_id} omitido: {reason}'))
+        self.stdout.write(self.style.SUCCESS(f'{len(archived)} eventos archivados.'))
@@ -0,0 +1,23 @@
+# apps/events/management/commands/restore_events.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.archive import ArchiveError, restore_archived_event
+from apps.events.models import ArchivedEvent
+
+
+class Command(BaseCommand):
+    help = 'Restaura eventos archivados a las tablas activas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='+', type=int, help='IDs originales de los eventos.')
+
+    def handle(self, *args, **options):
+        for event_id in options['event_ids']:
+            try:
+                archived = ArchivedEvent.objects.get(event_id=event_id)
+                restore_archived_event(archived)
+            except ArchivedEvent.DoesNotExist:
+                raise CommandError(f'No existe un archivo para el evento {event_id}.')
+            except ArchiveError as error:
+                raise CommandError(str(error))
+            self.stdout.write(self.style.SUCCESS(f'Evento {event_id} restaurado.'))
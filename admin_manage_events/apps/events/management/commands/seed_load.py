@@ -0,0 +1,42 @@
+# apps/events/management/commands/seed_load.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.events.seed import LoadSeeder
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos realistas para pruebas de carga (empresas, eventos, compras, boletos, inventario, ventas y adjuntos).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=5, help='Empresas a crear.')
+        parser.add_argument('--users-per-company', type=int, default=3, help='Usuarios staff por empresa.')
+        parser.add_argument('--events-per-company', type=int, default=20, help='Eventos por empresa.')
+        parser.add_argument('--tickets', type=int, default=100000, help='Total de boletos, repartidos entre los eventos.')
+        parser.add_argument('--inventory-per-event', type=int, default=8, help='Items de inventario por evento.')
+        parser.add_argument('--expenses-per-event', type=int, default=20, help='Ventas por evento finalizado.')
+        parser.add_argument('--attachments-per-event', type=int, default=2, help='Adjuntos por evento.')
+        parser.add_argument('--no-history', action='store_true', help='No generar registros de historial.')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador aleatorio.')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Filas por bulk_create.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        seeder = LoadSeeder(
+            companies=options['companies'],
+            users_per_company=options['users_per_company'],
+            events_per_company=options['events_per_company'],
+            tickets=options['tickets'],
+            inventory_per_event=options['inventory_per_event'],
+            expenses_per_event=options['expenses_per_event'],
+            attachments_per_event=options['attachments_per_event'],
+            history=not options['no_history'],
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        counts = seeder.run()
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Datos generados en {time.monotonic() - started:.1f} s.'))
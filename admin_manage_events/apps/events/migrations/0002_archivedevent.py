@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-19 14:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ticket_categories', '0001_initial'),
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.IntegerField(unique=True, verbose_name='ID del Evento')),
+                ('title', models.CharField(max_length=200, verbose_name='Título')),
+                ('start_time', models.DateTimeField(verbose_name='Fecha y Hora de Inicio')),
+                ('end_time', models.DateTimeField(verbose_name='Fecha y Hora de Finalización')),
+                ('summary', models.JSONField(default=dict, verbose_name='Resumen')),
+                ('payload', models.BinaryField(verbose_name='Datos archivados')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archivado el')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='ticket_categories.company', verbose_name='Empresa')),
+            ],
+            options={
+                'verbose_name': 'Evento archivado',
+                'verbose_name_plural': 'Eventos archivados',
+                'ordering': ('-end_time',),
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-19 15:45
+
+import datetime
+from django.db import migrations, models
+
+
+def fill_duration(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    Event.objects.update(duration=models.ExpressionWrapper(
+        models.F('end_time') - models.F('start_time'), output_field=models.DurationField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_time_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='duration',
+            field=models.DurationField(default=datetime.timedelta(0), editable=False, verbose_name='Duración'),
+        ),
+        migrations.AddField(
+            model_name='historicalevent',
+            name='duration',
+            field=models.DurationField(default=datetime.timedelta(0), editable=False, verbose_name='Duración'),
+        ),
+        migrations.RunPython(fill_duration, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['duration'], name='event_duration_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-19 15:57
+
+import json
+import zlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_blobs(apps, schema_editor):
+    ArchivedEvent = apps.get_model('events', 'ArchivedEvent')
+    ArchivedBlob = apps.get_model('events', 'ArchivedBlob')
+    for archived in ArchivedEvent.objects.iterator():
+        rows = json.loads(zlib.decompress(bytes(archived.payload)).decode('utf-8'))
+        names = {
+            name
+            for row in rows if row['model'] == 'attachments.attachment'
+            for name in (row['fields'].get('file'), row['fields'].get('thumbnail')) if name
+        }
+        ArchivedBlob.objects.bulk_create(ArchivedBlob(archived_event=archived, name=name) for name in names)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_duration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=255, verbose_name='Blob')),
+                ('archived_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blobs', to='events.archivedevent', verbose_name='Evento archivado')),
+            ],
+            options={
+                'verbose_name': 'Blob archivado',
+                'verbose_name_plural': 'Blobs archivados',
+                'unique_together': {('archived_event', 'name')},
+            },
+        ),
+        migrations.RunPython(fill_blobs, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,98 @@
 # apps/events/models.py
+from datetime import datetime, timedelta
 from accounts.models import CustomUser
 from django.db import models
+from django.utils import timezone
 from utils.models import TimeStampedModel
 from apps.ticket_categories.models import TicketCategory, Company
 from simple_history.models import HistoricalRecords
 
+TIME_FIELDS = {'start_time', 'end_time'}
+
+
+def _datetime_expression(value):
+    return value if hasattr(value, 'resolve_expression') else models.Value(value, output_field=models.DateTimeField())
+
+
+class EventQuerySet(models.QuerySet):
+    """Consultas por ventana de tiempo, cubiertas por los índices de Event.
+
+    Los filtros son comparaciones directas sobre start_time/end_time (sin
+    funciones ni fechas truncadas) para que la base pueda usar los índices
+    (company, start_time) y (company, end_time).
+
+    "Se cruza con un momento" (end_time > x) no acota el rango del índice de
+    start_time: recorrería todos los eventos pasados. ongoing() y
+    overlapping() agregan start_time >= x - MAX(duration), que no cambia el
+    resultado pero limita el recorrido a una ventana. El máximo se lee en la
+    misma consulta con el índice de duration, así que nunca queda viejo;
+    bulk_create(), update() y bulk_update() mantienen duration como save().
+    """
+
+    def for_company(self, company):
+        """Eventos de la empresa; con None, de todas (superusuarios y páginas públicas)."""
+        return self if company is None else self.filter(company=company)
+
+    def upcoming(self, now=None):
+        """Eventos que todavía no empiezan, del más próximo al más lejano."""
+        return self.filter(start_time__gt=now or timezone.now()).order_by('start_time')
+
+    def ongoing(self, now=None):
+        """Eventos que ya empezaron y todavía no terminan, por hora de inicio."""
+        now = now or timezone.now()
+        return self._started_since(now).filter(start_time__lte=now, end_time__gte=now).order_by('start_time')
+
+    def past(self, now=None):
+        """Eventos finalizados, del más reciente al más antiguo."""
+        return self.filter(end_time__lt=now or timezone.now()).order_by('-end_time')
+
+    def active(self, now=None):
+        """Eventos en curso o próximos (los que no han terminado)."""
+        return self.filter(end_time__gte=now or timezone.now()).order_by('start_time')
+
+    def overlapping(self, start, end):
+        """Eventos que se cruzan con la ventana [start, end) de un calendario.
+
+        Un evento que termina justo cuando empieza la ventana no se incluye.
+        """
+        return self._started_since(start).filter(start_time__lt=end, end_time__gt=start).order_by('start_time')
+
+    def _started_since(self, moment):
+        """start_time >= moment - duración del evento más largo (subconsulta sobre event_duration_idx)."""
+        longest = Event.objects.order_by().values(
+            longest=models.Func('duration', function='MAX', output_field=models.DurationField()),
+        )
+        bound = models.ExpressionWrapper(_datetime_expression(moment) - models.Subquery(longest), output_field=models.DateTimeField())
+        return self.filter(start_time__gte=bound)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for event in objs:
+            event.duration = event.end_time - event.start_time
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if TIME_FIELDS.intersection(fields):
+            objs = list(objs)
+            for event in objs:
+                event.duration = event.end_time - event.start_time
+            fields = [*fields, 'duration']
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if TIME_FIELDS.intersection(kwargs):
+            # en el UPDATE, F('start_time') es el valor anterior a la actualización
+            start = kwargs.get('start_time', models.F('start_time'))
+            end = kwargs.get('end_time', models.F('end_time'))
+            if isinstance(start, datetime) and isinstance(end, datetime):
+                kwargs['duration'] = end - start
+            else:
+                kwargs['duration'] = models.ExpressionWrapper(
+                    _datetime_expression(end) - _datetime_expression(start), output_field=models.DurationField(),
+                )
+        return super().update(**kwargs)
+
+
 class Event(TimeStampedModel):
     event_id = models.AutoField(primary_key=True, verbose_name='ID del Evento')
     company = models.ForeignKey(Company, on_delete=models.CASCADE, verbose_name='Empresa')
@@ -13,6 +101,8 @@ class Event(TimeStampedModel):
     location = models.CharField(max_length=255, verbose_name='Ubicación')
     start_time = models.DateTimeField(verbose_name='Fecha y Hora de Inicio')
     end_time = models.DateTimeField(verbose_name='Fecha y Hora de Finalización')
+    # end_time - start_time; la mantienen save() y EventQuerySet (ver _started_since)
+    duration = models.DurationField(default=timedelta(0), editable=False, verbose_name='Duración')
     is_paid_event = models.BooleanField(default=False, verbose_name='Evento Pagado')
     total_tickets = models.IntegerField(verbose_name='Total de Tickets para el evento', default=0)
     ticket_categories = models.ManyToManyField(TicketCategory, through='EventTicketCategory')
@@ -20,13 +110,30 @@ class Event(TimeStampedModel):
     updated_by = models.ForeignKey(CustomUser, related_name='events_updated', on_delete=models.SET_NULL, null=True)
     history = HistoricalRecords()
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Evento'
         verbose_name_plural = 'Eventos'
+        indexes = [
+            models.Index(fields=['company', 'start_time'], name='event_company_start_idx'),
+            models.Index(fields=['company', 'end_time'], name='event_company_end_idx'),
+            # listado público, calendario global y archivado (sin empresa)
+            models.Index(fields=['start_time'], name='event_start_idx'),
+            models.Index(fields=['end_time'], name='event_end_idx'),
+            models.Index(fields=['duration'], name='event_duration_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, update_fields=None, **kwargs):
+        if self.start_time and self.end_time:
+            self.duration = self.end_time - self.start_time
+        if update_fields is not None and TIME_FIELDS.intersection(update_fields):
+            update_fields = {*update_fields, 'duration'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 class EventTicketCategory(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
     ticket_category = models.ForeignKey(TicketCategory, on_delete=models.CASCADE, verbose_name='Categoría ticket')
@@ -40,3 +147,42 @@ class EventTicketCategory(models.Model):
 
     def __str__(self):
         return f"{self.event.title} - {self.ticket_category.name} ({self.tickets_available} tickets)"
+
+
+# Copia en frío de un evento finalizado y de todas sus dependencias. Las filas
+# originales se eliminan de las tablas "calientes" y quedan aquí serializadas
+# y comprimidas hasta que se restauren.
+class ArchivedEvent(models.Model):
+    event_id = models.IntegerField(unique=True, verbose_name='ID del Evento')
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, verbose_name='Empresa')
+    title = models.CharField(max_length=200, verbose_name='Título')
+    start_time = models.DateTimeField(verbose_name='Fecha y Hora de Inicio')
+    end_time = models.DateTimeField(verbose_name='Fecha y Hora de Finalización')
+    summary = models.JSONField(default=dict, verbose_name='Resumen')
+    payload = models.BinaryField(verbose_name='Datos archivados')
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name='Archivado el')
+
+    class Meta:
+        verbose_name = 'Evento archivado'
+        verbose_name_plural = 'Eventos archivados'
+        ordering = ('-end_time',)
+
+    def __str__(self):
+        return self.title
+
+
+# Blobs de adjuntos (ver apps/attachments/storage.py) que usa cada evento
+# archivado: la limpieza de blobs huérfanos los consulta aquí en vez de
+# descomprimir todos los archivos.
+class ArchivedBlob(models.Model):
+    archived_event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='blobs', verbose_name='Evento archivado')
+    name = models.CharField(max_length=255, db_index=True, verbose_name='Blob')
+
+    class Meta:
+        verbose_name = 'Blob archivado'
+        verbose_name_plural = 'Blobs archivados'
+        unique_together = ('archived_event', 'name')
+
+    def __str__(self):
+        return self.name
+
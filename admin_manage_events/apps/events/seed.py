@@ -0,0 +1,344 @@
+# apps/events/seed.py
+"""Datos sintéticos para pruebas de carga (comando seed_load).
+
+Todo se inserta por bloques y con claves primarias asignadas de antemano,
+así las relaciones se arman sin volver a leer la base de datos. Las tablas
+de volumen (asistentes, compras y boletos) se escriben como tuplas con
+executemany: construir millones de instancias y pasarlas por el compilador
+de bulk_create cuesta más que la propia inserción. El resto usa bulk_create
+(con historial cuando el modelo lo tiene). Nada de esto dispara signals:
+los contadores (tickets_sold, stock del inventario, monto de las ventas) se
+calculan aquí y quedan consistentes.
+"""
+import random
+from collections import Counter
+from itertools import accumulate
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from simple_history.utils import bulk_create_with_history
+
+from apps.attachments.models import Attachment
+from apps.attendees.models import Attendee, Purchase, Ticket
+from apps.expenses.models import Expense, ExpenseItem
+from apps.inventory.models import InventoryItem
+from apps.ticket_categories.models import Company, TicketCategory
+from .models import Event, EventTicketCategory
+
+FIRST_NAMES = [
+    'Ana', 'Andrés', 'Camila', 'Carlos', 'Daniela', 'David', 'Diana', 'Felipe', 'Gabriela', 'Jorge',
+    'Juan', 'Juliana', 'Laura', 'Luis', 'María', 'Mateo', 'Natalia', 'Pablo', 'Paula', 'Santiago',
+    'Sara', 'Sebastián', 'Sofía', 'Valentina', 'Valeria',
+]
+LAST_NAMES = [
+    'Álvarez', 'Castro', 'Díaz', 'Fernández', 'García', 'Gómez', 'González', 'Hernández', 'Jiménez', 'López',
+    'Martínez', 'Moreno', 'Muñoz', 'Ortiz', 'Pérez', 'Ramírez', 'Restrepo', 'Rodríguez', 'Rojas', 'Ruiz',
+    'Sánchez', 'Torres', 'Vargas',
+]
+CITIES = ['Bogotá', 'Medellín', 'Cali', 'Barranquilla', 'Cartagena', 'Bucaramanga', 'Pereira', 'Manizales']
+VENUES = ['Coliseo', 'Teatro Municipal', 'Centro de Convenciones', 'Estadio', 'Parque Central', 'Auditorio']
+EVENT_KINDS = ['Concierto', 'Festival', 'Feria', 'Conferencia', 'Obra de teatro', 'Torneo', 'Seminario']
+# (nombre, precio base, participación en la venta)
+CATEGORIES = [('General', 50000, 0.70), ('Preferencial', 120000, 0.24), ('VIP', 300000, 0.06)]
+INVENTORY = [
+    ('Sillas', 'Decoración', 500, 0), ('Mesas', 'Decoración', 80, 0), ('Cerveza', 'Alimentos', 6000, 9000),
+    ('Agua', 'Alimentos', 1500, 3000), ('Gaseosa', 'Alimentos', 2000, 4000), ('Camiseta', 'Productos', 25000, 45000),
+    ('Gorra', 'Productos', 15000, 30000), ('Parlantes', 'Sonido', 0, 0), ('Micrófonos', 'Sonido', 0, 0),
+    ('Hamburguesa', 'Alimentos', 9000, 18000), ('Afiche', 'Productos', 3000, 8000), ('Luces', 'Decoración', 0, 0),
+]
+DOCUMENT_TYPES = (('DNI', 0.9), ('Pasaporte', 0.05), ('Carné de Extranjería', 0.04), ('Otros', 0.01))
+PURCHASE_SIZES = ((1, 0.55), (2, 0.25), (3, 0.08), (4, 0.08), (5, 0.02), (6, 0.02))
+GENDERS = (('F', 0.49), ('M', 0.49), ('O', 0.02))
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+class LoadSeeder:
+    """Genera un conjunto de datos de tamaño configurable con una semilla fija.
+
+    La misma semilla produce los mismos datos (los IDs parten del máximo
+    existente y las fechas de `reference`). Los boletos se reparten entre
+    eventos con una distribución de Pareto: pocos eventos concentran la
+    mayor parte de la venta, como en producción.
+    """
+
+    def __init__(self, companies=5, users_per_company=3, events_per_company=20, tickets=100000,
+                 inventory_per_event=8, expenses_per_event=20, attachments_per_event=2,
+                 repeat_attendee_rate=0.05, history=True, seed=42, chunk_size=5000, reference=None, log=None):
+        self.companies = companies
+        self.users_per_company = users_per_company
+        self.events_per_company = events_per_company
+        self.tickets = tickets
+        self.inventory_per_event = min(inventory_per_event, len(INVENTORY))
+        self.expenses_per_event = expenses_per_event
+        self.attachments_per_event = attachments_per_event
+        self.repeat_attendee_rate = repeat_attendee_rate
+        self.history = history
+        self.chunk_size = chunk_size
+        self.reference = reference or timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.counts = Counter()
+        self._buffers = {}
+        self._columns = {}
+        self._tables = {}
+        self._ids = {}
+        self._adapt = connection.ops.adapt_datetimefield_value
+        self._now = self._adapt(timezone.now())
+
+    # -- utilidades ---------------------------------------------------------
+
+    def _id(self, model):
+        if model not in self._ids:
+            self._ids[model] = _next_id(model)
+        value = self._ids[model]
+        self._ids[model] += 1
+        return value
+
+    def _choice(self, weighted):
+        # las tablas de pesos se acumulan una sola vez; random.choices las recorre en cada llamada
+        if weighted not in self._tables:
+            self._tables[weighted] = ([value for value, _ in weighted], list(accumulate(weight for _, weight in weighted)))
+        values, cum_weights = self._tables[weighted]
+        return self.random.choices(values, cum_weights=cum_weights)[0]
+
+    def _name(self):
+        return f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)} {self.random.choice(LAST_NAMES)}'
+
+    def _row(self, model, **values):
+        """Agrega una fila cruda; los campos no indicados toman su valor por defecto."""
+        if model not in self._columns:
+            self._columns[model] = {
+                field.attname: self._now if field.attname in ('created_at', 'updated_at') else field.get_default()
+                for field in model._meta.concrete_fields
+            }
+        buffer = self._buffers.setdefault(model, [])
+        # el orden de las claves lo fija el diccionario de valores por defecto
+        buffer.append(tuple({**self._columns[model], **values}.values()))
+        if len(buffer) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        # Orden de dependencias: los padres se insertan antes que los hijos
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in (Attendee, Purchase, Ticket):
+                rows = self._buffers.pop(model, None)
+                if not rows:
+                    continue
+                quote = connection.ops.quote_name
+                columns = ', '.join(quote(field.column) for field in model._meta.concrete_fields)
+                placeholders = ', '.join(['%s'] * len(model._meta.concrete_fields))
+                cursor.executemany(f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})', rows)
+                self.counts[model._meta.verbose_name_plural] += len(rows)
+
+    def _insert(self, model, objs):
+        if not objs:
+            return
+        if self.history and hasattr(model, 'history'):
+            bulk_create_with_history(objs, model, batch_size=self.chunk_size, default_date=timezone.now())
+        else:
+            model.objects.bulk_create(objs, batch_size=self.chunk_size)
+        self.counts[model._meta.verbose_name_plural] += len(objs)
+
+    # -- generación ---------------------------------------------------------
+
+    def run(self):
+        """Genera todos los datos. Devuelve un Counter con las filas creadas por modelo."""
+        password = make_password('seedload123')
+        total_events = self.companies * self.events_per_company
+        weights = [self.random.paretovariate(1.2) for _ in range(total_events)]
+        scale = self.tickets / sum(weights) if weights else 0
+        quotas = [int(weight * scale) for weight in weights]
+        for index in range(self.tickets - sum(quotas)):
+            quotas[index % total_events] += 1
+
+        for company_index in range(self.companies):
+            with transaction.atomic():
+                company = Company(id=self._id(Company), name=f'{self.random.choice(LAST_NAMES)} Eventos {company_index + 1}')
+                self._insert(Company, [company])
+                users = self._users(company, password)
+                categories = self._categories(company)
+            self.log(f'Empresa {company.name}')
+            for event_index in range(self.events_per_company):
+                quota = quotas[company_index * self.events_per_company + event_index]
+                self._event(company, users, categories, quota)
+        self._flush()
+        self._reset_sequences()
+        return self.counts
+
+    def _users(self, company, password):
+        User = get_user_model()
+        users = [
+            User(
+                id=self._id(User), username=f'seed{company.pk}_{index}', email=f'seed{company.pk}_{index}@example.com',
+                password=password, company=company, is_staff=True, first_name=self.random.choice(FIRST_NAMES),
+            )
+            for index in range(self.users_per_company)
+        ]
+        self._insert(User, users)
+        return users
+
+    def _categories(self, company):
+        categories = [
+            TicketCategory(ticket_category_id=self._id(TicketCategory), name=name, price=Decimal(price), company=company)
+            for name, price, _ in CATEGORIES
+        ]
+        self._insert(TicketCategory, categories)
+        return categories
+
+    def _event(self, company, users, categories, quota):
+        start = self.reference + timedelta(days=self.random.randint(-365, 180), hours=self.random.randint(8, 21))
+        end = start + timedelta(hours=self.random.choice([2, 3, 4, 6, 8, 12]))
+        past = end < self.reference
+        creator = self.random.choice(users)
+        # capacidad por encima de la cuota: los eventos grandes casi se agotan, los pequeños no
+        capacity = {
+            category.pk: int(quota * share * self.random.uniform(1.05, 1.4)) + 6
+            for category, (_, _, share) in zip(categories, CATEGORIES)
+        }
+
+        with transaction.atomic():
+            event = Event(
+                event_id=self._id(Event), company=company,
+                title=f'{self.random.choice(EVENT_KINDS)} {self.random.choice(LAST_NAMES)} {start:%Y}',
+                description='Evento generado para pruebas de carga.',
+                location=f'{self.random.choice(VENUES)}, {self.random.choice(CITIES)}',
+                start_time=start, end_time=end, is_paid_event=True, total_tickets=sum(capacity.values()),
+                created_by=creator, updated_by=creator,
+            )
+            self._insert(Event, [event])
+            sold = self._tickets(event, company, categories, capacity, quota, past)
+            self._insert(EventTicketCategory, [
+                EventTicketCategory(
+                    id=self._id(EventTicketCategory), event=event, ticket_category=category,
+                    tickets_available=capacity[category.pk], tickets_sold=sold[category.pk],
+                )
+                for category in categories
+            ])
+            items = self._inventory(event, creator)
+            expenses, lines = self._expenses(event, company, users, items, past)
+            self._insert(InventoryItem, items)
+            self._insert(Expense, expenses)
+            self._insert(ExpenseItem, lines)
+            self._attachments(event, company)
+            self._flush()
+
+    def _tickets(self, event, company, categories, capacity, quota, past):
+        sold = Counter()
+        recent_attendees = []
+        remaining = quota
+        event_id, company_id, start_time = event.pk, company.pk, event.start_time
+        category_shares = tuple((category.pk, share) for category, (_, _, share) in zip(categories, CATEGORIES))
+        while remaining > 0:
+            category_id = self._choice(category_shares)
+            size = min(self._choice(PURCHASE_SIZES), remaining, capacity[category_id] - sold[category_id])
+            if size <= 0:
+                continue
+            buyer = self._name()
+            purchase_id = self._id(Purchase)
+            self._row(
+                Purchase, purchase_id=purchase_id, buyer=buyer, event_id=event_id,
+                ticket_category_id=category_id, company_id=company_id,
+            )
+            for position in range(size):
+                if recent_attendees and self.random.random() < self.repeat_attendee_rate:
+                    attendee_id = self.random.choice(recent_attendees)
+                else:
+                    attendee_id = self._attendee(buyer if position == 0 else self._name())
+                    recent_attendees.append(attendee_id)
+                    if len(recent_attendees) > 1000:
+                        recent_attendees.pop(0)
+                confirmed = past and self.random.random() < 0.85
+                self._row(
+                    Ticket, ticket_id=self._id(Ticket), purchase_id=purchase_id, attendee_id=attendee_id,
+                    ticket_owner=position == 0, ticket_send_by_email=self.random.random() < 0.7,
+                    ticket_confirmed=confirmed,
+                    checked_in_at=self._adapt(start_time + timedelta(minutes=self.random.randint(-60, 90))) if confirmed else None,
+                    checkin_gate=self.random.choice(['Norte', 'Sur', 'Oriente', 'Occidente']) if confirmed else '',
+                )
+            sold[category_id] += size
+            remaining -= size
+        return sold
+
+    def _attendee(self, name):
+        attendee_id = self._id(Attendee)
+        first, last = name.split(' ', 2)[:2]
+        self._row(
+            Attendee, attendee_id=attendee_id, name=name,
+            email=f'{first}.{last}{attendee_id}@example.com'.lower(),
+            document_type=self._choice(DOCUMENT_TYPES),
+            document_number=str(self.random.randrange(10_000_000, 1_999_999_999)),
+            phone_number=f'+573{self.random.randrange(10**8, 10**9)}',
+            gender=self._choice(GENDERS),
+        )
+        return attendee_id
+
+    def _inventory(self, event, creator):
+        items = []
+        for name, category, price, sale_price in self.random.sample(INVENTORY, self.inventory_per_event):
+            stock = self.random.choice([50, 100, 200, 500, 1000])
+            items.append(InventoryItem(
+                id=self._id(InventoryItem), event=event, name=name, category=category,
+                price=price, price_category_sold=sale_price, is_category_sold=sale_price > 0,
+                quantity_available=stock, created_by=creator, updated_by=creator,
+            ))
+        return items
+
+    def _expenses(self, event, company, users, items, past):
+        """Ventas de inventario; descuenta el stock de los items como lo hace el signal de Expense."""
+        sellable = [item for item in items if item.is_category_sold]
+        if not sellable or not past:
+            return [], []
+        expenses, lines = [], []
+        for _ in range(self.expenses_per_event):
+            seller = self.random.choice(users)
+            expense = Expense(
+                expense_id=self._id(Expense), event=event, company=company, name=seller,
+                date=event.start_time.date(), created_by=seller, updated_by=seller,
+            )
+            total = 0
+            for item in self.random.sample(sellable, self.random.randint(1, min(3, len(sellable)))):
+                quantity = min(self.random.randint(1, 5), item.quantity_available)
+                if not quantity:
+                    continue
+                item.quantity_available -= quantity
+                item.quantity_sold += quantity
+                total += item.price_category_sold * quantity
+                lines.append(ExpenseItem(
+                    id=self._id(ExpenseItem), expense=expense, inventory_item=item, quantity=quantity,
+                    created_by=seller, updated_by=seller,
+                ))
+            expense.amount = Decimal(total)
+            expenses.append(expense)
+        return expenses, lines
+
+    def _attachments(self, event, company):
+        attachments = []
+        for index in range(self.attachments_per_event):
+            attachment_id = self._id(Attachment)
+            content = f'%PDF-1.4\n% Recibo {attachment_id} del evento {event.pk}\n%%EOF\n'.encode('ascii')
+            attachments.append(Attachment(
+                attachment_id=attachment_id, event=event, company=company, name=f'Recibo {index + 1} - {event.title}'[:255],
+                file=ContentFile(content, name=f'recibo-{attachment_id}.pdf'),
+            ))
+        self._insert(Attachment, attachments)
+
+    def _reset_sequences(self):
+        # Con IDs explícitos las secuencias de PostgreSQL/Oracle quedan atrás; SQLite no lo necesita
+        User = get_user_model()
+        models = [Company, User, TicketCategory, Event, EventTicketCategory, Purchase, Attendee, Ticket,
+                  InventoryItem, Expense, ExpenseItem, Attachment]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
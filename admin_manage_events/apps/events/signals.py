@@ -2,11 +2,16 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import EventTicketCategory,Event
+from apps.ticket_categories.models import TicketCategory
 from apps.inventory.models import InventoryItem
 from apps.attendees.models import Ticket
+from utils import cache as cache_layer
+from utils.signals import skip_when_muted
+from .availability import bump_availability
 
 
 @receiver(post_save, sender=Event)
+@skip_when_muted
 def update_inventory_on_event_save(sender, instance, **kwargs):
     # Ejemplo de cómo podrías actualizar el inventario cuando se guarda un evento.
     # Ajusta según la lógica de tu negocio.
@@ -17,6 +22,7 @@ def update_inventory_on_event_save(sender, instance, **kwargs):
         inventory_item.save() 
 
 @receiver(post_delete, sender=Event)
+@skip_when_muted
 def update_inventory_on_event_delete(sender, instance, **kwargs):
     # captro los elementos del inventario asociados al evento
     inventory_items = InventoryItem.objects.filter(event=instance)
@@ -29,13 +35,41 @@ def update_inventory_on_event_delete(sender, instance, **kwargs):
     
 
 @receiver(post_save, sender=Ticket)
+@skip_when_muted
 def update_tickets_sold_on_save(sender, instance, **kwargs):
     event_ticket_category = EventTicketCategory.objects.get(event=instance.purchase.event, ticket_category=instance.purchase.ticket_category)
     event_ticket_category.tickets_sold = Ticket.objects.filter(purchase__event=instance.purchase.event, purchase__ticket_category=instance.purchase.ticket_category).count()
     event_ticket_category.save()
 
 @receiver(post_delete, sender=Ticket)
+@skip_when_muted
 def update_tickets_sold_on_delete(sender, instance, **kwargs):
     event_ticket_category = EventTicketCategory.objects.get(event=instance.purchase.event, ticket_category=instance.purchase.ticket_category)
     event_ticket_category.tickets_sold = Ticket.objects.filter(purchase__event=instance.purchase.event, purchase__ticket_category=instance.purchase.ticket_category).count()
     event_ticket_category.save()
+
+
+# Invalidación de caché (utils.cache). Estos receivers no se silencian con
+# muted_receivers: las operaciones masivas también cambian los datos guardados.
+
+@receiver(post_save, sender=EventTicketCategory)
+@receiver(post_delete, sender=EventTicketCategory)
+def invalidate_availability(sender, instance, **kwargs):
+    # también la revisan los streams de disponibilidad (SSE) una vez por segundo
+    bump_availability(instance.event_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_events_cache(sender, instance, **kwargs):
+    cache_layer.invalidate(instance.company_id, cache_layer.EVENTS)
+    bump_availability(instance.pk)
+
+
+@receiver(post_save, sender=TicketCategory)
+@receiver(post_delete, sender=TicketCategory)
+def invalidate_ticket_categories_cache(sender, instance, **kwargs):
+    cache_layer.invalidate(instance.company_id, cache_layer.TICKET_CATEGORIES)
+    # la disponibilidad incluye nombre y precio de la categoría
+    for event_id in EventTicketCategory.objects.filter(ticket_category=instance).values_list('event_id', flat=True):
+        bump_availability(event_id)
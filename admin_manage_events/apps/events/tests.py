@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from django.utils import timezone
@@ -7,6 +7,7 @@ from datetime import date, timedelta
 from apps.events.models import Event, EventTicketCategory
 from apps.ticket_categories.models import TicketCategory, Company
 from apps.attendees.models import Purchase, Attendee, Ticket
+from utils.testing import QueryBudgetMixin
 
 
 class EventModelTests(TestCase):
@@ -556,3 +557,752 @@ class EventPerformanceTests(TestCase):
         
         # Las consultas optimizadas deben ser rápidas
         self.assertLess(query_time, 2.0)
+
+
+@override_settings(SIMPLE_HISTORY_ENABLED=True)
+class EventArchiveTests(TestCase):
+    """Tests del archivado de eventos finalizados"""
+
+    def setUp(self):
+        """Evento finalizado con compras, boletos, inventario y ventas"""
+        from accounts.models import CustomUser
+        from apps.expenses.models import Expense, ExpenseItem
+        from apps.inventory.models import InventoryItem
+
+        self.company = Company.objects.create(name="Archive Company")
+        self.user = CustomUser.objects.create_user(username="archiver", password="pass12345", company=self.company)
+        now = timezone.now()
+        self.old_event = Event.objects.create(
+            company=self.company, title="Evento Pasado", description="Finalizado",
+            location="Sala 1", start_time=now - timedelta(days=61), end_time=now - timedelta(days=60),
+        )
+        self.upcoming_event = Event.objects.create(
+            company=self.company, title="Evento Próximo", description="Pendiente",
+            location="Sala 2", start_time=now + timedelta(days=10), end_time=now + timedelta(days=11),
+        )
+        category = TicketCategory.objects.create(name="General", price=10, company=self.company)
+        EventTicketCategory.objects.create(event=self.old_event, ticket_category=category, tickets_available=10)
+        purchase = Purchase.objects.create(buyer="Comprador", event=self.old_event, ticket_category=category, company=self.company)
+        attendee = Attendee.objects.create(
+            name="Asistente", email="asistente@example.com", document_number="123",
+            phone_number="+573001234567", gender="F",
+        )
+        Ticket.objects.create(purchase=purchase, attendee=attendee, ticket_confirmed=True)
+        item = InventoryItem.objects.create(event=self.old_event, name="Gaseosa", add_stock=20, is_category_sold=True)
+        expense = Expense.objects.create(event=self.old_event, company=self.company, name=self.user, date=now.date())
+        ExpenseItem.objects.create(expense=expense, inventory_item=item, quantity=2)
+
+    def test_archive_moves_finished_event_and_dependents(self):
+        """Test ARC-001: El evento finalizado sale de las tablas activas"""
+        from apps.events.archive import archivable_events, archive_events
+        from apps.events.models import ArchivedEvent
+        from apps.inventory.models import InventoryItem
+
+        archived, skipped = archive_events(archivable_events(days=30))
+
+        self.assertEqual(len(archived), 1)
+        self.assertEqual(skipped, [])
+        self.assertEqual(list(Event.objects.all()), [self.upcoming_event])
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(Attendee.objects.exists())
+        self.assertFalse(InventoryItem.objects.exists())
+        self.assertFalse(Event.history.filter(event_id=self.old_event.pk).exists())
+
+        summary = ArchivedEvent.objects.get(event_id=self.old_event.pk).summary
+        self.assertEqual(summary['attendees.ticket'], 1)
+        self.assertEqual(summary['expenses.expenseitem'], 1)
+
+    def test_restore_archived_event(self):
+        """Test ARC-002: Restaurar un evento archivado recupera sus datos"""
+        from apps.events.archive import archivable_events, archive_events, restore_archived_event
+        from apps.events.models import ArchivedEvent
+        from apps.expenses.models import ExpenseItem
+
+        archive_events(archivable_events(days=30))
+        restore_archived_event(ArchivedEvent.objects.get(event_id=self.old_event.pk))
+
+        self.assertFalse(ArchivedEvent.objects.exists())
+        self.assertTrue(Event.objects.filter(pk=self.old_event.pk).exists())
+        self.assertEqual(Ticket.objects.filter(purchase__event=self.old_event).count(), 1)
+        self.assertEqual(ExpenseItem.objects.filter(expense__event=self.old_event).count(), 1)
+        self.assertEqual(EventTicketCategory.objects.get(event=self.old_event).tickets_sold, 1)
+        self.assertTrue(Event.history.filter(event_id=self.old_event.pk).exists())
+
+    def test_shared_attendee_is_kept(self):
+        """Test ARC-003: Asistentes con boletos en otros eventos no se archivan"""
+        from apps.events.archive import archivable_events, archive_events
+
+        category = TicketCategory.objects.create(name="VIP", price=20, company=self.company)
+        EventTicketCategory.objects.create(event=self.upcoming_event, ticket_category=category, tickets_available=10)
+        purchase = Purchase.objects.create(buyer="Otro", event=self.upcoming_event, ticket_category=category, company=self.company)
+        Ticket.objects.create(purchase=purchase, attendee=Attendee.objects.get())
+
+        archive_events(archivable_events(days=30))
+
+        self.assertEqual(Attendee.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_restore_checks_rows_outside_the_archive(self):
+        """Test ARC-004: Restaurar rechaza referencias a filas activas borradas y vacía las SET_NULL"""
+        from accounts.models import CustomUser
+        from apps.events.archive import ArchiveError, archivable_events, archive_events, restore_archived_event
+        from apps.events.models import ArchivedEvent
+
+        category = TicketCategory.objects.create(name="VIP", price=20, company=self.company)
+        EventTicketCategory.objects.create(event=self.upcoming_event, ticket_category=category, tickets_available=10)
+        purchase = Purchase.objects.create(buyer="Otro", event=self.upcoming_event, ticket_category=category, company=self.company)
+        shared = Attendee.objects.get()
+        shared_id = shared.pk
+        Ticket.objects.create(purchase=purchase, attendee=shared)
+        editor = CustomUser.objects.create_user(username="editor", password="pass12345", company=self.company)
+        Event.objects.filter(pk=self.old_event.pk).update(created_by=editor)
+        archive_events(archivable_events(days=30))
+        archived = ArchivedEvent.objects.get(event_id=self.old_event.pk)
+
+        # el asistente compartido se borra (p. ej. al fusionar duplicados)
+        Ticket.objects.filter(attendee=shared).delete()
+        shared.delete()
+        with self.assertRaisesMessage(ArchiveError, f"Asistente {shared_id}"):
+            restore_archived_event(archived)
+        self.assertFalse(Event.objects.filter(pk=self.old_event.pk).exists())
+        self.assertTrue(ArchivedEvent.objects.filter(pk=archived.pk).exists())
+
+        # un usuario borrado (SET_NULL) no impide restaurar
+        Attendee.objects.create(pk=shared_id, name="Asistente", email="asistente@example.com", document_number="123")
+        editor.delete()
+        restore_archived_event(archived)
+        self.assertIsNone(Event.objects.get(pk=self.old_event.pk).created_by_id)
+
+    def test_admin_shows_archived_rows(self):
+        """Test ARC-005: El admin muestra las filas archivadas de solo lectura"""
+        from accounts.models import CustomUser
+        from apps.events.archive import archivable_events, archive_events
+        from apps.events.models import ArchivedEvent
+
+        archive_events(archivable_events(days=30))
+        archived = ArchivedEvent.objects.get(event_id=self.old_event.pk)
+        admin_user = CustomUser.objects.create_superuser(username="archive_admin", password="pass12345", company=self.company)
+        self.client.force_login(admin_user)
+
+        response = self.client.get(f"/admin/events/archivedevent/{archived.pk}/change/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<summary>attendees.ticket (1)</summary>", html=False)
+        self.assertContains(response, "Gaseosa")
+        self.assertNotContains(response, 'name="_save"')
+
+
+@override_settings(SIMPLE_HISTORY_ENABLED=True)
+class SeedLoadTests(TestCase):
+    """Tests del generador de datos para pruebas de carga"""
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        import shutil
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _seed(self, **options):
+        from apps.events.seed import LoadSeeder
+
+        defaults = dict(companies=2, events_per_company=3, tickets=400, expenses_per_event=3, attachments_per_event=1, chunk_size=50)
+        return LoadSeeder(**{**defaults, **options}).run()
+
+    def test_seed_volumes_and_counters(self):
+        """Test SEED-001: Se generan los volúmenes pedidos con contadores consistentes"""
+        from django.db.models import Count
+        from apps.attachments.models import Attachment
+        from apps.inventory.models import InventoryItem
+
+        self._seed()
+
+        self.assertEqual(Company.objects.count(), 2)
+        self.assertEqual(Event.objects.count(), 6)
+        self.assertEqual(Ticket.objects.count(), 400)
+        self.assertEqual(Attachment.objects.count(), 6)
+        self.assertEqual(Event.history.count(), 6)
+        sold = {
+            (row["purchase__event"], row["purchase__ticket_category"]): row["total"]
+            for row in Ticket.objects.values("purchase__event", "purchase__ticket_category").annotate(total=Count("pk"))
+        }
+        for link in EventTicketCategory.objects.all():
+            self.assertEqual(link.tickets_sold, sold.get((link.event_id, link.ticket_category_id), 0))
+            self.assertLessEqual(link.tickets_sold, link.tickets_available)
+        for item in InventoryItem.objects.all():
+            used = sum(line.quantity for line in item.expenseitem_set.all())
+            self.assertEqual(item.quantity_sold, used)
+
+    def test_seed_is_deterministic(self):
+        """Test SEED-002: La misma semilla genera los mismos datos"""
+        from datetime import datetime
+        from utils.signals import muted_receivers
+
+        reference = timezone.make_aware(datetime(2026, 1, 1))
+        self._seed(seed=7, reference=reference, attachments_per_event=0)
+        first = list(Attendee.objects.order_by("pk").values_list("name", "document_number"))
+        first_events = list(Event.objects.order_by("pk").values_list("title", "start_time"))
+        with muted_receivers():
+            Company.objects.all().delete()
+            Attendee.objects.all().delete()
+
+        self._seed(seed=7, reference=reference, attachments_per_event=0)
+
+        self.assertEqual(list(Attendee.objects.order_by("pk").values_list("name", "document_number")), first)
+        self.assertEqual(list(Event.objects.order_by("pk").values_list("title", "start_time")), first_events)
+
+
+class EventQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Tests de número de consultas del admin de eventos"""
+
+    def setUp(self):
+        """Cinco eventos con categorías e inventario y un superusuario"""
+        from accounts.models import CustomUser
+        from apps.inventory.models import InventoryItem
+
+        self.company = Company.objects.create(name="Budget Events")
+        self.user = CustomUser.objects.create_superuser(
+            username="budget_events", email="budget@example.com", password="pass12345", company=self.company,
+        )
+        category = TicketCategory.objects.create(name="General", price=10, company=self.company)
+        now = timezone.now()
+        for index in range(5):
+            event = Event.objects.create(
+                company=self.company, title=f"Evento {index}", description="Evento", location="Sala",
+                start_time=now + timedelta(days=index), end_time=now + timedelta(days=index, hours=2),
+            )
+            EventTicketCategory.objects.create(event=event, ticket_category=category, tickets_available=100)
+            InventoryItem.objects.create(event=event, name="Sillas", add_stock=50)
+        self.client.force_login(self.user)
+
+    def test_event_changelist_queries(self):
+        """Test QB-010: Listado de eventos dentro del presupuesto de consultas"""
+        with self.assertQueryBudget():
+            response = self.client.get("/admin/events/event/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_event_change_form_queries(self):
+        """Test QB-011: Formulario de evento con categorías e inventario en línea dentro del presupuesto"""
+        event = Event.objects.first()
+        with self.assertQueryBudget():
+            response = self.client.get(f"/admin/events/event/{event.pk}/change/")
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(PUBLIC_LISTING_REFRESH_IN_BACKGROUND=False)
+class EventPublicViewsTests(TestCase):
+    """Tests de las vistas públicas async de eventos"""
+
+    def setUp(self):
+        """Un evento próximo con dos categorías y uno ya finalizado"""
+        from django.core.cache import cache
+
+        cache.clear()
+        self.company = Company.objects.create(name="Public Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Festival", description="Festival", location="Parque",
+            start_time=now + timedelta(days=3), end_time=now + timedelta(days=3, hours=6),
+        )
+        Event.objects.create(
+            company=self.company, title="Evento Pasado", description="Finalizado", location="Sala",
+            start_time=now - timedelta(days=3), end_time=now - timedelta(days=2),
+        )
+        general = TicketCategory.objects.create(name="General", price=20, company=self.company)
+        vip = TicketCategory.objects.create(name="VIP", price=90, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=general, tickets_available=10, tickets_sold=4)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=vip, tickets_available=2, tickets_sold=2)
+
+    def test_index_lists_upcoming_events(self):
+        """Test ASY-001: La página de inicio lista solo eventos próximos con su disponibilidad"""
+        response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event["title"] for event in response.context["events"]], ["Festival"])
+        self.assertContains(response, "6 boletos disponibles")
+
+    def test_availability_by_category(self):
+        """Test ASY-002: La disponibilidad se informa por categoría"""
+        from django.urls import reverse
+
+        response = self.client.get(reverse("events:availability", args=[self.event.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        categories = {category["name"]: category for category in response.json()["categories"]}
+        self.assertEqual(categories["General"]["available"], 6)
+        self.assertTrue(categories["VIP"]["sold_out"])
+        self.assertEqual(self.client.get(reverse("events:availability", args=[999999])).status_code, 404)
+
+    async def test_availability_under_asgi(self):
+        """Test ASY-003: La vista responde por el handler ASGI con consultas async"""
+        from django.test import AsyncClient
+        from django.urls import reverse
+
+        response = await AsyncClient().get(reverse("events:availability", args=[self.event.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["categories"]), 2)
+
+
+class AvailabilityStreamTests(TestCase):
+    """Tests del stream SSE de disponibilidad"""
+
+    def setUp(self):
+        """Un evento con dos categorías y la versión de disponibilidad limpia"""
+        from django.core.cache import cache
+        from apps.events.availability import version_key
+
+        self.company = Company.objects.create(name="Stream Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Concierto", description="Concierto", location="Estadio",
+            start_time=now + timedelta(days=5), end_time=now + timedelta(days=5, hours=4),
+        )
+        self.general = EventTicketCategory.objects.create(
+            event=self.event, ticket_category=TicketCategory.objects.create(name="General", price=20, company=self.company),
+            tickets_available=100, tickets_sold=0,
+        )
+        self.vip = EventTicketCategory.objects.create(
+            event=self.event, ticket_category=TicketCategory.objects.create(name="VIP", price=90, company=self.company),
+            tickets_available=5, tickets_sold=0,
+        )
+        cache.delete(version_key(self.event.pk))
+
+    def sell(self, link, count):
+        """Vende boletos de a uno, ejecutando los callbacks on_commit como en producción"""
+        for _ in range(count):
+            with self.captureOnCommitCallbacks(execute=True):
+                link.tickets_sold += 1
+                link.save()
+
+    @staticmethod
+    def parse(message):
+        import json
+
+        fields = dict(line.split(": ", 1) for line in message.strip().splitlines() if not line.startswith("retry"))
+        return fields["event"], json.loads(fields["data"])
+
+    async def test_snapshot_then_changed_categories(self):
+        """Test SSE-001: Primero la disponibilidad completa y luego solo las categorías que cambiaron"""
+        from asgiref.sync import sync_to_async
+        from apps.events.availability import availability_stream
+
+        stream = availability_stream([self.event.pk], interval=0.01, resync=60)
+        event, data = self.parse(await anext(stream))
+        self.assertEqual(event, "snapshot")
+        self.assertEqual({row["name"]: row["available"] for row in data}, {"General": 100, "VIP": 5})
+
+        await sync_to_async(self.sell)(self.vip, 5)
+        event, data = self.parse(await anext(stream))
+        await stream.aclose()
+
+        # cinco ventas entre dos revisiones llegan en un solo mensaje
+        self.assertEqual(event, "availability")
+        self.assertEqual(data, [{"event": self.event.pk, "id": self.vip.ticket_category_id, "name": "VIP", "available": 0, "sold_out": True}])
+
+    async def test_resync_and_heartbeat(self):
+        """Test SSE-002: Los cambios sin signals llegan en la resincronización y sin cambios se envía un ping"""
+        from asgiref.sync import sync_to_async
+        from django.core.cache import cache
+        from apps.events.availability import availability_stream
+
+        stream = availability_stream([self.event.pk], interval=0.01, resync=0.2, heartbeat=0.02)
+        await anext(stream)
+        await sync_to_async(EventTicketCategory.objects.filter(pk=self.general.pk).update)(tickets_sold=40)
+        # como si vencieran las filas cacheadas (AVAILABILITY_CACHE_SECONDS)
+        await cache.aclear()
+
+        messages = []
+        while not messages or messages[-1] == ": ping\n\n":
+            messages.append(await anext(stream))
+        await stream.aclose()
+
+        self.assertEqual(messages[0], ": ping\n\n")
+        event, data = self.parse(messages[-1])
+        self.assertEqual(event, "availability")
+        self.assertEqual([(row["name"], row["available"]) for row in data], [("General", 60)])
+
+    @override_settings(AVAILABILITY_STREAMING=True)
+    async def test_stream_view(self):
+        """Test SSE-003: La vista responde text/event-stream sin caché y 404 si el evento no existe"""
+        from django.test import AsyncClient
+        from django.urls import reverse
+
+        client = AsyncClient()
+        response = await client.get(reverse("events:availability_stream", args=[self.event.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        content = aiter(response.streaming_content)
+        first = await anext(content)
+        await content.aclose()
+        self.assertIn(b"event: snapshot", first)
+
+        missing = await client.get(reverse("events:availability_stream", args=[999999]))
+        self.assertEqual(missing.status_code, 404)
+        not_allowed = await client.post(reverse("events:availability_stream", args=[self.event.pk]))
+        self.assertEqual(not_allowed.status_code, 405)
+
+    @override_settings(AVAILABILITY_STREAMING=True)
+    async def test_one_stream_for_many_events(self):
+        """Test SSE-004: Un solo stream lleva los cambios de todos los eventos pedidos en ids"""
+        from asgiref.sync import sync_to_async
+        from django.test import AsyncClient
+        from django.urls import reverse
+
+        other = await sync_to_async(Event.objects.create)(
+            company=self.company, title="Obra", description="Obra", location="Teatro",
+            start_time=timezone.now() + timedelta(days=6), end_time=timezone.now() + timedelta(days=6, hours=2),
+        )
+        link = await sync_to_async(EventTicketCategory.objects.create)(
+            event=other, ticket_category=await sync_to_async(TicketCategory.objects.create)(name="Platea", price=30, company=self.company),
+            tickets_available=2, tickets_sold=0,
+        )
+        client = AsyncClient()
+        url = reverse("events:availability_streams")
+        response = await client.get(url, {"ids": f"{self.event.pk},{other.pk},999999"})
+        self.assertEqual(response.status_code, 200)
+        content = aiter(response.streaming_content)
+        event, data = self.parse((await anext(content)).decode())
+        await content.aclose()
+        self.assertEqual(event, "snapshot")
+        self.assertEqual({(row["event"], row["name"]) for row in data}, {(self.event.pk, "General"), (self.event.pk, "VIP"), (other.pk, "Platea")})
+
+        from apps.events.availability import availability_stream
+        stream = availability_stream([self.event.pk, other.pk], interval=0.01, resync=60)
+        await anext(stream)
+        await sync_to_async(self.sell)(link, 2)
+        event, data = self.parse(await anext(stream))
+        await stream.aclose()
+        self.assertEqual([(row["event"], row["sold_out"]) for row in data], [(other.pk, True)])
+
+        self.assertEqual((await client.get(url, {"ids": "1,x"})).status_code, 400)
+        self.assertEqual((await client.get(url)).status_code, 400)
+        self.assertEqual((await client.get(url, {"ids": "999999"})).status_code, 404)
+
+    async def test_streams_share_one_query(self):
+        """Test SSE-006: Varios streams del mismo evento leen la disponibilidad de una sola consulta"""
+        from asgiref.sync import sync_to_async
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from apps.events.availability import availability_stream
+
+        async def count_queries(streams):
+            # el ORM async consulta en el hilo del test: ahí se cuentan
+            context = CaptureQueriesContext(connection)
+            await sync_to_async(context.__enter__)()
+            messages = [self.parse(await anext(stream)) for stream in streams]
+            await sync_to_async(context.__exit__)(None, None, None)
+            return await sync_to_async(len)(context), messages
+
+        streams = [availability_stream([self.event.pk], interval=0.01, resync=60) for _ in range(3)]
+        queries, _ = await count_queries(streams)
+        self.assertEqual(queries, 1)
+
+        await sync_to_async(self.sell)(self.general, 1)
+        queries, messages = await count_queries(streams)
+        for stream in streams:
+            await stream.aclose()
+        self.assertEqual(queries, 1)
+        self.assertEqual({(event, row["available"]) for event, data in messages for row in data}, {("availability", 99)})
+
+    async def test_streams_only_with_asgi(self):
+        """Test SSE-005: Sin AVAILABILITY_STREAMING (WSGI) no se abren streams ni la página los pide"""
+        from django.test import AsyncClient
+        from django.urls import reverse
+
+        client = AsyncClient()
+        response = await client.get(reverse("events:availability_streams"), {"ids": str(self.event.pk)})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual((await client.get(reverse("events:availability_stream", args=[self.event.pk]))).status_code, 503)
+        page = await client.get(reverse("home"))
+        self.assertNotIn(b"EventSource", page.content)
+        with override_settings(AVAILABILITY_STREAMING=True):
+            page = await client.get(reverse("home"))
+        self.assertIn(b"EventSource", page.content)
+
+
+class TenantCacheTests(TestCase):
+    """Tests de la caché por empresa y su invalidación"""
+
+    def setUp(self):
+        """Dos empresas, un evento con una categoría y la caché vacía"""
+        from django.core.cache import cache
+
+        cache.clear()
+        self.company = Company.objects.create(name="Cache Company")
+        self.other = Company.objects.create(name="Other Cache Company")
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Obra", description="Obra", location="Teatro",
+            start_time=now + timedelta(days=2), end_time=now + timedelta(days=2, hours=2),
+        )
+        self.category = TicketCategory.objects.create(name="Platea", price=30, company=self.company)
+        EventTicketCategory.objects.create(event=self.event, ticket_category=self.category, tickets_available=50, tickets_sold=0)
+
+    def test_invalidation_is_per_company(self):
+        """Test CACHE-001: Invalidar una empresa no afecta a otra e invalida también GLOBAL"""
+        from utils import cache as cache_layer
+
+        values = iter(range(100))
+        self.assertEqual(cache_layer.cached(self.company, "reports", "total", lambda: next(values)), 0)
+        self.assertEqual(cache_layer.cached(self.other, "reports", "total", lambda: next(values)), 1)
+        self.assertEqual(cache_layer.cached(None, "reports", "total", lambda: next(values)), 2)
+        self.assertEqual(cache_layer.cached(self.company, "reports", "total", lambda: next(values)), 0)
+
+        cache_layer.invalidate(self.company.pk, "reports")
+
+        self.assertEqual(cache_layer.cached(self.company, "reports", "total", lambda: next(values)), 3)
+        self.assertEqual(cache_layer.cached(self.other, "reports", "total", lambda: next(values)), 1)
+        self.assertEqual(cache_layer.cached(None, "reports", "total", lambda: next(values)), 4)
+
+    def test_model_changes_invalidate_namespaces(self):
+        """Test CACHE-002: Los signals de eventos y categorías invalidan sus espacios de caché"""
+        from utils import cache as cache_layer
+
+        events = cache_layer.get_version(self.company, cache_layer.EVENTS)
+        categories = cache_layer.get_version(self.company, cache_layer.TICKET_CATEGORIES)
+        other = cache_layer.get_version(self.other, cache_layer.EVENTS)
+
+        self.event.title = "Obra (función extra)"
+        self.event.save()
+        self.category.save()
+
+        self.assertGreater(cache_layer.get_version(self.company, cache_layer.EVENTS), events)
+        self.assertGreater(cache_layer.get_version(self.company, cache_layer.TICKET_CATEGORIES), categories)
+        self.assertEqual(cache_layer.get_version(self.other, cache_layer.EVENTS), other)
+
+    def test_availability_reads_through_cache(self):
+        """Test CACHE-003: La disponibilidad se sirve de la caché hasta que cambian categorías o ventas"""
+        from django.urls import reverse
+
+        url = reverse("events:availability", args=[self.event.pk])
+        self.assertEqual(self.client.get(url).json()["categories"][0]["price"], "30.00")
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        self.category.price = 35
+        self.category.save()
+        self.assertEqual(self.client.get(url).json()["categories"][0]["price"], "35.00")
+
+        link = EventTicketCategory.objects.get(event=self.event)
+        link.tickets_sold = 50
+        link.save()
+        self.assertTrue(self.client.get(url).json()["categories"][0]["sold_out"])
+
+    def test_availability_expires_without_invalidation(self):
+        """Test CACHE-006: Sin invalidación (otro worker con su propia caché) la disponibilidad vence en segundos"""
+        from unittest import mock
+        from django.core.cache import cache
+        from django.urls import reverse
+        from apps.events import views
+
+        url = reverse("events:availability", args=[self.event.pk])
+        with mock.patch("utils.cache.cache", wraps=cache) as wrapped:
+            self.client.get(url)
+        (key, data), options = wrapped.aset.call_args
+        self.assertIn("categories", key)
+        self.assertEqual(options["timeout"], views.AVAILABILITY_CACHE_SECONDS)
+        self.assertLessEqual(views.AVAILABILITY_CACHE_SECONDS, 10)
+
+    def test_launcher_requires_shared_cache_for_workers(self):
+        """Test CACHE-007: El launcher no arranca varios workers con la caché en memoria de cada proceso"""
+        from admin_manage_events import launcher
+
+        locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379/0"}}
+        with self.settings(CACHES=locmem):
+            self.assertIn("CACHE_URL", launcher.local_cache_error(launcher.parse_args(["--workers", "4"])))
+            self.assertIsNone(launcher.local_cache_error(launcher.parse_args(["--workers", "1"])))
+            self.assertIsNone(launcher.local_cache_error(launcher.parse_args(["--workers", "4", "--local-cache"])))
+        with self.settings(CACHES=redis):
+            self.assertIsNone(launcher.local_cache_error(launcher.parse_args(["--workers", "4"])))
+
+
+@override_settings(PUBLIC_LISTING_REFRESH_IN_BACKGROUND=False)
+class PublicListingCacheTests(TestCase):
+    """Tests del listado público de eventos en caché"""
+
+    def setUp(self):
+        """Dos empresas con un evento próximo cada una y la caché vacía"""
+        from django.core.cache import cache
+
+        cache.clear()
+        now = timezone.now()
+        self.company = Company.objects.create(name="Listing Company")
+        self.other = Company.objects.create(name="Other Listing Company")
+        self.event = Event.objects.create(
+            company=self.company, title="Lanzamiento", description="Lanzamiento", location="Auditorio",
+            start_time=now + timedelta(days=1), end_time=now + timedelta(days=1, hours=3),
+        )
+        Event.objects.create(
+            company=self.other, title="Feria Ajena", description="Feria", location="Plaza",
+            start_time=now + timedelta(days=2), end_time=now + timedelta(days=2, hours=3),
+        )
+
+    def test_cached_listing_skips_database(self):
+        """Test LIST-001: Con el listado en caché un request anónimo no consulta la base"""
+        first = self.client.get("/")
+        self.assertContains(first, "Lanzamiento")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/")
+
+        self.assertContains(response, "Feria Ajena")
+        self.assertEqual(response["ETag"], first["ETag"])
+        self.assertIn("Last-Modified", response)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("stale-while-revalidate=", response["Cache-Control"])
+
+    def test_conditional_requests(self):
+        """Test LIST-002: El ETag y Last-Modified del listado permiten responder 304"""
+        first = self.client.get("/")
+
+        with self.assertNumQueries(0):
+            by_etag = self.client.get("/", HTTP_IF_NONE_MATCH=first["ETag"])
+        by_date = self.client.get("/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+
+        self.assertEqual(by_etag.status_code, 304)
+        self.assertEqual(by_etag["ETag"], first["ETag"])
+        self.assertEqual(by_date.status_code, 304)
+
+    def test_stale_while_revalidate(self):
+        """Test LIST-003: Al cambiar un evento se sirve el listado anterior una vez mientras se recalcula"""
+        first = self.client.get("/")
+        self.event.title = "Lanzamiento Reprogramado"
+        self.event.save()
+
+        stale = self.client.get("/")
+        fresh = self.client.get("/")
+
+        self.assertEqual(stale["ETag"], first["ETag"])
+        self.assertNotContains(stale, "Reprogramado")
+        self.assertContains(fresh, "Lanzamiento Reprogramado")
+        self.assertNotEqual(fresh["ETag"], first["ETag"])
+
+    def test_company_listing(self):
+        """Test LIST-004: El listado por empresa muestra solo sus eventos y 404 si no existe"""
+        from django.urls import reverse
+
+        response = self.client.get(reverse("events:company_index", args=[self.company.pk]))
+
+        self.assertEqual([event["title"] for event in response.context["events"]], ["Lanzamiento"])
+        self.assertNotEqual(response["ETag"], self.client.get("/")["ETag"])
+        self.assertEqual(self.client.get(reverse("events:company_index", args=[999999])).status_code, 404)
+
+
+class EventTimeWindowTests(TestCase):
+    """Tests de las consultas por ventana de tiempo y la API de calendario"""
+
+    def setUp(self):
+        """Eventos pasados, en curso y próximos de dos empresas"""
+        from django.core.cache import cache
+
+        cache.clear()
+        self.now = timezone.now().replace(microsecond=0)
+        self.company = Company.objects.create(name="Window Company")
+        self.other = Company.objects.create(name="Other Window Company")
+
+        def create(title, start_days, hours, company=None):
+            start = self.now + timedelta(days=start_days)
+            return Event.objects.create(
+                company=company or self.company, title=title, description=title, location="Sala",
+                start_time=start, end_time=start + timedelta(hours=hours),
+            )
+
+        self.past = create("Pasado", -10, 5)
+        self.festival = create("Festival Largo", -20, 24 * 25)
+        self.ongoing = create("En Curso", 0, 2)
+        self.upcoming = create("Próximo", 3, 4)
+        self.later = create("Más Adelante", 40, 4)
+        self.foreign = create("Ajeno", 3, 4, company=self.other)
+
+    def titles(self, queryset):
+        return [event.title for event in queryset]
+
+    def test_upcoming_ongoing_past(self):
+        """Test WIN-001: Próximos, en curso y pasados por empresa, en el orden esperado"""
+        events = Event.objects.for_company(self.company)
+
+        self.assertEqual(self.titles(events.upcoming(self.now + timedelta(minutes=1))), ["Próximo", "Más Adelante"])
+        self.assertEqual(self.titles(events.ongoing(self.now + timedelta(minutes=1))), ["Festival Largo", "En Curso"])
+        self.assertEqual(self.titles(events.past(self.now)), ["Pasado"])
+        self.assertEqual(self.titles(events.active(self.now)), ["Festival Largo", "En Curso", "Próximo", "Más Adelante"])
+        self.assertEqual(Event.objects.for_company(None).upcoming(self.now + timedelta(minutes=1)).count(), 3)
+
+    def test_overlapping_window(self):
+        """Test WIN-002: La ventana del calendario incluye los eventos que la cruzan, también los largos"""
+        window = Event.objects.for_company(self.company).overlapping(self.now + timedelta(days=1), self.now + timedelta(days=7))
+        self.assertEqual(self.titles(window), ["Festival Largo", "Próximo"])
+
+        # un evento que termina justo al empezar la ventana queda fuera
+        touching = Event.objects.overlapping(self.upcoming.end_time, self.upcoming.end_time + timedelta(hours=1))
+        self.assertNotIn("Próximo", self.titles(touching))
+
+    def test_queries_use_time_indexes(self):
+        """Test WIN-003: Las consultas por ventana usan los índices de empresa y fecha"""
+        from django.db import connection
+
+        if connection.vendor != "sqlite":
+            self.skipTest("El plan se revisa con EXPLAIN QUERY PLAN de SQLite")
+        events = Event.objects.for_company(self.company)
+
+        self.assertIn("event_company_start_idx", events.upcoming(self.now).explain())
+        self.assertIn("event_company_start_idx", events.ongoing(self.now).explain())
+        self.assertIn("event_company_start_idx", events.overlapping(self.now, self.now + timedelta(days=7)).explain())
+        self.assertIn("event_duration_idx", events.overlapping(self.now, self.now + timedelta(days=7)).explain())
+        self.assertIn("event_company_end_idx", events.past(self.now).explain())
+
+    def test_calendar_api(self):
+        """Test WIN-004: La API de calendario devuelve los eventos de la ventana y valida los parámetros"""
+        from django.urls import reverse
+
+        url = reverse("events:calendar")
+        start = (self.now + timedelta(days=1)).date().isoformat()
+        end = (self.now + timedelta(days=7)).date().isoformat()
+
+        response = self.client.get(url, {"start": start, "end": end, "company": self.company.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event["title"] for event in response.json()["events"]], ["Festival Largo", "Próximo"])
+
+        everyone = self.client.get(url, {"start": start, "end": end}).json()["events"]
+        self.assertIn("Ajeno", [event["title"] for event in everyone])
+
+        self.assertEqual(self.client.get(url, {"start": "mañana", "end": end}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"start": end, "end": start}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"start": "2020-01-01", "end": "2024-01-01"}).status_code, 400)
+
+    def test_long_events_created_in_bulk(self):
+        """Test WIN-005: Los eventos largos creados con bulk_create o alargados con update() aparecen en curso y en el calendario"""
+        from django.db.models import F
+
+        events = Event.objects.for_company(self.company)
+        self.assertEqual(self.titles(events.ongoing(self.now)), ["Festival Largo", "En Curso"])
+
+        Event.objects.bulk_create([Event(
+            company=self.company, title="Temporada", description="Temporada", location="Sala",
+            start_time=self.now - timedelta(days=50), end_time=self.now + timedelta(days=10),
+        )])
+        Event.objects.filter(pk=self.past.pk).update(start_time=self.now - timedelta(days=90), end_time=self.now + timedelta(days=3))
+        Event.objects.filter(pk=self.upcoming.pk).update(start_time=F("start_time") - timedelta(days=100))
+        self.later.start_time -= timedelta(days=160)
+        Event.objects.bulk_update([self.later], ["start_time"])
+
+        self.assertEqual(
+            self.titles(events.ongoing(self.now)),
+            ["Más Adelante", "Próximo", "Pasado", "Temporada", "Festival Largo", "En Curso"],
+        )
+        window = events.overlapping(self.now + timedelta(days=1), self.now + timedelta(days=2))
+        self.assertEqual(self.titles(window), ["Más Adelante", "Próximo", "Pasado", "Temporada", "Festival Largo"])
+        self.assertEqual(Event.objects.get(pk=self.upcoming.pk).duration, timedelta(days=100, hours=4))
+
+        self.ongoing.end_time += timedelta(days=1)
+        self.ongoing.save(update_fields=["end_time"])
+        self.assertEqual(Event.objects.get(pk=self.ongoing.pk).duration, timedelta(days=1, hours=2))
@@ -0,0 +1,13 @@
+# apps/events/urls.py
+from django.urls import path
+from . import views
+
+app_name = 'events'
+
+urlpatterns = [
+    path('company/<int:company_id>/', views.index, name='company_index'),
+    path('calendar/', views.calendar, name='calendar'),
+    path('availability/stream/', views.availability_streams, name='availability_streams'),
+    path('<int:event_id>/availability/', views.availability, name='availability'),
+    path('<int:event_id>/availability/stream/', views.availability_events, name='availability_stream'),
+]
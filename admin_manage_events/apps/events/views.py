@@ -1,3 +1,203 @@
+# apps/events/views.py
+from datetime import datetime, time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F
+from django.http import Http404, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date
+
+from utils import cache as cache_layer
+from .availability import AVAILABILITY_CACHE_SECONDS, availability_namespace, availability_stream
+from .listing import LISTING_KEEP_SECONDS, UPCOMING_EVENTS, get_listing
+from .models import Event, EventTicketCategory
+
+# Los navegadores y un CDN pueden reutilizar la página este tiempo y servirla
+# vencida mientras la revalidan (con ETag casi siempre responde 304)
+INDEX_MAX_AGE = 30
+INDEX_STALE_WHILE_REVALIDATE = 300
+
+# Eventos por stream de disponibilidad: los de una página de listado, con margen
+STREAM_MAX_EVENTS = 4 * UPCOMING_EVENTS
+
+CALENDAR_MAX_WINDOW = timedelta(days=366)
+CALENDAR_MAX_EVENTS = 500
+
+
+async def index(request, company_id=None):
+    """Página pública con los próximos eventos (de todas las empresas o de una).
+
+    Las vistas de solo lectura son async: con un servidor ASGI un solo
+    proceso atiende muchas consultas concurrentes durante una apertura de
+    ventas sin ocupar un hilo por conexión. El listado sale de la caché
+    (ver listing.py) y el HTML de las tarjetas se guarda como fragmento, así
+    que un request anónimo no consulta la base.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    listing = await sync_to_async(get_listing)(company_id)
+    if listing is None:
+        raise Http404('Empresa no encontrada.')
+    # HTTP-date tiene resolución de segundos
+    last_modified = listing.last_modified and int(listing.last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=listing.etag, last_modified=last_modified)
+    if response is None:
+        response = render(request, 'index.html', {
+            'events': listing.events,
+            'listing_etag': listing.etag,
+            'company_id': company_id,
+            'fragment_seconds': LISTING_KEEP_SECONDS,
+            'streaming': settings.AVAILABILITY_STREAMING,
+        })
+    response['ETag'] = listing.etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=INDEX_MAX_AGE, stale_while_revalidate=INDEX_STALE_WHILE_REVALIDATE)
+    return response
+
+
+async def availability(request, event_id):
+    """Boletos disponibles por categoría de un evento.
+
+    Se lee de la caché mientras no cambie la disponibilidad del evento y
+    como mucho AVAILABILITY_CACHE_SECONDS.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    data = await cache_layer.acached(
+        None, availability_namespace(event_id), 'categories', lambda: availability_data(event_id),
+        timeout=AVAILABILITY_CACHE_SECONDS,
+    )
+    if data is None:
+        return JsonResponse({'error': 'Evento no encontrado.'}, status=404)
+    return JsonResponse(data)
+
+
+async def availability_data(event_id):
+    """Respuesta de availability(), o None si el evento no existe."""
+    categories = (
+        EventTicketCategory.objects.filter(event_id=event_id)
+        .order_by('ticket_category__name')
+        .values('ticket_category_id', 'tickets_available', 'tickets_sold', name=F('ticket_category__name'), price=F('ticket_category__price'))
+    )
+    rows = [row async for row in categories]
+    if not rows and not await Event.objects.filter(pk=event_id).aexists():
+        return None
+    return {
+        'event': event_id,
+        'categories': [
+            {
+                'id': row['ticket_category_id'],
+                'name': row['name'],
+                'price': row['price'],
+                'available': max(row['tickets_available'] - row['tickets_sold'], 0),
+                'sold_out': row['tickets_sold'] >= row['tickets_available'],
+            }
+            for row in rows
+        ],
+    }
+
+
+def _parse_calendar_bound(value):
+    """Fecha (YYYY-MM-DD) o fecha y hora ISO 8601; None si no es válida."""
+    try:
+        parsed = parse_datetime(value) or parse_date(value)
+    except ValueError:
+        return None
+    if parsed is None:
+        return None
+    if not isinstance(parsed, datetime):
+        parsed = datetime.combine(parsed, time.min)
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+async def calendar(request):
+    """Eventos que se cruzan con la ventana ?start=&end= (opcionalmente &company=).
+
+    Usa Event.objects.overlapping(), que filtra con comparaciones directas
+    sobre los índices de start_time y end_time.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    start = _parse_calendar_bound(request.GET.get('start', ''))
+    end = _parse_calendar_bound(request.GET.get('end', ''))
+    if start is None or end is None:
+        return JsonResponse({'error': 'Los parámetros start y end deben ser fechas ISO 8601.'}, status=400)
+    if not start < end <= start + CALENDAR_MAX_WINDOW:
+        return JsonResponse({'error': f'La ventana debe terminar después de empezar y durar como máximo {CALENDAR_MAX_WINDOW.days} días.'}, status=400)
+    company = request.GET.get('company') or None
+    if company is not None and not company.isdigit():
+        return JsonResponse({'error': 'El parámetro company debe ser un número.'}, status=400)
+
+    events = [
+        event async for event in Event.objects.overlapping(start, end).for_company(company)
+        .values('event_id', 'company_id', 'title', 'location', 'start_time', 'end_time')[:CALENDAR_MAX_EVENTS]
+    ]
+    return JsonResponse({
+        'start': start,
+        'end': end,
+        'events': [
+            {
+                'id': event['event_id'],
+                'company': event['company_id'],
+                'title': event['title'],
+                'location': event['location'],
+                'start': event['start_time'],
+                'end': event['end_time'],
+            }
+            for event in events
+        ],
+    })
+
+
+def _event_stream_response(event_ids):
+    response = StreamingHttpResponse(availability_stream(event_ids), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx no debe acumular el stream en su buffer
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _streaming_unavailable():
+    # EventSource no reintenta ante un error HTTP: un cliente con WSGI no queda ocupando workers
+    return JsonResponse({'error': 'La disponibilidad en vivo requiere el servidor ASGI.'}, status=503)
+
+
+async def availability_events(request, event_id):
+    """Stream SSE con los cambios de disponibilidad de un evento (ver availability_streams)."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not settings.AVAILABILITY_STREAMING:
+        return _streaming_unavailable()
+    if not await Event.objects.filter(pk=event_id).aexists():
+        return JsonResponse({'error': 'Evento no encontrado.'}, status=404)
+    return _event_stream_response([event_id])
+
+
+async def availability_streams(request):
+    """Un solo stream SSE con los cambios de disponibilidad de los eventos de ?ids=1,2,3.
 
-# Create your views here.
+    Reemplaza el refresco periódico de páginas: cada cliente mantiene una
+    conexión para todos los eventos que ve (los navegadores abren unas 6
+    conexiones HTTP/1.1 por host) y recibe a lo sumo un mensaje por segundo.
+    Solo con ASGI (AVAILABILITY_STREAMING); con WSGI responde 503.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not settings.AVAILABILITY_STREAMING:
+        return _streaming_unavailable()
+    try:
+        ids = sorted({int(value) for value in request.GET.get('ids', '').split(',') if value.strip()})
+    except ValueError:
+        return JsonResponse({'error': 'ids debe ser una lista de números separados por comas.'}, status=400)
+    if not ids or len(ids) > STREAM_MAX_EVENTS:
+        return JsonResponse({'error': f'Indique entre 1 y {STREAM_MAX_EVENTS} eventos en ids.'}, status=400)
+    event_ids = [event_id async for event_id in Event.objects.filter(pk__in=ids).order_by('pk').values_list('pk', flat=True)]
+    if not event_ids:
+        return JsonResponse({'error': 'Evento no encontrado.'}, status=404)
+    return _event_stream_response(event_ids)
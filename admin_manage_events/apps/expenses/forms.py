@@ -4,6 +4,7 @@ from .models import ExpenseItem, InventoryItem,Expense
 from apps.events.models import Event
 from accounts.models import CustomUser
 from django.core.exceptions import ValidationError
+from utils import cache as cache_layer
 
 class ExpenseItemForm(forms.ModelForm):
     price = forms.DecimalField(max_digits=10, decimal_places=2, required=False, label='Precio de Venta')
@@ -19,13 +20,18 @@ class ExpenseItemForm(forms.ModelForm):
 
         self.fields['price'].widget.attrs['readonly'] = True
 
-        inventory_items = InventoryItem.objects.filter(event__company=self.user.company.id, is_category_sold=True)
+        # Se arma una vez por formulario del formset; se guarda en la caché de la empresa
+        # hasta que cambie algún item de inventario (ver apps/inventory/signals.py)
+        inventory_items = cache_layer.cached(self.user.company_id, cache_layer.INVENTORY, 'sold_items', lambda: list(
+            InventoryItem.objects.filter(event__company=self.user.company.id, is_category_sold=True)
+            .values_list('pk', 'name', 'price_category_sold', 'quantity_available')
+        ))
         choices = [('', '---------')]  # Añade esta línea para incluir un valor vacío por defecto
-        choices += [(item.pk, f"{item.name} -- ${item.price_category_sold} (stock {item.quantity_available})") for item in inventory_items]
+        choices += [(pk, f"{name} -- ${price} (stock {quantity})") for pk, name, price, quantity in inventory_items]
         self.fields['inventory_item'].choices = choices
 
-        for item in inventory_items:
-            self.fields['inventory_item'].widget.attrs[f'data-price-{item.pk}'] = str(item.price_category_sold)
+        for pk, name, price, quantity in inventory_items:
+            self.fields['inventory_item'].widget.attrs[f'data-price-{pk}'] = str(price)
 
     def clean_quantity(self):
         reduce_quantity = False
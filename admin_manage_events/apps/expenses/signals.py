@@ -3,8 +3,10 @@ from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from .models import Expense, ExpenseItem
 from apps.inventory.models import InventoryItem
+from utils.signals import skip_when_muted
 
 @receiver(post_save, sender=Expense)
+@skip_when_muted
 def update_inventory_on_expense_save(sender, instance, created, **kwargs):
     if created:
         for expense_item in ExpenseItem.objects.filter(expense=instance):
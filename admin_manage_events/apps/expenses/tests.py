@@ -1,3 +1,112 @@
 from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
 
-# Create your tests here.
+from accounts.models import CustomUser
+from apps.events.models import Event
+from apps.expenses.models import Expense, ExpenseItem
+from apps.inventory.models import InventoryItem
+from apps.ticket_categories.models import Company
+from utils.testing import QueryBudgetMixin
+
+
+class ExpenseQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Tests de número de consultas del admin de ventas e inventario"""
+
+    def setUp(self):
+        """Evento con inventario a la venta, ventas registradas y un superusuario"""
+        self.company = Company.objects.create(name="Budget Sales")
+        self.user = CustomUser.objects.create_superuser(
+            username="budget_sales", email="budget@example.com", password="pass12345", company=self.company,
+        )
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Feria", description="Feria", location="Plaza",
+            start_time=now, end_time=now + timedelta(hours=6),
+        )
+        self.items = [
+            InventoryItem.objects.create(
+                event=self.event, name=name, add_stock=100, is_category_sold=True, price=1000, price_category_sold=2000,
+            )
+            for name in ("Agua", "Gaseosa", "Cerveza", "Camiseta")
+        ]
+        for index in range(5):
+            expense = Expense.objects.create(event=self.event, company=self.company, name=self.user, date=now.date())
+            ExpenseItem.objects.create(expense=expense, inventory_item=self.items[index % 4], quantity=1)
+        self.client.force_login(self.user)
+
+    def test_expense_changelist_queries(self):
+        """Test QB-020: Listado de ventas dentro del presupuesto de consultas"""
+        with self.assertQueryBudget():
+            response = self.client.get("/admin/expenses/expense/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_expense_save_formset_queries(self):
+        """Test QB-021: Registrar una venta con dos items dentro del presupuesto de consultas"""
+        data = {
+            "event": self.event.pk,
+            "name": self.user.pk,
+            "date": timezone.now().date().isoformat(),
+            "description": "Venta",
+            "amount": "0",
+            "expense_items-TOTAL_FORMS": "2",
+            "expense_items-INITIAL_FORMS": "0",
+            "expense_items-MIN_NUM_FORMS": "0",
+            "expense_items-MAX_NUM_FORMS": "1000",
+        }
+        for index, item in enumerate(self.items[:2]):
+            data[f"expense_items-{index}-inventory_item"] = item.pk
+            data[f"expense_items-{index}-quantity"] = "2"
+            data[f"expense_items-{index}-price"] = "2000"
+
+        with self.assertQueryBudget():
+            response = self.client.post("/admin/expenses/expense/add/", data)
+
+        self.assertEqual(response.status_code, 302)
+        self.items[0].refresh_from_db()
+        self.assertEqual(self.items[0].quantity_sold, 2)
+
+    def test_inventory_changelist_queries(self):
+        """Test QB-022: Listado de inventario dentro del presupuesto de consultas"""
+        with self.assertQueryBudget():
+            response = self.client.get("/admin/inventory/inventoryitem/")
+        self.assertEqual(response.status_code, 200)
+
+
+class ExpenseItemChoicesCacheTests(TestCase):
+    """Tests de la lista de items a la venta guardada en caché"""
+
+    def setUp(self):
+        """Un evento con un item a la venta y el formulario como lo configura el admin"""
+        from django.core.cache import cache
+        from apps.expenses.forms import ExpenseItemForm
+
+        cache.clear()
+        self.company = Company.objects.create(name="Choices Company")
+        self.user = CustomUser.objects.create_user(
+            username="choices_user", email="choices@example.com", password="pass12345", company=self.company,
+        )
+        now = timezone.now()
+        self.event = Event.objects.create(
+            company=self.company, title="Bazar", description="Bazar", location="Plaza",
+            start_time=now, end_time=now + timedelta(hours=6),
+        )
+        self.item = InventoryItem.objects.create(
+            event=self.event, name="Agua", add_stock=10, is_category_sold=True, price=1000, price_category_sold=2000,
+        )
+        self.form_class = type("ExpenseItemForm", (ExpenseItemForm,), {"user": self.user})
+
+    def choices(self):
+        return [label for value, label in self.form_class().fields["inventory_item"].choices if value]
+
+    def test_choices_cached_until_inventory_changes(self):
+        """Test CACHE-004: Los items se consultan una vez y se recalculan al cambiar el inventario"""
+        self.assertEqual(self.choices(), ["Agua -- $2000 (stock 10)"])
+        with self.assertNumQueries(0):
+            self.choices()
+
+        self.item.add_stock = 5
+        self.item.save()
+        InventoryItem.objects.create(event=self.event, name="Gaseosa", add_stock=3, is_category_sold=True, price_category_sold=2500)
+
+        self.assertEqual(sorted(self.choices()), ["Agua -- $2000 (stock 15)", "Gaseosa -- $2500 (stock 3)"])
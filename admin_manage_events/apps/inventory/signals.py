@@ -1,8 +1,24 @@
 # apps/inventory/signals.py
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from apps.events.models import Event
 from apps.expenses.models import Expense
 from .models import InventoryItem
+from utils import cache as cache_layer
+
+
+# Sin @skip_when_muted: la caché debe invalidarse también en operaciones masivas
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_delete, sender=InventoryItem)
+def invalidate_inventory_cache(sender, instance, **kwargs):
+    cache_layer.invalidate(_event_company_id(instance.event_id), cache_layer.INVENTORY)
+
+
+def _event_company_id(event_id):
+    # una venta guarda varios items del mismo evento: la empresa se consulta una vez
+    return cache_layer.cached(None, cache_layer.EVENTS, f'company:{event_id}', lambda: (
+        Event.objects.filter(pk=event_id).values_list('company_id', flat=True).first()
+    ))
 
 
 # @receiver(post_save, sender=Expense)
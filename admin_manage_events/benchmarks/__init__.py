@@ -0,0 +1,13 @@
+"""Benchmarks de las rutas críticas con seguimiento de regresiones.
+
+Uso (desde admin_manage_events/):
+
+    python -m benchmarks                      # compara contra benchmarks/baseline.json
+    python -m benchmarks --sizes 100,10000    # otros tamaños de datos
+    python -m benchmarks --update-baseline    # guarda los resultados como nueva línea base
+    python -m benchmarks.imports              # imports más lentos del arranque (django.setup)
+    python -m benchmarks.concurrency          # vistas de solo lectura: WSGI con hilos contra ASGI
+
+Corre sobre una base de datos de prueba creada para la ocasión, igual que
+`manage.py test`; nunca toca la base de datos configurada.
+"""
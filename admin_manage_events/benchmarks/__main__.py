@@ -0,0 +1,65 @@
+# benchmarks/__main__.py
+import argparse
+import os
+import sys
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks de las rutas críticas.')
+    parser.add_argument('--sizes', default='100,1000', help='Boletos del evento de prueba, separados por coma.')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones medidas por caso.')
+    parser.add_argument('--only', help='Correr solo los casos cuyo nombre contenga este texto.')
+    parser.add_argument('--output', default='benchmark-results.json', help='Archivo JSON de resultados.')
+    parser.add_argument('--baseline', default=BASELINE, help='Línea base contra la que se compara.')
+    parser.add_argument('--tolerance', type=float, default=1.0, help='Aumento de tiempo relativo permitido (1.0 = el doble).')
+    parser.add_argument('--update-baseline', action='store_true', help='Guardar los resultados como línea base.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_manage_events.settings')
+    import django
+    django.setup()
+
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+    from . import cases, harness
+
+    selected = [case for case in harness.registered() if not args.only or args.only in case[0]]
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    setup_test_environment()
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        results = harness.run_cases(selected, cases.build_fixture, sizes, args.repeat)
+    finally:
+        teardown_databases(databases, verbosity=0)
+        teardown_test_environment()
+
+    harness.write_results(args.output, results)
+    if args.update_baseline:
+        harness.write_results(args.baseline, results)
+        print(f'Línea base actualizada en {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f'No hay línea base en {args.baseline}; use --update-baseline para crearla.')
+        return 0
+
+    regressions = harness.compare(harness.load_results(args.baseline), results, args.tolerance)
+    if not regressions:
+        print('Sin regresiones respecto de la línea base.')
+        return 0
+    print('\nREGRESIONES DE RENDIMIENTO:', file=sys.stderr)
+    for regression in regressions:
+        if regression.metric == 'queries':
+            detail = f'{regression.baseline} -> {regression.current} consultas'
+        else:
+            detail = f'{regression.baseline * 1000:.2f} -> {regression.current * 1000:.2f} ms'
+        print(f'  {regression.key:<40} {detail}', file=sys.stderr)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
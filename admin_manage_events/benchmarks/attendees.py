@@ -0,0 +1,134 @@
+# benchmarks/attendees.py
+"""Búsqueda de un asistente entre millones, con y sin índices.
+
+Uso (desde admin_manage_events/):
+
+    python -m benchmarks.attendees                    # 5 millones de asistentes
+    python -m benchmarks.attendees --attendees 500000 --repeat 5
+
+Crea los asistentes en una base de datos de prueba (con las migraciones, así
+que en SQLite incluye la tabla FTS5 de nombres) y busca uno de ellos por
+documento, correo y comienzo del nombre con search_attendees. Después repite
+las búsquedas sin índices: documento y correo recorriendo la tabla y nombre
+con icontains.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+
+def populate(attendees, seed=7, chunk_size=10000):
+    """Crea `attendees` asistentes con nombres de seed.py. Devuelve el de la mitad.
+
+    Del medio y no el último: sin índices una búsqueda que recorre la tabla
+    desde el final lo encontraría enseguida.
+    """
+    from apps.attendees.models import Attendee
+    from apps.events.seed import FIRST_NAMES, LAST_NAMES
+
+    rng = random.Random(seed)
+    types = [value for value, label in Attendee.DOCUMENT_TYPE_CHOICES]
+    for offset in range(0, attendees, chunk_size):
+        batch = []
+        for index in range(offset, min(offset + chunk_size, attendees)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            batch.append(Attendee(
+                name=f'{first} {last} {rng.choice(LAST_NAMES)}', email=f'{first}.{last}.{index}@example.com'.lower(),
+                document_type=types[index % len(types)], document_number=str(10_000_000 + index),
+                phone_number='3000000000', gender='O',
+            ))
+        Attendee.objects.bulk_create(batch)
+    first = Attendee.objects.order_by('pk').values_list('pk', flat=True).first()
+    return Attendee.objects.filter(pk__gte=first + attendees // 2).order_by('pk').first()
+
+
+def searches(target):
+    """{nombre: (texto, document_type)} para encontrar a `target`."""
+    first, last = target.name.split()[:2]
+    return {
+        'documento con tipo': (target.document_number, target.document_type),
+        'documento sin tipo': (target.document_number, None),
+        'correo (mayúsculas)': (target.email.upper(), None),
+        'nombre (prefijos)': (f'{first[:4]} {last[:4]} {target.name.split()[2]}', None),
+    }
+
+
+def time_searches(cases, repeat=3, limit=1000):
+    """{nombre: (segundos (mínimo de `repeat`), ids encontrados)}."""
+    from apps.attendees.search import search_attendees
+
+    results = {}
+    for name, (text, document_type) in cases.items():
+        best, ids = None, None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            ids = list(search_attendees(text, document_type=document_type).order_by('pk').values_list('pk', flat=True)[:limit])
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (best, ids)
+    return results
+
+
+@contextmanager
+def without_indexes():
+    """Quita los índices de Attendee y hace que search_attendees no use la tabla FTS."""
+    from django.db import connection
+
+    from apps.attendees.models import Attendee
+
+    indexes = Attendee._meta.indexes
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.remove_index(Attendee, index)
+    connection._attendee_fts = False
+    try:
+        yield
+    finally:
+        del connection._attendee_fts
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(Attendee, index)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.attendees', description='Búsqueda de asistentes con y sin índices.')
+    parser.add_argument('--attendees', type=int, default=5_000_000, help='Asistentes a crear.')
+    parser.add_argument('--repeat', type=int, default=3, help='Corridas por búsqueda (se toma el mínimo).')
+    parser.add_argument('--seed', type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_manage_events.settings')
+    import django
+    django.setup()
+
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+    setup_test_environment()
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        started = time.perf_counter()
+        target = populate(args.attendees, seed=args.seed)
+        print(f'{args.attendees} asistentes creados en {time.perf_counter() - started:.1f} s; se busca a {target}\n')
+
+        cases = searches(target)
+        indexed = time_searches(cases, args.repeat)
+        with without_indexes():
+            plain = time_searches(cases, args.repeat)
+    finally:
+        teardown_databases(databases, verbosity=0)
+        teardown_test_environment()
+
+    print(f'{"búsqueda":<22} {"encontrado":>10} {"índices ms":>11} {"sin índices ms":>15}')
+    for name, (seconds, ids) in indexed.items():
+        print(f'{name:<22} {"sí" if target.pk in ids else "no":>10} {seconds * 1000:11.2f} {plain[name][0] * 1000:15.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
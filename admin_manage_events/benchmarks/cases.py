@@ -0,0 +1,162 @@
+# benchmarks/cases.py
+"""Casos de benchmark sobre las rutas críticas de la aplicación.
+
+Cada caso recibe el fixture (datos generados con LoadSeeder para el tamaño
+dado) y devuelve la operación a medir. La operación puede modificar datos:
+el harness revierte cada caso al terminar.
+"""
+from collections import namedtuple
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.test import Client
+from django.utils import timezone
+
+from apps.attendees.models import Attendee, Purchase, Ticket
+from apps.attendees.resources import PurchaseResource
+from apps.events.models import Event, EventTicketCategory
+from apps.events.seed import LoadSeeder
+from apps.inventory.models import InventoryItem
+from .harness import benchmark
+
+Fixture = namedtuple('Fixture', 'size user client event category purchases ticket items')
+
+REFERENCE_DATE = datetime(2025, 1, 1)
+
+
+def build_fixture(size):
+    """Una empresa con un evento de `size` boletos (en el pasado, con ventas e inventario)."""
+    seeder = LoadSeeder(
+        companies=1, users_per_company=2, events_per_company=1, tickets=size, inventory_per_event=8,
+        expenses_per_event=10, attachments_per_event=0, history=False, seed=size,
+        reference=timezone.make_aware(REFERENCE_DATE),
+    )
+    seeder.run()
+    event = Event.objects.order_by('-pk').select_related('company').first()
+    # capacidad de sobra para que las compras repetidas del benchmark no se agoten
+    EventTicketCategory.objects.filter(event=event).update(tickets_available=F('tickets_available') + 100000)
+
+    user = get_user_model().objects.create_superuser(
+        username=f'bench{size}', email='bench@example.com', password='bench', company=event.company,
+    )
+    client = Client()
+    client.force_login(user)
+    link = EventTicketCategory.objects.filter(event=event).select_related('ticket_category').first()
+    items = list(InventoryItem.objects.filter(event=event, is_category_sold=True).order_by('pk'))
+    for item in items:
+        item.quantity_available = 10 ** 6
+        item.save(expenses_save=True)
+    return Fixture(
+        size=size, user=user, client=client, event=event, category=link.ticket_category,
+        purchases=Purchase.objects.filter(event=event),
+        ticket=Ticket.objects.filter(purchase__event=event).order_by('pk').first(),
+        items=items,
+    )
+
+
+@benchmark('ticket_purchase')
+def ticket_purchase(fixture):
+    """Compra de dos boletos: Purchase + dos Ticket con sus signals."""
+    counter = iter(range(10 ** 6))
+
+    def operation():
+        number = next(counter)
+        purchase = Purchase.objects.create(
+            buyer='Comprador', event=fixture.event, ticket_category=fixture.category, company=fixture.event.company,
+        )
+        for position in range(2):
+            attendee = Attendee.objects.create(
+                name=f'Asistente {number}-{position}', email=f'bench{number}{position}@example.com',
+                document_number=f'{number}{position}', phone_number='+573001234567', gender='F',
+            )
+            Ticket.objects.create(purchase=purchase, attendee=attendee, ticket_owner=position == 0)
+    return operation
+
+
+@benchmark('tickets_sold_update')
+def tickets_sold_update(fixture):
+    """Guardar un boleto existente dispara el recálculo de tickets_sold."""
+    ticket = Ticket.objects.select_related('purchase').get(pk=fixture.ticket.pk)
+
+    def operation():
+        ticket.ticket_send_by_email = not ticket.ticket_send_by_email
+        ticket.save()
+    return operation
+
+
+@benchmark('expense_save_formset')
+def expense_save_formset(fixture):
+    """Venta con dos items desde el admin: formulario, save_formset y signals de inventario."""
+    data = {
+        'event': fixture.event.pk,
+        'name': fixture.user.pk,
+        'date': '2025-01-01',
+        'description': 'Venta de benchmark',
+        'amount': '0',
+        'expense_items-TOTAL_FORMS': '2',
+        'expense_items-INITIAL_FORMS': '0',
+        'expense_items-MIN_NUM_FORMS': '0',
+        'expense_items-MAX_NUM_FORMS': '1000',
+    }
+    for index, item in enumerate(fixture.items[:2]):
+        data[f'expense_items-{index}-inventory_item'] = item.pk
+        data[f'expense_items-{index}-quantity'] = '1'
+        data[f'expense_items-{index}-price'] = str(item.price_category_sold)
+
+    def operation():
+        response = fixture.client.post('/admin/expenses/expense/add/', data)
+        if response.status_code != 302:
+            raise AssertionError(f'El formulario de ventas respondió {response.status_code}')
+    return operation
+
+
+@benchmark('inventory_stock_change')
+def inventory_stock_change(fixture):
+    """Cambio de stock de un item (save con add_stock e historial)."""
+    item = InventoryItem.objects.get(pk=fixture.items[0].pk)
+
+    def operation():
+        item.add_stock = 5
+        item.save()
+    return operation
+
+
+@benchmark('purchase_export')
+def purchase_export(fixture):
+    """Exportación de las compras del evento con PurchaseResource."""
+    def operation():
+        PurchaseResource().export(fixture.purchases.order_by('pk'))
+    return operation
+
+
+@benchmark('purchase_import')
+def purchase_import(fixture):
+    """Importación (simulada) del mismo archivo exportado."""
+    dataset = PurchaseResource().export(fixture.purchases.order_by('pk'))
+
+    def operation():
+        result = PurchaseResource().import_data(dataset, dry_run=True)
+        if result.has_errors():
+            raise AssertionError('La importación de compras tuvo errores')
+    return operation
+
+
+@benchmark('admin_purchase_changelist')
+def admin_purchase_changelist(fixture):
+    """Listado de compras en el admin."""
+    def operation():
+        response = fixture.client.get('/admin/attendees/purchase/')
+        if response.status_code != 200:
+            raise AssertionError(f'El listado de compras respondió {response.status_code}')
+    return operation
+
+
+@benchmark('admin_ticket_changelist')
+def admin_ticket_changelist(fixture):
+    """Listado de boletos en el admin."""
+    def operation():
+        response = fixture.client.get('/admin/attendees/ticket/')
+        if response.status_code != 200:
+            raise AssertionError(f'El listado de boletos respondió {response.status_code}')
+    return operation
@@ -0,0 +1,157 @@
+# benchmarks/concurrency.py
+"""Vistas de solo lectura bajo concurrencia: despliegue WSGI con hilos contra ASGI.
+
+Uso (desde admin_manage_events/):
+
+    python -m benchmarks.concurrency
+    python -m benchmarks.concurrency --requests 5000 --concurrency 500 --threads 16
+
+Las mismas URLs (disponibilidad de un evento y la página de inicio) se piden
+de dos formas, en el mismo proceso y sobre una base de datos de prueba:
+
+- wsgi: el handler WSGI de Django desde un pool de `--threads` hilos, como
+  gunicorn con workers de hilos; cada request en curso ocupa un hilo.
+- asgi: el handler ASGI con `--concurrency` requests en vuelo a la vez en un
+  solo hilo de eventos, como un worker de uvicorn.
+
+Con --wait cada request espera además ese tiempo antes de responder,
+simulando un long-poll: ahí se ve que WSGI queda limitado por el número de
+hilos mientras ASGI mantiene todas las conexiones abiertas. Sin espera, WSGI
+puede rendir más: en Django 4.2 el ORM async ejecuta cada consulta en un
+único hilo compartido (sync_to_async), así que las consultas no se solapan.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, round(fraction * len(values) + 0.5) - 1))]
+
+
+def summary(name, latencies, elapsed, threads):
+    return {
+        'mode': name,
+        'requests': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.5),
+        'p99': percentile(latencies, 0.99),
+        'threads': threads,
+    }
+
+
+def run_wsgi(paths, requests, threads, wait):
+    """Requests por el handler WSGI desde un pool de hilos."""
+    from django.test import Client
+
+    local = threading.local()
+
+    def fetch(index):
+        client = getattr(local, 'client', None) or Client()
+        local.client = client
+        started = time.perf_counter()
+        if wait:
+            time.sleep(wait)
+        response = client.get(paths[index % len(paths)])
+        if response.status_code != 200:
+            raise AssertionError(f'{paths[index % len(paths)]} respondió {response.status_code}')
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(fetch, range(requests)))
+        peak = threading.active_count()
+    return summary('wsgi', latencies, time.perf_counter() - started, peak)
+
+
+def run_asgi(paths, requests, concurrency, wait):
+    """Requests por el handler ASGI, `concurrency` en vuelo a la vez."""
+    from django.test import AsyncClient
+
+    async def main():
+        client = AsyncClient()
+        limit = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def fetch(index):
+            async with limit:
+                started = time.perf_counter()
+                if wait:
+                    await asyncio.sleep(wait)
+                response = await client.get(paths[index % len(paths)])
+                if response.status_code != 200:
+                    raise AssertionError(f'{paths[index % len(paths)]} respondió {response.status_code}')
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch(index) for index in range(requests)))
+        return summary('asgi', latencies, time.perf_counter() - started, threading.active_count())
+
+    return asyncio.run(main())
+
+
+def build_paths():
+    """Datos de un evento próximo con varias categorías y las URLs a pedir."""
+    from django.urls import reverse
+    from django.utils import timezone
+
+    from apps.events.models import Event
+    from apps.events.seed import LoadSeeder
+
+    LoadSeeder(
+        companies=2, users_per_company=1, events_per_company=12, tickets=2000, inventory_per_event=0,
+        expenses_per_event=0, attachments_per_event=0, history=False, seed=7, log=None,
+        reference=timezone.now(),
+    ).run()
+    event = Event.objects.filter(end_time__gte=timezone.now()).order_by('start_time').first()
+    return [reverse('events:availability', args=[event.pk]), reverse('home')]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.concurrency', description='WSGI con hilos contra ASGI en vistas de solo lectura.')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests por modo.')
+    parser.add_argument('--concurrency', type=int, default=200, help='Requests en vuelo a la vez en ASGI.')
+    parser.add_argument('--threads', type=int, default=8, help='Hilos del pool WSGI.')
+    parser.add_argument('--wait', type=float, default=0.0, help='Espera simulada por request en segundos (long-poll).')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_manage_events.settings')
+    import django
+    django.setup()
+
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+    setup_test_environment()
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        paths = build_paths()
+        results = [
+            run_wsgi(paths, args.requests, args.threads, args.wait),
+            run_asgi(paths, args.requests, args.concurrency, args.wait),
+        ]
+    finally:
+        teardown_databases(databases, verbosity=0)
+        teardown_test_environment()
+
+    print(f'{args.requests} requests a {", ".join(paths)}' + (f', espera {args.wait * 1000:.0f} ms' if args.wait else ''))
+    print(f'{"modo":<6} {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9} {"hilos":>6}')
+    for result in results:
+        print(
+            f'{result["mode"]:<6} {result["throughput"]:9.1f} {result["p50"] * 1000:9.1f} '
+            f'{result["p99"] * 1000:9.1f} {result["threads"]:6d}'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
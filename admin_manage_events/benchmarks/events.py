@@ -0,0 +1,144 @@
+# benchmarks/events.py
+"""Consultas de eventos por ventana de tiempo con y sin los índices de Event.
+
+Uso (desde admin_manage_events/):
+
+    python -m benchmarks.events                      # 1 millón de eventos
+    python -m benchmarks.events --events 100000 --companies 20 --repeat 5
+
+Crea los eventos en una base de datos de prueba, repartidos entre
+`--companies` empresas con inicios entre tres años atrás y uno adelante y
+duraciones de una hora a tres días. Mide cada consulta de EventQuerySet
+(próximos, en curso, pasados, ventana de calendario y candidatos a archivar)
+con los índices de Event.Meta.indexes y después sin ellos, y muestra el plan
+de la consulta con índices.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+
+def populate(events, companies, seed=7, chunk_size=5000, now=None):
+    """Crea `companies` empresas y `events` eventos. Devuelve los ids de las empresas."""
+    from django.utils import timezone
+
+    from apps.events.models import Event
+    from apps.ticket_categories.models import Company
+
+    now = now or timezone.now()
+    rng = random.Random(seed)
+    company_ids = [Company.objects.create(name=f'Bench {index}').pk for index in range(companies)]
+    span = int(timedelta(days=4 * 365).total_seconds())
+    past = timedelta(days=3 * 365)
+    for offset in range(0, events, chunk_size):
+        batch = []
+        for index in range(offset, min(offset + chunk_size, events)):
+            start = now - past + timedelta(seconds=rng.randrange(span))
+            batch.append(Event(
+                company_id=company_ids[index % companies], title=f'Evento {index}', description='', location='Sala',
+                start_time=start, end_time=start + timedelta(minutes=rng.randrange(60, 3 * 24 * 60)),
+            ))
+        Event.objects.bulk_create(batch)
+    return company_ids
+
+
+def queries(company_id, now):
+    """{nombre: queryset} de las consultas a medir."""
+    from apps.events.models import Event
+
+    events = Event.objects.all()
+    month = (now, now + timedelta(days=31))
+    return {
+        'próximos (empresa)': events.for_company(company_id).upcoming(now)[:20],
+        'en curso (empresa)': events.for_company(company_id).ongoing(now)[:50],
+        'pasados (empresa)': events.for_company(company_id).past(now)[:20],
+        'calendario mes (empresa)': events.for_company(company_id).overlapping(*month)[:500],
+        'próximos (todas)': events.upcoming(now)[:20],
+        'calendario mes (todas)': events.overlapping(*month)[:500],
+        'a archivar': events.past(now - timedelta(days=90)).order_by('end_time')[:100],
+    }
+
+
+def time_queries(querysets, repeat=3):
+    """{nombre: (segundos (mínimo de `repeat`), ids devueltos)}."""
+    results = {}
+    for name, queryset in querysets.items():
+        best, ids = None, None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            ids = list(queryset.values_list('pk', flat=True))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (best, ids)
+    return results
+
+
+@contextmanager
+def without_indexes():
+    """Quita temporalmente los índices de Event.Meta.indexes."""
+    from django.db import connection
+
+    from apps.events.models import Event
+
+    indexes = Event._meta.indexes
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.remove_index(Event, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(Event, index)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.events', description='Consultas de eventos por ventana de tiempo con y sin índices.')
+    parser.add_argument('--events', type=int, default=1_000_000, help='Eventos a crear.')
+    parser.add_argument('--companies', type=int, default=50, help='Empresas entre las que se reparten.')
+    parser.add_argument('--repeat', type=int, default=3, help='Corridas por consulta (se toma el mínimo).')
+    parser.add_argument('--seed', type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_manage_events.settings')
+    import django
+    django.setup()
+
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+    from django.utils import timezone
+
+    setup_test_environment()
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        now = timezone.now()
+        started = time.perf_counter()
+        company_ids = populate(args.events, args.companies, seed=args.seed, now=now)
+        print(f'{args.events} eventos en {args.companies} empresas creados en {time.perf_counter() - started:.1f} s\n')
+
+        querysets = queries(company_ids[0], now)
+        indexed = time_queries(querysets, args.repeat)
+        plans = {name: queryset.explain() for name, queryset in querysets.items()}
+        with without_indexes():
+            plain = time_queries(querysets, args.repeat)
+    finally:
+        teardown_databases(databases, verbosity=0)
+        teardown_test_environment()
+
+    print(f'{"consulta":<26} {"filas":>6} {"índices ms":>11} {"sin índices ms":>15}')
+    for name, (seconds, ids) in indexed.items():
+        print(f'{name:<26} {len(ids):6d} {seconds * 1000:11.2f} {plain[name][0] * 1000:15.2f}')
+    print('\nPlanes con índices:')
+    for name, plan in plans.items():
+        print(f'- {name}: {" / ".join(line.strip() for line in plan.splitlines())}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# benchmarks/harness.py
+import json
+import platform
+import statistics
+import time
+from collections import namedtuple
+
+import django
+from django.db import connection, transaction
+
+Regression = namedtuple('Regression', 'key metric baseline current')
+
+_registry = []
+
+
+def benchmark(name):
+    """Registra un caso. La función recibe el fixture y devuelve la operación a medir."""
+    def decorator(setup):
+        _registry.append((name, setup))
+        return setup
+    return decorator
+
+
+def registered():
+    return list(_registry)
+
+
+class QueryCounter:
+    """execute_wrapper que cuenta consultas sin el límite de 9000 de connection.queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def measure(operation, repeat):
+    """Ejecuta `operation` una vez de calentamiento y `repeat` veces midiendo tiempo y consultas."""
+    operation()
+    timings = []
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            operation()
+            timings.append(time.perf_counter() - started)
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'queries': counter.count // repeat,
+    }
+
+
+def run_cases(cases, fixture_factory, sizes, repeat, log=print):
+    """Corre cada caso para cada tamaño; cada caso se revierte para no afectar a los demás."""
+    results = {}
+    for size in sizes:
+        try:
+            with transaction.atomic():
+                fixture = fixture_factory(size)
+                for name, setup in cases:
+                    key = f'{name}[{size}]'
+                    try:
+                        with transaction.atomic():
+                            results[key] = measure(setup(fixture), repeat)
+                            raise _Rollback
+                    except _Rollback:
+                        pass
+                    log(f"{key:<40} {results[key]['min'] * 1000:9.2f} ms {results[key]['queries']:6d} consultas")
+                raise _Rollback
+        except _Rollback:
+            pass
+    return results
+
+
+def metadata():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def write_results(path, results):
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump({'meta': metadata(), 'results': results}, output, indent=2, sort_keys=True)
+        output.write('\n')
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)['results']
+
+
+def compare(baseline, results, tolerance, noise_floor=0.001):
+    """Regresiones respecto de la línea base.
+
+    El número de consultas es determinista y no admite aumentos. Para el
+    tiempo se usa el mínimo de las repeticiones (el menos afectado por ruido
+    de la máquina), con `tolerance` relativa y sin contar diferencias por
+    debajo de `noise_floor` segundos.
+    """
+    regressions = []
+    for key, current in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(Regression(key, 'queries', previous['queries'], current['queries']))
+        slower = current['min'] - previous['min']
+        if slower > noise_floor and current['min'] > previous['min'] * (1 + tolerance):
+            regressions.append(Regression(key, 'min', previous['min'], current['min']))
+    return regressions
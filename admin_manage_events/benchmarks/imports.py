@@ -0,0 +1,112 @@
+# benchmarks/imports.py
+"""Tiempo de importación durante el arranque de Django.
+
+Uso (desde admin_manage_events/):
+
+    python -m benchmarks.imports                  # los 25 imports más lentos de django.setup()
+    python -m benchmarks.imports --urls --repeat 5
+    python -m benchmarks.imports --by-package     # tiempo propio sumado por paquete
+
+Ejecuta django.setup() en un intérprete nuevo con `python -X importtime` y
+ordena los módulos por tiempo acumulado (el módulo más todo lo que importa).
+Con --repeat se toma el mínimo de cada módulo entre las corridas, que es lo
+menos afectado por la caché de disco y el ruido de la máquina.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict, namedtuple
+
+DJANGO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ImportTime = namedtuple('ImportTime', 'module self_us cumulative_us depth')
+
+SETUP_CODE = '''
+import os, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_manage_events.settings')
+started = time.perf_counter()
+import django
+django.setup()
+if {urls}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print(time.perf_counter() - started)
+'''
+
+
+def parse_importtime(output):
+    """Filas de `-X importtime` (stderr) como ImportTime; ignora las demás líneas."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # encabezado
+        name = parts[2].rstrip()
+        module = name.lstrip()
+        rows.append(ImportTime(module, int(parts[0]), int(parts[1]), (len(name) - len(module)) // 2))
+    return rows
+
+
+def profile_setup(urls=False):
+    """Corre django.setup() en un proceso nuevo. Devuelve (segundos, [ImportTime])."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SETUP_CODE.format(urls=urls)],
+        cwd=DJANGO_DIR, capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def merge_runs(runs):
+    """Mínimo por módulo entre varias corridas."""
+    best = {}
+    for rows in runs:
+        for row in rows:
+            if row.module not in best or row.cumulative_us < best[row.module].cumulative_us:
+                best[row.module] = row
+    return list(best.values())
+
+
+def by_package(rows):
+    """Tiempo propio sumado por paquete de primer nivel, de mayor a menor."""
+    totals = defaultdict(int)
+    for row in rows:
+        totals[row.module.split('.')[0]] += row.self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.imports', description='Imports más lentos del arranque de Django.')
+    parser.add_argument('--limit', type=int, default=25, help='Filas a mostrar.')
+    parser.add_argument('--repeat', type=int, default=1, help='Corridas (se toma el mínimo de cada módulo).')
+    parser.add_argument('--urls', action='store_true', help='Incluir la carga del URLconf (lo que hace el primer request).')
+    parser.add_argument('--by-package', action='store_true', help='Agrupar el tiempo propio por paquete.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    runs, timings = [], []
+    for _ in range(max(1, args.repeat)):
+        seconds, rows = profile_setup(urls=args.urls)
+        timings.append(seconds)
+        runs.append(rows)
+    rows = merge_runs(runs)
+
+    print(f'django.setup(){" + URLconf" if args.urls else ""}: {min(timings) * 1000:.0f} ms, {len(rows)} módulos\n')
+    if args.by_package:
+        print(f'{"paquete":<40} {"propio ms":>10}')
+        for package, self_us in by_package(rows)[:args.limit]:
+            print(f'{package:<40} {self_us / 1000:10.1f}')
+        return 0
+
+    print(f'{"módulo":<60} {"acumulado ms":>13} {"propio ms":>10}')
+    for row in sorted(rows, key=lambda row: row.cumulative_us, reverse=True)[:args.limit]:
+        print(f'{row.module:<60} {row.cumulative_us / 1000:13.1f} {row.self_us / 1000:10.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+from django.test import TestCase, TransactionTestCase
+
+
+class BenchmarkHarnessTests(TestCase):
+    """Tests del harness de benchmarks"""
+
+    def test_compare_flags_regressions(self):
+        """Test BENCH-001: Más consultas o un tiempo fuera de tolerancia son regresiones"""
+        from benchmarks.harness import compare
+
+        baseline = {"case[100]": {"min": 0.010, "median": 0.011, "queries": 5}}
+
+        self.assertEqual(compare(baseline, {"case[100]": {"min": 0.014, "median": 0.02, "queries": 5}}, 0.5), [])
+        regressions = compare(baseline, {"case[100]": {"min": 0.030, "median": 0.03, "queries": 6}}, 0.5)
+        self.assertEqual([regression.metric for regression in regressions], ["queries", "min"])
+        self.assertEqual(compare(baseline, {"new[100]": {"min": 1, "median": 1, "queries": 99}}, 0.5), [])
+
+    def test_cases_run(self):
+        """Test BENCH-002: Todos los casos registrados corren sobre un conjunto pequeño"""
+        from benchmarks import cases, harness
+
+        results = harness.run_cases(harness.registered(), cases.build_fixture, [20], repeat=1, log=lambda line: None)
+
+        self.assertEqual(len(results), len(harness.registered()))
+        self.assertTrue(all(result["queries"] > 0 for result in results.values()))
+
+
+class ImportProfileTests(TestCase):
+    """Tests del perfil de tiempos de importación"""
+
+    def test_parse_and_group_importtime(self):
+        """Test IMP-001: Se leen las filas de -X importtime y se agrupan por paquete"""
+        from benchmarks.imports import by_package, merge_runs, parse_importtime
+
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     openpyxl.cell",
+            "import time:       300 |        420 |   openpyxl",
+            "import time:        50 |        470 | import_export.formats",
+            "otra línea",
+        ])
+        rows = parse_importtime(output)
+
+        self.assertEqual([(row.module, row.depth) for row in rows], [("openpyxl.cell", 2), ("openpyxl", 1), ("import_export.formats", 0)])
+        self.assertEqual(by_package(rows), [("openpyxl", 420), ("import_export", 50)])
+        faster = parse_importtime("import time:       100 |        200 |   openpyxl")
+        self.assertEqual({row.module: row.cumulative_us for row in merge_runs([rows, faster])}["openpyxl"], 200)
+
+
+class EventWindowBenchmarkTests(TransactionTestCase):
+    """Tests del benchmark de consultas por ventana de tiempo (quita índices, fuera de una transacción)"""
+
+    def test_results_match_without_indexes(self):
+        """Test EVB-001: Las consultas devuelven las mismas filas con y sin índices"""
+        from django.core.cache import cache
+        from django.utils import timezone
+        from benchmarks.events import populate, queries, time_queries, without_indexes
+
+        cache.clear()
+        now = timezone.now()
+        company_ids = populate(300, 3, now=now)
+        querysets = queries(company_ids[0], now)
+
+        indexed = time_queries(querysets, repeat=1)
+        with without_indexes():
+            plain = time_queries(querysets, repeat=1)
+
+        self.assertEqual({name: ids for name, (seconds, ids) in indexed.items()}, {name: ids for name, (seconds, ids) in plain.items()})
+        self.assertTrue(indexed["próximos (todas)"][1])
+
+
+class AttendeeSearchBenchmarkTests(TransactionTestCase):
+    """Tests del benchmark de búsqueda de asistentes (quita índices, fuera de una transacción)"""
+
+    def test_target_found_with_and_without_indexes(self):
+        """Test ATB-001: Cada búsqueda encuentra al asistente con y sin índices"""
+        from benchmarks.attendees import populate, searches, time_searches, without_indexes
+
+        target = populate(200)
+        cases = searches(target)
+
+        indexed = time_searches(cases, repeat=1)
+        with without_indexes():
+            plain = time_searches(cases, repeat=1)
+
+        for name in cases:
+            self.assertIn(target.pk, indexed[name][1], name)
+            self.assertIn(target.pk, plain[name][1], name)
@@ -0,0 +1,123 @@
+"""Caché por empresa con invalidación por versión de espacio de nombres.
+
+Las claves llevan la empresa (tenant), el espacio de nombres y su versión
+actual:
+
+    t:<empresa>:<espacio>:v<versión>:<clave>
+
+Invalidar un espacio no borra claves (los backends no permiten borrar por
+prefijo): incrementa su versión, así las claves anteriores dejan de leerse
+y expiran solas. Funciona igual con locmem, archivo o Redis (ver CACHES en
+settings.py).
+
+GLOBAL es el tenant de lo que no pertenece a una empresa: páginas públicas
+y consultas de superusuarios. Invalidar un espacio de una empresa invalida
+también el mismo espacio en GLOBAL.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+GLOBAL = 'all'
+
+# Espacios de nombres que invalidan los signals de cada app
+EVENTS = 'events'
+TICKET_CATEGORIES = 'ticket_categories'
+INVENTORY = 'inventory'
+
+
+def tenant_id(company):
+    """Empresa, id de empresa o None (GLOBAL) como parte de la clave."""
+    if company is None:
+        return GLOBAL
+    return str(getattr(company, 'pk', company))
+
+
+def version_key(company, namespace):
+    return f't:{tenant_id(company)}:{namespace}:version'
+
+
+def _initial_version():
+    # Si la versión se desaloja de la caché, volver a empezar en 1 podría
+    # reutilizar claves viejas que siguen guardadas; el reloj no se repite.
+    return time.time_ns() // 1000
+
+
+def get_version(company, namespace):
+    key = version_key(company, namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(company, namespace):
+    key = version_key(company, namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _initial_version(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def make_key(company, namespace, key, version):
+    return f't:{tenant_id(company)}:{namespace}:v{version}:{key}'
+
+
+def tenant_key(company, namespace, key):
+    """Clave sin versión: para valores que guardan su versión y se sirven vencidos."""
+    return f't:{tenant_id(company)}:{namespace}:{key}'
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # la versión no existe (nunca se leyó o se desalojó)
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def invalidate(company, *namespaces):
+    """Invalida los espacios de la empresa y los mismos espacios en GLOBAL.
+
+    Se invalida de inmediato y otra vez después del commit: entre los dos
+    momentos otra petición pudo guardar en la caché los datos anteriores al
+    commit.
+    """
+    keys = {version_key(None, namespace) for namespace in namespaces}
+    if company is not None:
+        keys.update(version_key(company, namespace) for namespace in namespaces)
+
+    def bump():
+        for key in keys:
+            _bump(key)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def cached(company, namespace, key, compute, timeout=None):
+    """Valor de `compute()` guardado bajo la versión actual del espacio.
+
+    timeout=None usa el TIMEOUT del backend.
+    """
+    full_key = make_key(company, namespace, key, get_version(company, namespace))
+    value = cache.get(full_key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            cache.set(full_key, value, **({} if timeout is None else {'timeout': timeout}))
+    return value
+
+
+async def acached(company, namespace, key, compute, timeout=None):
+    """Como cached() para vistas async; `compute` es una corrutina."""
+    full_key = make_key(company, namespace, key, await aget_version(company, namespace))
+    value = await cache.aget(full_key)
+    if value is None:
+        value = await compute()
+        if value is not None:
+            await cache.aset(full_key, value, **({} if timeout is None else {'timeout': timeout}))
+    return value
@@ -0,0 +1,34 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+_state = threading.local()
+
+
+@contextmanager
+def muted_receivers():
+    """Desactiva, en el hilo actual, los receivers marcados con @skip_when_muted.
+
+    Se usa en operaciones masivas (archivado, restauración, cargas) donde los
+    contadores se recalculan o se copian en bloque y no tiene sentido
+    ejecutar un receiver por cada fila.
+    """
+    previous = getattr(_state, 'muted', False)
+    _state.muted = True
+    try:
+        yield
+    finally:
+        _state.muted = previous
+
+
+def receivers_muted():
+    return getattr(_state, 'muted', False)
+
+
+def skip_when_muted(receiver_func):
+    @wraps(receiver_func)
+    def wrapper(*args, **kwargs):
+        if receivers_muted():
+            return None
+        return receiver_func(*args, **kwargs)
+    return wrapper
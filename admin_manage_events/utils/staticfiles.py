@@ -0,0 +1,16 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Estáticos con hash de contenido en el nombre y variantes .gz/.br.
+
+    collectstatic escribe los archivos con hash, sus versiones comprimidas y
+    el manifest; WhiteNoise sirve los nombres con hash como inmutables con
+    caché de un año. Mientras no exista el manifest (runserver o tests sin
+    collectstatic) {% static %} devuelve el nombre original en lugar de fallar.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import tempfile
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+from django.test import runner
+from django.test.utils import CaptureQueriesContext
+
+QUERY_BUDGETS_FILE = os.path.join(settings.BASE_DIR, 'query_budgets.json')
+
+
+def updating_budgets():
+    return os.environ.get('UPDATE_QUERY_BUDGETS') == '1'
+
+
+def budget_profile():
+    """Configuración con la que corren los tests ('settings', 'settings_test').
+
+    El número de consultas cambia entre configuraciones (simple_history está
+    desactivado en settings_test), así que cada una tiene sus presupuestos.
+    """
+    return settings.SETTINGS_MODULE.rsplit('.', 1)[-1]
+
+
+def load_budgets(path=QUERY_BUDGETS_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)
+
+
+def save_budget(key, count, path=QUERY_BUDGETS_FILE):
+    budgets = load_budgets(path)
+    budgets.setdefault(budget_profile(), {})[key] = count
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(budgets, output, indent=2, sort_keys=True)
+        output.write('\n')
+
+
+class QueryBudget:
+    """Cuenta las consultas de un bloque y las compara con el presupuesto guardado.
+
+    El presupuesto se busca en query_budgets.json bajo la configuración de
+    los tests (budget_profile()) con la clave módulo.Clase.test[:etiqueta]. Superarlo hace fallar el test con la lista
+    de consultas; con UPDATE_QUERY_BUDGETS=1 se guarda el conteo actual como
+    nuevo presupuesto.
+    """
+
+    def __init__(self, test_case, label=None, path=QUERY_BUDGETS_FILE):
+        self.test_case = test_case
+        self.path = path
+        key = f'{type(test_case).__module__}.{type(test_case).__qualname__}.{test_case._testMethodName}'
+        self.key = f'{key}:{label}' if label else key
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connection)
+        self.context.__enter__()
+        return self.context
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        count = len(self.context)
+        if updating_budgets():
+            save_budget(self.key, count, self.path)
+            return
+
+        budget = load_budgets(self.path).get(budget_profile(), {}).get(self.key)
+        if budget is None:
+            self.test_case.fail(
+                f'{self.key} no tiene presupuesto de consultas en {budget_profile()} ({count} ejecutadas). '
+                'Ejecute los tests con UPDATE_QUERY_BUDGETS=1 para registrarlo.'
+            )
+        if count > budget:
+            queries = '\n'.join(f'{index}. {query["sql"]}' for index, query in enumerate(self.context.captured_queries, start=1))
+            self.test_case.fail(f'{self.key} ejecutó {count} consultas; el presupuesto es {budget}.\n{queries}')
+
+
+def query_budget(label=None):
+    """Decorador de métodos de test: todo el test cuenta contra el presupuesto."""
+    def decorator(test_method):
+        @wraps(test_method)
+        def wrapper(self, *args, **kwargs):
+            with QueryBudget(self, label):
+                return test_method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class QueryBudgetMixin:
+    """Agrega assertQueryBudget() a un TestCase."""
+
+    def assertQueryBudget(self, label=None):
+        return QueryBudget(self, label)
+
+
+def _init_worker(counter, *args, **kwargs):
+    """Inicializa un proceso de --parallel con su propio MEDIA_ROOT."""
+    runner._init_worker(counter, *args, **kwargs)
+    settings.MEDIA_ROOT = os.path.join(os.environ['TEST_MEDIA_ROOT'], f'worker-{runner._worker_id}')
+    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+
+
+class ParallelTestSuite(runner.ParallelTestSuite):
+    init_worker = _init_worker
+
+
+class FastTestRunner(runner.DiscoverRunner):
+    """Runner de settings_test: los archivos de cada proceso van a un directorio temporal propio.
+
+    Sin --parallel todo se escribe en MEDIA_ROOT/main; con --parallel cada
+    proceso usa MEDIA_ROOT/worker-N. El directorio se borra al terminar.
+    """
+    parallel_test_suite = ParallelTestSuite
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        # por variable de entorno para que también lo vean los procesos con spawn
+        os.environ['TEST_MEDIA_ROOT'] = self.media_root = tempfile.mkdtemp(prefix='test-media-')
+        self.original_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = os.path.join(self.media_root, 'main')
+
+    def teardown_test_environment(self, **kwargs):
+        super().teardown_test_environment(**kwargs)
+        settings.MEDIA_ROOT = self.original_media_root
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        os.environ.pop('TEST_MEDIA_ROOT', None)
@@ -0,0 +1,40 @@
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+
+
+def _is_staff(user):
+    return user.is_authenticated and user.is_active and user.is_staff
+
+
+def _staff_required_response():
+    return JsonResponse({'error': 'Se requiere un usuario staff.'}, status=403)
+
+
+def staff_required_json(view_func):
+    """Como staff_member_required pero responde JSON 403 en vez de redirigir al login.
+
+    Funciona también con vistas async: request.user se carga (sesión y
+    usuario) en un hilo con sync_to_async.
+    """
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if not await sync_to_async(_is_staff)(request.user):
+                return _staff_required_response()
+            return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _is_staff(request.user):
+            return _staff_required_response()
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def company_scope(user):
+    """Empresa a la que se limitan las consultas del usuario (None para superusuarios)."""
+    return None if user.is_superuser else user.company_id
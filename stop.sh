@@ -45,6 +45,17 @@ else
     print_success "Procesos de Django detenidos"
 fi
 
+# Detener gunicorn (launcher de producción): TERM al proceso maestro cierra los workers ordenadamente
+GUNICORN_PIDS=$(pgrep -f "gunicorn admin_manage_events.[wa]sgi" 2>/dev/null)
+
+if [ ! -z "$GUNICORN_PIDS" ]; then
+    print_status "Deteniendo gunicorn..."
+    pkill -TERM -f "gunicorn admin_manage_events.[wa]sgi" 2>/dev/null
+    sleep 5
+    pkill -KILL -f "gunicorn admin_manage_events.[wa]sgi" 2>/dev/null
+    print_success "gunicorn detenido"
+fi
+
 # Buscar procesos Python que puedan estar ejecutando Django
 PYTHON_DJANGO_PIDS=$(pgrep -f "python.*manage.py" 2>/dev/null)
 